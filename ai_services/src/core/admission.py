@@ -0,0 +1,13 @@
+# ai_service/src/core/admission.py
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.admission import AsyncAdmissionController, Overloaded
+
+# Shared by every agent so bursts queue here instead of hitting OpenAI limits;
+# limits come from AIConfig, like the backend's synchronous controller
+llm_admission = AsyncAdmissionController(
+    max_concurrent=AIConfig.LLM_MAX_CONCURRENCY,
+    max_queue=AIConfig.LLM_MAX_QUEUE,
+    queue_timeout=AIConfig.LLM_QUEUE_TIMEOUT,
+)
+
+__all__ = ["llm_admission", "Overloaded"]
@@ -1,6 +1,7 @@
 # ai_service/src/core/config.py
 import os
 from pathlib import Path
+from typing import List
 from pydantic_settings import BaseSettings
 
 
@@ -34,6 +35,59 @@ class Settings(BaseSettings):
     MAX_SEARCH_RESULTS: int = 5
     SIMILARITY_THRESHOLD: float = 0.7
 
+    # Blocking work offloaded from the event loop
+    DB_EXECUTOR_WORKERS: int = 8  # keep <= DB pool_size + max_overflow
+    EMBEDDING_EXECUTOR_WORKERS: int = 2  # each embed call already uses ONNX threads
+
+    # Agent tool execution
+    TOOL_TIMEOUT_SECONDS: float = 15.0
+
+    # Model routing: analysis and simple intents use FALLBACK_MODEL; calls
+    # fail over on errors and are hedged on the other model past the SLO
+    MODEL_ROUTING_ENABLED: bool = True
+    FAST_MODEL_INTENTS: List[str] = ["budget_search", "spec_search", "laptop_details"]
+    LLM_LATENCY_SLO_SECONDS: float = 6.0
+    LLM_HEDGE_ENABLED: bool = True
+    MODEL_METRICS_WINDOW: int = 500  # recent calls per model for p50/p95
+
+    # Token budget for tool results in the synthesis prompt
+    SYNTHESIS_CONTEXT_TOKEN_BUDGET: int = 1500
+
+    # Share one agent run among concurrent identical opening messages
+    SINGLEFLIGHT_ENABLED: bool = True
+
+    # Semantic response cache for chat/recommend answers
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # cosine similarity
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000  # per endpoint
+    SEMANTIC_CACHE_TTL_SECONDS: int = 24 * 3600
+
+    # Agent implementation: "graph" (analyze -> tools -> synthesize) or
+    # "tool_calling" (native function calling); requests may override it
+    AGENT_MODE: str = "graph"
+    TOOL_CALLING_MAX_ROUNDS: int = 3  # tool round-trips before forcing an answer
+
+    # Local query router that skips the analysis LLM call when confident
+    QUERY_ROUTER_ENABLED: bool = True
+    QUERY_ROUTER_MIN_SIMILARITY: float = 0.80  # nearest intent prototype
+    QUERY_ROUTER_MIN_MARGIN: float = 0.04  # lead over the runner-up intent
+
+    # Incremental vector index sync in the background; 0 disables it
+    VECTOR_SYNC_INTERVAL_SECONDS: float = 300.0
+
+    # Conversation memory keyed by conversation_id
+    CONVERSATION_STORE_BACKEND: str = "memory"  # or "sqlite" to survive restarts
+    CONVERSATION_DB_PATH: Path = (
+        PROJECT_ROOT / "backend" / "data" / "conversations.sqlite3"
+    )
+    CONVERSATION_MAX_ENTRIES: int = 1000
+    CONVERSATION_TTL_SECONDS: int = 24 * 3600
+    CONVERSATION_MAX_TURNS: int = 8  # messages kept verbatim before compaction
+    CONVERSATION_KEEP_TURNS: int = 4  # recent messages kept when compacting
+    CONVERSATION_TURN_MAX_CHARS: int = 600  # per message, in prompts
+    CONVERSATION_SUMMARY_MAX_CHARS: int = 1500
+    CONVERSATION_MAX_TOOL_RESULTS: int = 20
+
     # Constructed Database URL
     @property
     def DATABASE_URL(self) -> str:
@@ -1,7 +1,7 @@
 # ai_service/src/core/database.py
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -25,6 +25,16 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def set_statement_timeout(db: Session, seconds: float) -> None:
+    """Have PostgreSQL cancel this session's queries that run longer than
+    `seconds`, until the current transaction ends"""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(int(seconds * 1000))},
+        )
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,87 @@
+# ai_service/src/core/executors.py
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from ai_services.src.core.config import settings
+
+# Bounded pools so blocking DB and embedding work never runs on the event loop
+# and can't exhaust the connection pool or oversubscribe ONNX threads
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS, thread_name_prefix="ai-db"
+)
+embedding_executor = ThreadPoolExecutor(
+    max_workers=settings.EMBEDDING_EXECUTOR_WORKERS, thread_name_prefix="ai-embed"
+)
+
+
+class AbandonedCalls:
+    """Timed-out calls that still occupy workers of one pool.
+
+    A thread can't be interrupted, so a call given up on keeps its worker
+    until it returns. Callers stop submitting to the pool while `limit` such
+    calls are running, instead of queueing behind them.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = max(1, limit)
+        self.running = 0
+        self.abandoned = 0
+        self._lock = threading.Lock()
+
+    def track(self, future: Future) -> None:
+        """Give up on a call; one that never started is simply cancelled"""
+        if future.cancel():
+            return
+        with self._lock:
+            self.running += 1
+            self.abandoned += 1
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self.running -= 1
+
+    @property
+    def saturated(self) -> bool:
+        return self.running >= self.limit
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "abandoned": self.abandoned,
+            "limit": self.limit,
+        }
+
+
+# Half of each pool may be held by timed-out calls; the rest stays available
+abandoned_calls = {
+    db_executor: AbandonedCalls("db", settings.DB_EXECUTOR_WORKERS // 2),
+    embedding_executor: AbandonedCalls(
+        "embedding", settings.EMBEDDING_EXECUTOR_WORKERS // 2
+    ),
+}
+
+
+async def run_blocking(
+    executor: ThreadPoolExecutor, func: Callable[..., Any], *args, **kwargs
+) -> Any:
+    """Run a blocking callable on the given executor and await its result.
+
+    The caller's context is copied into the worker, so tracing spans opened
+    there nest under the caller's span.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        executor, functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def shutdown_executors() -> None:
+    db_executor.shutdown(wait=False, cancel_futures=True)
+    embedding_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,48 @@
+# ai_service/src/core/singleflight.py
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict
+
+from backend.src.app.core.tracing import annotate
+
+
+def normalize_message(message: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the question"""
+    return re.sub(r"[\s?!.]+$", "", " ".join(message.lower().split()))
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller starts the work as its own task; callers arriving while
+    it runs await the same task and get the same result (or exception).
+    Each waiter is shielded, so a client disconnecting cancels only its own
+    wait, never the shared work.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.executions += 1
+            annotate(singleflight="leader")
+        else:
+            self.coalesced += 1
+            annotate(singleflight="coalesced")
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesce_rate": (self.coalesced / total) if total else 0.0,
+            "in_flight": len(self._inflight),
+        }
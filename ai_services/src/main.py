@@ -1,15 +1,55 @@
 # ai_service/src/main.py
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+import json
 import os
+import threading
+import time
 
-from ai_services.src.core.database import get_db, SessionLocal
-from ai_services.src.services.langgraph_agent import laptop_agent
+from ai_services.src.core.database import get_db, SessionLocal, engine, DATABASE_URL
+from ai_services.src.services.langgraph_agent import (
+    laptop_agent,
+    ERROR_RESPONSE_PREFIX,
+)
+from ai_services.src.services.tool_calling_agent import tool_calling_agent
 from ai_services.src.core.config import settings
+from ai_services.src.core.singleflight import SingleFlight, normalize_message
+from ai_services.src.core.admission import llm_admission, Overloaded
+from ai_services.src.core.executors import (
+    run_blocking,
+    db_executor,
+    embedding_executor,
+    abandoned_calls,
+    shutdown_executors,
+)
 from ai_services.src.services.vector_service import vector_service
+from ai_services.src.services.embedding_pool import embedding_pool
+from ai_services.src.services.semantic_cache import semantic_cache
+from ai_services.src.services.query_router import query_router
+from ai_services.src.services.model_router import model_metrics
+from ai_services.src.services.conversation_store import (
+    Conversation,
+    conversation_memory,
+    new_conversation_id,
+)
+from backend.src.app.core.cache import cache
+from backend.src.app.core.tracing import tracer, annotate
+from backend.src.app.core.periodic_job import PeriodicJob
+from backend.src.app.services.llm_cache import llm_call_cache
+from backend.src.app.services.embedding_cache import embedding_cache
+from ai_services.src.services.query_embedding_cache import query_embedding_cache
+from backend.src.app.config.cache_config import CacheConfig
+from backend.src.app.core.change_listener import (
+    ChangeListener,
+    QueuedHandler,
+    check_triggers,
+    invalidate_cache_for_changes,
+    is_resync,
+)
 
 app = FastAPI(
     title="Laptop Intelligence AI Service",
@@ -35,51 +75,136 @@ app.add_middleware(
 )
 
 
+def run_vector_sync():
+    """Embed new or changed rows into the vector database, drop deleted ones"""
+    db = SessionLocal()
+    try:
+        return vector_service.sync_index(db)
+    finally:
+        db.close()
+
+
 def ensure_vector_data():
-    """Auto-populate vector database if empty"""
+    """Bring the vector database up to date, returning the sync results
+    (None if it could not run).
+
+    The sync is incremental, so a populated index only embeds what changed
+    since the last run.
+    """
     try:
+        print("Syncing vector database with SQL database...")
+        results = run_vector_sync()
         stats = vector_service.get_collection_stats()
-        if stats["reviews_count"] == 0 and stats["qa_count"] == 0:
-            print("Vector database is empty. Initializing from SQL database...")
-
-            db = SessionLocal()
-            try:
-                # Index reviews
-                print("Indexing reviews...")
-                vector_service.index_reviews(db)
-
-                # Index Q&A
-                print("Indexing Q&A pairs...")
-                vector_service.index_qa(db)
-
-                # Check final stats
-                final_stats = vector_service.get_collection_stats()
-                print("Vector database initialized successfully!")
-                print(
-                    f"Reviews: {final_stats['reviews_count']}, Q&A: {final_stats['qa_count']}"
-                )
-
-            finally:
-                db.close()
-        else:
-            print(
-                f"Vector database already populated: {stats['reviews_count']} reviews, {stats['qa_count']} Q&A"
-            )
+        print(
+            f"Vector database synced ({results}): "
+            f"{stats['reviews_count']} reviews, {stats['qa_count']} Q&A"
+        )
+        return results
 
     except Exception as e:
         print(f"Warning: Could not initialize vector database: {e}")
         print("AI service will still work, but may have limited functionality")
+        return None
+
+
+# Startup indexing status, reported by /ai/health
+vector_bootstrap = {
+    "state": "pending",  # pending -> indexing -> ready | failed
+    "started_at": None,
+    "finished_at": None,
+}
+
+
+def bootstrap_vector_index():
+    """Sync the vector index after startup, then keep it in sync.
+
+    Runs on a background thread so the service accepts traffic at once.
+    An index that already holds documents serves searches while it is
+    brought up to date; an empty one leaves the review and Q&A tools on SQL
+    keyword search until the sync finishes. A sync interrupted by shutdown
+    resumes from its checkpoint on the next start.
+    """
+    vector_bootstrap.update(state="indexing", started_at=time.time())
+    try:
+        results = ensure_vector_data()
+        succeeded = results is not None and all(
+            result is not None for result in results.values()
+        )
+        vector_bootstrap["state"] = "ready" if succeeded else "failed"
+    except Exception as e:
+        vector_bootstrap["state"] = "failed"
+        print(f"Warning: Vector index bootstrap failed: {e}")
+    finally:
+        vector_bootstrap["finished_at"] = time.time()
+        # A failed bootstrap is retried by the periodic sync
+        if settings.VECTOR_SYNC_INTERVAL_SECONDS > 0:
+            vector_sync_job.start()
+
+
+def sync_vector_changes(changes):
+    """Apply row changes from the database to the vector index"""
+    if is_resync(changes):
+        # Which rows changed is unknown; the incremental sync finds them
+        run_vector_sync()
+        return
+    db = SessionLocal()
+    try:
+        vector_service.apply_changes(db, changes)
+    finally:
+        db.close()
+
+
+change_listener = ChangeListener(DATABASE_URL)
+change_listener.add_handler(invalidate_cache_for_changes)
+# Waits on the index write lock, so it must not hold up cache invalidation
+vector_change_handler = QueuedHandler(sync_vector_changes, "vector-changes")
+change_listener.add_handler(vector_change_handler)
+
+vector_sync_job = PeriodicJob(
+    "vector-sync", run_vector_sync, settings.VECTOR_SYNC_INTERVAL_SECONDS
+)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize vector database on startup if needed"""
-    ensure_vector_data()
+    """Start indexing in the background; startup never waits for the corpus"""
+    threading.Thread(
+        target=bootstrap_vector_index, name="vector-bootstrap", daemon=True
+    ).start()
+
+    if CacheConfig.CHANGE_LISTENER_ENABLED:
+        check_triggers(engine)
+        vector_change_handler.start()
+        change_listener.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    change_listener.stop()
+    vector_change_handler.stop()
+    vector_sync_job.stop()
+    shutdown_executors()
+    embedding_pool.shutdown()
+
+
+AgentMode = Literal["graph", "tool_calling"]
+
+AGENTS = {"graph": laptop_agent, "tool_calling": tool_calling_agent}
+
+
+# Shares in-flight agent runs between identical opening messages
+singleflight = SingleFlight()
+
+
+def get_agent(mode: Optional[str] = None):
+    """Agent for a request, defaulting to the configured AGENT_MODE"""
+    return AGENTS.get(mode or settings.AGENT_MODE, laptop_agent)
 
 
 class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
+    agent_mode: Optional[AgentMode] = None  # per-request override for A/B tests
 
 
 class ChatResponse(BaseModel):
@@ -88,17 +213,152 @@ class ChatResponse(BaseModel):
     status: str = "success"
 
 
+class SearchRequest(BaseModel):
+    query: str
+    laptop_id: Optional[int] = None
+    limit: int = Field(10, ge=1, le=50)
+    sources: Optional[List[Literal["review", "qa"]]] = None  # default: all
+    mode: Optional[Literal["hybrid", "vector"]] = None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[Dict[str, Any]]
+    index_ready: bool = True  # False while the vector index is being built
+
+
 # Health check
 @app.get("/ai/health")
 def health_check():
+    # "degraded": serving, with review and Q&A search on SQL keyword matching
     return {
-        "status": "healthy",
+        "status": "healthy" if vector_service.ready else "degraded",
         "service": "AI Service",
         "version": "1.0.0",
         "openai_configured": bool(settings.OPENAI_API_KEY),
+        "vector_index": {
+            **vector_bootstrap,
+            "ready": vector_service.ready,
+            "progress": vector_service.sync_progress,
+        },
     }
 
 
+# Metrics
+@app.get("/ai/metrics")
+def metrics():
+    return {
+        "semantic_cache": semantic_cache.stats(),
+        "shared_cache": cache.stats(),
+        "llm_cache": llm_call_cache.stats() if llm_call_cache else None,
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "query_embeddings": query_embedding_cache.stats(),
+        "query_router": query_router.stats(),
+        "conversations": conversation_memory.stats(),
+        "singleflight": singleflight.stats(),
+        "llm_admission": llm_admission.stats(),
+        "abandoned_tool_calls": {
+            calls.name: calls.stats() for calls in abandoned_calls.values()
+        },
+        "models": model_metrics.stats(),
+        "vector_index": {
+            "last_sync": vector_service.last_sync,
+            "progress": vector_service.sync_progress,
+        },
+    }
+
+
+async def lookup_cached_response(namespace: str, message: str):
+    """Check the semantic cache off the event loop; returns (response, vector)"""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None, None
+    cached, vector = await run_blocking(
+        embedding_executor, semantic_cache.lookup, namespace, message
+    )
+    annotate(semantic_cache_hit=cached is not None)
+    return cached, vector
+
+
+def store_cached_response(namespace: str, message: str, response: str, vector):
+    if settings.SEMANTIC_CACHE_ENABLED and not response.startswith(
+        ERROR_RESPONSE_PREFIX
+    ):
+        semantic_cache.store(namespace, message, response, vector)
+
+
+async def remember_turn(conversation, message: str, response: str) -> None:
+    if not response.startswith(ERROR_RESPONSE_PREFIX):
+        await conversation_memory.arecord(conversation, message, response)
+
+
+@tracer.traced("chat.request")
+async def answer_query(
+    namespace: str,
+    message: str,
+    query: str,
+    db: Session,
+    conversation_id: str,
+    agent_mode: str = None,
+) -> str:
+    """Run the agent for a query unless a paraphrase was already answered.
+
+    Follow-ups depend on earlier turns, so only a conversation's first
+    message may be answered from (or stored in) the semantic cache.
+    """
+    conversation = await run_blocking(
+        db_executor, conversation_memory.load, conversation_id
+    )
+    first_turn = not conversation.has_history
+    annotate(namespace=namespace, first_turn=first_turn)
+
+    if first_turn:
+        response, turn_state = await answer_first_turn(
+            namespace, message, query, db, agent_mode
+        )
+        conversation.absorb(turn_state)
+    else:
+        response = await get_agent(agent_mode).aprocess_query(query, db, conversation)
+    await remember_turn(conversation, message, response)
+    return response
+
+
+async def answer_first_turn(
+    namespace: str, message: str, query: str, db: Session, agent_mode: str = None
+):
+    """Answer an opening message, sharing one run among identical requests.
+
+    Opening messages don't depend on any history, so concurrent identical
+    ones (a promo prompt sent by many users at once) await a single
+    semantic-cache lookup and agent run. Returns the response plus the tool
+    state it produced, for each caller's own conversation.
+    """
+
+    async def run():
+        turn_state = Conversation(conversation_id="first_turn")
+        cached, vector = await lookup_cached_response(namespace, message)
+        if cached is not None:
+            return cached, turn_state
+        response = await get_agent(agent_mode).aprocess_query(query, db, turn_state)
+        store_cached_response(namespace, message, response, vector)
+        return response, turn_state
+
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return await run()
+    key = (
+        f"{namespace}:{agent_mode or settings.AGENT_MODE}:{normalize_message(message)}"
+    )
+    return await singleflight.do(key, run)
+
+
+def overloaded_error(e: Overloaded) -> HTTPException:
+    """429/503 telling the client when to retry"""
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.to_dict()["detail"],
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 # Chat endpoint
 @app.post("/ai/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
@@ -106,32 +366,35 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
     Chat endpoint for natural language queries about laptops
     """
     try:
-        # Process the query using the LangGraph agent
-        response = laptop_agent.process_query(request.message, db)
-
         # Generate conversation ID if not provided
-        conversation_id = request.conversation_id or f"conv_{hash(request.message)}"
+        conversation_id = request.conversation_id or new_conversation_id("conv")
+
+        # Process the query using the LangGraph agent
+        response = await answer_query(
+            "chat",
+            request.message,
+            request.message,
+            db,
+            conversation_id,
+            request.agent_mode,
+        )
 
         return ChatResponse(
             response=response, conversation_id=conversation_id, status="success"
         )
 
+    except Overloaded as e:
+        raise overloaded_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error processing chat request: {str(e)}"
         )
 
 
-# Recommendation endpoint
-@app.post("/ai/recommend", response_model=ChatResponse)
-async def recommend_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
-    """
-    Recommendation endpoint with structured prompting
-    """
-    try:
-        # Enhance the query with recommendation context
-        enhanced_query = f"""
-        Please provide laptop recommendations based on this request: {request.message}
+def build_recommendation_query(message: str) -> str:
+    """Enhance the query with recommendation context"""
+    return f"""
+        Please provide laptop recommendations based on this request: {message}
 
         Include:
         - Specific laptop models with reasoning
@@ -141,20 +404,161 @@ async def recommend_endpoint(request: ChatRequest, db: Session = Depends(get_db)
         - Clear pros/cons for each recommendation
         """
 
-        response = laptop_agent.process_query(enhanced_query, db)
 
-        conversation_id = request.conversation_id or f"rec_{hash(request.message)}"
+# Recommendation endpoint
+@app.post("/ai/recommend", response_model=ChatResponse)
+async def recommend_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
+    """
+    Recommendation endpoint with structured prompting
+    """
+    try:
+        enhanced_query = build_recommendation_query(request.message)
+        conversation_id = request.conversation_id or new_conversation_id("rec")
+
+        response = await answer_query(
+            "recommend",
+            request.message,
+            enhanced_query,
+            db,
+            conversation_id,
+            request.agent_mode,
+        )
 
         return ChatResponse(
             response=response, conversation_id=conversation_id, status="success"
         )
 
+    except Overloaded as e:
+        raise overloaded_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error generating recommendations: {str(e)}"
         )
 
 
+def stream_agent_events(
+    namespace: str,
+    message: str,
+    query: str,
+    conversation_id: str,
+    agent_mode: str = None,
+) -> StreamingResponse:
+    """Stream agent progress and answer tokens as Server-Sent Events.
+
+    The final "done" event carries a ChatResponse payload, so clients get
+    the same contract as the non-streaming endpoints. Its status is
+    "partial" when the answer was cut off by a synthesis failure.
+    """
+
+    def done_event(response: str, partial: bool = False) -> str:
+        data = ChatResponse(
+            response=response,
+            conversation_id=conversation_id,
+            status="partial" if partial else "success",
+        ).model_dump()
+        return f"event: done\ndata: {json.dumps(data)}\n\n"
+
+    @tracer.traced("chat.stream")
+    async def event_source():
+        conversation = await run_blocking(
+            db_executor, conversation_memory.load, conversation_id
+        )
+        first_turn = not conversation.has_history
+        annotate(namespace=namespace, first_turn=first_turn)
+
+        vector = None
+        if first_turn:
+            cached, vector = await lookup_cached_response(namespace, message)
+            if cached is not None:
+                await remember_turn(conversation, message, cached)
+                yield f"event: token\ndata: {json.dumps({'content': cached})}\n\n"
+                yield done_event(cached)
+                return
+
+        agent = get_agent(agent_mode)
+        async for event in agent.astream_query(query, conversation=conversation):
+            if event["event"] == "done":
+                response = event["data"]["response"]
+                partial = event["data"].get("partial", False)
+                # A cut-off answer is shown once, never replayed or built on
+                if not partial:
+                    if first_turn:
+                        store_cached_response(namespace, message, response, vector)
+                    await remember_turn(conversation, message, response)
+                yield done_event(response, partial)
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Streaming chat endpoint
+@app.post("/ai/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Chat endpoint that streams progress events and response tokens (SSE)
+    """
+    try:
+        llm_admission.check()
+    except Overloaded as e:
+        raise overloaded_error(e)
+    conversation_id = request.conversation_id or new_conversation_id("conv")
+    return stream_agent_events(
+        "chat", request.message, request.message, conversation_id, request.agent_mode
+    )
+
+
+# Streaming recommendation endpoint
+@app.post("/ai/recommend/stream")
+async def recommend_stream_endpoint(request: ChatRequest):
+    """
+    Recommendation endpoint that streams progress events and response tokens (SSE)
+    """
+    try:
+        llm_admission.check()
+    except Overloaded as e:
+        raise overloaded_error(e)
+    conversation_id = request.conversation_id or new_conversation_id("rec")
+    return stream_agent_events(
+        "recommend",
+        request.message,
+        build_recommendation_query(request.message),
+        conversation_id,
+        request.agent_mode,
+    )
+
+
+# Search endpoint
+@app.post("/ai/search", response_model=SearchResponse)
+async def search_endpoint(request: SearchRequest):
+    """
+    Search reviews and Q&A (and any other collection) with one query
+    embedding; hits are merged by normalized score and tagged by source
+    """
+    try:
+        results = await run_blocking(
+            embedding_executor,
+            vector_service.search_all,
+            request.query,
+            request.laptop_id,
+            request.limit,
+            request.sources,
+            request.mode,
+        )
+        return SearchResponse(
+            query=request.query, results=results, index_ready=vector_service.ready
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error processing search request: {str(e)}"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,153 @@
+# ai_services/src/services/agent_toolkit.py
+from typing import Any, Dict, List, Optional
+from concurrent.futures import Future
+from contextvars import copy_context
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.core.tracing import tracer, annotate
+from ai_services.src.core.config import settings
+from ai_services.src.core.database import SessionLocal, set_statement_timeout
+from ai_services.src.core.executors import (
+    db_executor,
+    embedding_executor,
+    abandoned_calls,
+)
+from ai_services.src.services.langchain_tools import get_laptop_tools
+from ai_services.src.services.query_router import query_router
+from ai_services.src.services.conversation_store import Conversation
+
+# Tools whose work is dominated by query embedding rather than SQL
+EMBEDDING_TOOLS = {"search_reviews", "search_qa"}
+
+
+class AgentState(Dict):
+    """State object for the agent graph"""
+
+    messages: List[Any]
+    user_query: str
+    context: Dict[str, Any]
+    db_session: Session
+    final_response: str
+
+
+def initial_state(
+    user_query: str,
+    db_session: Session,
+    conversation: Optional[Conversation] = None,
+) -> AgentState:
+    return AgentState(
+        messages=[],
+        user_query=user_query,
+        context={"conversation": conversation} if conversation else {},
+        db_session=db_session,
+        final_response="",
+    )
+
+
+def conversation_text(state: AgentState) -> str:
+    """Earlier turns of the conversation as a prompt prefix, if any"""
+    conversation = state["context"].get("conversation")
+    if conversation is None or not conversation.has_history:
+        return ""
+    return f"Conversation so far:\n{conversation.prompt_context()}\n\n"
+
+
+class AgentToolkit:
+    """The laptop tools and how they are run, shared by both agents.
+
+    Each call gets its own DB session and runs on the executor for its kind
+    of work. A call past the tool timeout is abandoned rather than awaited,
+    and while abandoned calls fill a pool new calls to it are refused, so
+    both agents behave the same under slow queries.
+    """
+
+    def __init__(self, session_factory=None, router=None):
+        # Tools run in parallel, so each one opens its own session
+        self.session_factory = session_factory or SessionLocal
+        # Obvious intents are routed locally instead of by an LLM call
+        self.router = router or (
+            query_router if settings.QUERY_ROUTER_ENABLED else None
+        )
+        self.tools = get_laptop_tools()
+        self.tool_map = {tool.name: tool for tool in self.tools}
+
+    def route(self, state: AgentState) -> Optional[Dict[str, Any]]:
+        """Analysis from the local router, or None to ask the LLM"""
+        if self.router is None:
+            return None
+        conversation = state["context"].get("conversation")
+        try:
+            return self.router.route(
+                state["user_query"],
+                default_laptop_ids=conversation.laptop_ids if conversation else None,
+            )
+        except Exception as e:
+            logging.error(f"Query router failed: {e}")
+            return None
+
+    def run(self, tool_name: str, tool, params: Dict[str, Any]) -> str:
+        """Run one tool with its own DB session so tools can run concurrently.
+
+        The session's queries are cancelled past the tool timeout, so a call
+        the agent gave up on doesn't hold its worker and connection for long.
+        """
+        with tracer.span(f"tool.{tool_name}", params=params):
+            db = self.session_factory()
+            try:
+                if db is not None:
+                    set_statement_timeout(db, settings.TOOL_TIMEOUT_SECONDS)
+                result = tool._run(**params, db=db)
+            except Exception as e:
+                logging.error(f"Tool {tool_name} failed: {e}")
+                result = f"Error executing {tool_name}: {str(e)}"
+                annotate(failed=True)
+            finally:
+                if db is not None:
+                    db.close()
+            annotate(result_chars=len(str(result)))
+            return result
+
+    @staticmethod
+    def executor_for(tool_name: str):
+        return embedding_executor if tool_name in EMBEDDING_TOOLS else db_executor
+
+    @staticmethod
+    def timeout_message(tool_name: str) -> str:
+        logging.warning(
+            f"Tool {tool_name} timed out after {settings.TOOL_TIMEOUT_SECONDS}s"
+        )
+        annotate(**{f"timeout.{tool_name}": True})
+        return f"Timed out executing {tool_name}; results are unavailable."
+
+    @staticmethod
+    def busy_message(tool_name: str) -> str:
+        logging.warning(f"Skipping {tool_name}: timed-out calls fill its pool")
+        annotate(**{f"skipped.{tool_name}": True})
+        return f"Error executing {tool_name}: too many earlier calls are still running."
+
+    def submit(self, tool_name: str, func, *args) -> Optional[Future]:
+        """Start a tool call on its pool; None while abandoned calls fill it"""
+        executor = self.executor_for(tool_name)
+        if abandoned_calls[executor].saturated:
+            return None
+        return executor.submit(copy_context().run, func, *args)
+
+    def abandon(self, tool_name: str, future: Future) -> str:
+        """Give up on a timed-out call, counting it while it still runs"""
+        abandoned_calls[self.executor_for(tool_name)].track(future)
+        return self.timeout_message(tool_name)
+
+    async def await_call(self, tool_name: str, func, *args) -> str:
+        """Run a tool call on its pool without blocking, with the tool timeout"""
+        future = self.submit(tool_name, func, *args)
+        if future is None:
+            return self.busy_message(tool_name)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=settings.TOOL_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            return self.abandon(tool_name, future)
@@ -0,0 +1,165 @@
+# ai_services/src/services/context_builder.py
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+from ai_services.src.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Per-message overhead of the chat format, as counted by OpenAI
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+# Numbered ("1. ") or bulleted ("- ") result items in tool output
+_ITEM_START = re.compile(r"^(?:\d+\.|-) ", re.MULTILINE)
+_MATCH = re.compile(r"Match: (-?[\d.]+)")
+_HELPFUL = re.compile(r"Helpful votes: (\d+)")
+_RATING = re.compile(r"Rating: ([\d.]+)")
+
+_encoders: Dict[str, Any] = {}
+
+
+def _encoder(model: str):
+    """tiktoken encoder for a model, or None to fall back to estimates"""
+    if model not in _encoders:
+        try:
+            _encoders[model] = tiktoken.encoding_for_model(model) if tiktoken else None
+        except Exception as e:
+            # Unknown model names or no network to fetch the BPE files
+            logging.warning(f"tiktoken unavailable for {model}, estimating: {e}")
+            _encoders[model] = None
+    return _encoders[model]
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    encoder = _encoder(model or AIConfig.DEFAULT_MODEL)
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text))
+
+
+def count_message_tokens(messages: Sequence[Any], model: str = None) -> int:
+    """Prompt tokens for a list of chat messages"""
+    return sum(
+        count_tokens(str(message.content), model) + _MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+@dataclass
+class _Snippet:
+    tool: str
+    text: str
+    score: float
+    position: int
+    tokens: int = 0
+
+
+def _split(result: str) -> Tuple[str, List[str]]:
+    """Split tool output into its header and individual result items"""
+    text = result.strip("\n")
+    starts = [match.start() for match in _ITEM_START.finditer(text)]
+    if not starts:
+        return text, []
+    header = text[: starts[0]].rstrip()
+    items = [
+        text[start:end].strip() for start, end in zip(starts, starts[1:] + [len(text)])
+    ]
+    return header, items
+
+
+def _score(item: str, position: int) -> float:
+    """Rank vector hits by similarity, nudged by helpful votes and rating.
+
+    Items without a match score are database facts (laptop lists), which
+    outrank fuzzy review and Q&A matches and keep their original order.
+    """
+    match = _MATCH.search(item)
+    if match is None:
+        return 2.0 - position * 1e-3
+    score = float(match.group(1))
+    helpful = _HELPFUL.search(item)
+    if helpful:
+        score += 0.05 * math.log1p(int(helpful.group(1)))
+    rating = _RATING.search(item)
+    if rating:
+        score += 0.02 * (float(rating.group(1)) - 3)
+    return score
+
+
+def _dedupe_key(item: str) -> Optional[str]:
+    """Body of a vector hit; the same review or answer can come back twice"""
+    if not _MATCH.search(item):
+        return None
+    body = item.split("\n", 1)[-1]
+    return " ".join(body.lower().split())[:200]
+
+
+def build_context(
+    tool_results: Dict[str, str], budget: int = None, model: str = None
+) -> Tuple[str, Dict[str, int]]:
+    """Fit tool results into a token budget for the synthesis prompt.
+
+    Every tool keeps its header line; result items are deduplicated,
+    ranked across tools and added best-first until the budget is spent.
+    Returns the context text and counts for logging.
+    """
+    budget = budget or settings.SYNTHESIS_CONTEXT_TOKEN_BUDGET
+    headers = {}
+    snippets = []
+    used = 0
+    duplicates = 0
+    seen = set()
+
+    for tool, result in tool_results.items():
+        header, items = _split(str(result))
+        headers[tool] = f"=== {tool.upper()} RESULTS ===\n{header}"
+        used += count_tokens(headers[tool], model)
+        for position, item in enumerate(items):
+            key = _dedupe_key(item)
+            if key is not None:
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+            snippets.append(
+                _Snippet(
+                    tool,
+                    item,
+                    _score(item, position),
+                    position,
+                    count_tokens(item, model),
+                )
+            )
+
+    kept: Dict[str, List[_Snippet]] = {tool: [] for tool in tool_results}
+    dropped = Counter()
+    for snippet in sorted(snippets, key=lambda s: s.score, reverse=True):
+        if used + snippet.tokens <= budget:
+            kept[snippet.tool].append(snippet)
+            used += snippet.tokens
+        else:
+            dropped[snippet.tool] += 1
+
+    sections = []
+    for tool, header in headers.items():
+        lines = [header]
+        lines.extend(s.text for s in sorted(kept[tool], key=lambda s: -s.score))
+        if dropped[tool]:
+            lines.append(f"({dropped[tool]} lower-ranked results omitted)")
+        sections.append("\n".join(lines) + "\n")
+
+    return "\n".join(sections), {
+        "context_tokens": used,
+        "budget": budget,
+        "snippets": sum(len(v) for v in kept.values()),
+        "dropped": sum(dropped.values()),
+        "duplicates": duplicates,
+    }
@@ -0,0 +1,437 @@
+# ai_services/src/services/conversation_store.py
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.schema import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.cache import cache
+from backend.src.app.services.llm_cache import llm_call_cache, LangChainLLMCache
+from backend.src.app.services.llm_cassette import llm_cassette, http_clients
+from ai_services.src.core.config import settings
+from ai_services.src.core.executors import run_blocking, db_executor
+from ai_services.src.services.model_router import ModelRouter, SUMMARY_STEP
+
+_LAPTOP_ID_PATTERN = re.compile(r"\(ID: (\d+)\)")
+
+# Tool outputs that must not be replayed on later turns
+_FAILED_RESULT_PREFIXES = (
+    "Error",
+    "Timed out",
+    "Database session not available",
+    "Unknown tool",
+)
+
+# Keyword fallbacks served while the vector index builds: fine for this
+# turn, but later turns should get the semantic results
+_PROVISIONAL_RESULT_MARKER = "(semantic search is still indexing)"
+
+
+def new_conversation_id(prefix: str = "conv") -> str:
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+
+def _tool_key(tool_name: str, params: Dict[str, Any]) -> str:
+    return f"{tool_name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+@dataclass
+class Conversation:
+    """Turns, rolling summary and reusable tool results of one conversation"""
+
+    conversation_id: str
+    turns: List[Dict[str, str]] = field(default_factory=list)
+    summary: str = ""
+    laptop_ids: List[int] = field(default_factory=list)
+    pending_laptop_ids: List[int] = field(default_factory=list)
+    tool_results: Dict[str, str] = field(default_factory=dict)
+    # Data version each tool result was produced under
+    tool_versions: Dict[str, str] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def has_history(self) -> bool:
+        return bool(self.turns or self.summary)
+
+    def _note_laptops(self, params: Dict[str, Any], result: str) -> None:
+        ids = []
+        if params.get("laptop_id") is not None:
+            ids.append(params["laptop_id"])
+        ids.extend(_LAPTOP_ID_PATTERN.findall(result))
+        for laptop_id in ids:
+            try:
+                laptop_id = int(laptop_id)
+            except (TypeError, ValueError):
+                continue
+            if laptop_id not in self.pending_laptop_ids:
+                self.pending_laptop_ids.append(laptop_id)
+
+    def tool_result(self, tool_name: str, params: Dict[str, Any]) -> Optional[str]:
+        """Output of an identical tool call from an earlier turn, if any and
+        the data hasn't changed since"""
+        key = _tool_key(tool_name, params)
+        result = self.tool_results.get(key)
+        if result is None or self.tool_versions.get(key) != cache.data_version():
+            return None
+        self._note_laptops(params, result)
+        return result
+
+    def remember_tool_result(
+        self, tool_name: str, params: Dict[str, Any], result: str
+    ) -> None:
+        self._note_laptops(params, result)
+        if (
+            result.startswith(_FAILED_RESULT_PREFIXES)
+            or _PROVISIONAL_RESULT_MARKER in result
+        ):
+            return
+        key = _tool_key(tool_name, params)
+        self.tool_results.pop(key, None)
+        self.tool_results[key] = result
+        self.tool_versions[key] = cache.data_version()
+        while len(self.tool_results) > settings.CONVERSATION_MAX_TOOL_RESULTS:
+            oldest = next(iter(self.tool_results))
+            del self.tool_results[oldest]
+            self.tool_versions.pop(oldest, None)
+
+    def absorb(self, other: "Conversation") -> None:
+        """Take over tool results and laptops gathered in a shared run"""
+        for key, result in other.tool_results.items():
+            self.tool_results[key] = result
+            if key in other.tool_versions:
+                self.tool_versions[key] = other.tool_versions[key]
+        for laptop_id in other.pending_laptop_ids:
+            if laptop_id not in self.pending_laptop_ids:
+                self.pending_laptop_ids.append(laptop_id)
+
+    def add_exchange(self, user_message: str, response: str) -> None:
+        """Record a finished turn; its laptops become the conversation's focus"""
+        self.turns.append({"role": "user", "content": user_message})
+        self.turns.append({"role": "assistant", "content": response})
+        if self.pending_laptop_ids:
+            self.laptop_ids = self.pending_laptop_ids
+        self.pending_laptop_ids = []
+        self.updated_at = time.time()
+
+    def prompt_context(self) -> str:
+        """Summary, recent turns and laptops in focus, for LLM prompts"""
+        limit = settings.CONVERSATION_TURN_MAX_CHARS
+        lines = []
+        if self.summary:
+            lines.append(f"Summary of earlier conversation: {self.summary}")
+        if self.turns:
+            lines.append("Recent turns:")
+            for turn in self.turns:
+                content = turn["content"]
+                if len(content) > limit:
+                    content = content[:limit] + "..."
+                lines.append(f"{turn['role'].capitalize()}: {content}")
+        if self.laptop_ids:
+            lines.append(f"Laptop IDs discussed most recently: {self.laptop_ids}")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Conversation":
+        return cls(**json.loads(raw))
+
+
+class ConversationStore(ABC):
+    """Bounded store of conversations, evicting the least recently updated"""
+
+    @abstractmethod
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        """Return a live conversation, or None if unknown or expired"""
+
+    @abstractmethod
+    def save(self, conversation: Conversation) -> None:
+        """Insert or replace a conversation"""
+
+    @abstractmethod
+    def delete(self, conversation_id: str) -> None:
+        """Forget a conversation"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored conversations"""
+
+
+class MemoryConversationStore(ConversationStore):
+    """Per-process LRU store with TTL expiry"""
+
+    def __init__(self, max_entries: int = None, ttl: float = None):
+        self.max_entries = max_entries or settings.CONVERSATION_MAX_ENTRIES
+        self.ttl = ttl or settings.CONVERSATION_TTL_SECONDS
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        with self._lock:
+            raw = self._entries.get(conversation_id)
+            if raw is None:
+                return None
+            conversation = Conversation.from_json(raw)
+            if conversation.updated_at + self.ttl < time.time():
+                del self._entries[conversation_id]
+                return None
+            self._entries.move_to_end(conversation_id)
+            return conversation
+
+    def save(self, conversation: Conversation) -> None:
+        # Stored serialized so callers never share mutable state
+        with self._lock:
+            self._entries[conversation.conversation_id] = conversation.to_json()
+            self._entries.move_to_end(conversation.conversation_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._entries.pop(conversation_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Conversations persisted in SQLite, surviving restarts"""
+
+    def __init__(self, path: Path = None, max_entries: int = None, ttl: float = None):
+        self.path = Path(path or settings.CONVERSATION_DB_PATH)
+        self.max_entries = max_entries or settings.CONVERSATION_MAX_ENTRIES
+        self.ttl = ttl or settings.CONVERSATION_TTL_SECONDS
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                conversation_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_conversations_updated "
+            "ON conversations (updated_at)"
+        )
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM conversations WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()
+        if row is None or row[1] + self.ttl < time.time():
+            return None
+        return Conversation.from_json(row[0])
+
+    def save(self, conversation: Conversation) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+                (
+                    conversation.conversation_id,
+                    conversation.to_json(),
+                    conversation.updated_at,
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM conversations WHERE updated_at < ?",
+                (time.time() - self.ttl,),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM conversations WHERE conversation_id IN (
+                    SELECT conversation_id FROM conversations
+                    ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+                )
+            """,
+                (self.max_entries,),
+            )
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM conversations WHERE conversation_id = ?",
+                (conversation_id,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[
+                0
+            ]
+
+
+def create_conversation_store(backend: str = None) -> ConversationStore:
+    """Create the configured store, falling back to memory"""
+    backend = (backend or settings.CONVERSATION_STORE_BACKEND).lower()
+    if backend == "sqlite":
+        try:
+            return SQLiteConversationStore()
+        except Exception as e:
+            logging.warning(
+                f"SQLite conversation store unavailable ({e}), using memory"
+            )
+    return MemoryConversationStore()
+
+
+def _default_summarizer() -> Callable[[str, List[Dict[str, str]]], str]:
+    http_client, http_async_client = http_clients()
+    llm = ChatOpenAI(
+        model=AIConfig.FALLBACK_MODEL,
+        temperature=0,
+        api_key=AIConfig.OPENAI_API_KEY or ("cassette" if llm_cassette else None),
+        cache=LangChainLLMCache(llm_call_cache) if llm_call_cache else None,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+    # Compaction shares the agents' LLM concurrency limit
+    models = ModelRouter(llm)
+
+    def summarize(summary: str, turns: List[Dict[str, str]]) -> str:
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in turns)
+        response = models.invoke(
+            [
+                SystemMessage(
+                    content="Summarize this laptop shopping conversation in at most "
+                    "five sentences. Keep laptop names, IDs, prices, budgets and "
+                    "the user's requirements; drop pleasantries."
+                ),
+                HumanMessage(
+                    content=f"Earlier summary: {summary or 'none'}\n\n"
+                    f"New turns:\n{transcript}"
+                ),
+            ],
+            step=SUMMARY_STEP,
+        )
+        return response.content
+
+    return summarize
+
+
+class ConversationMemory:
+    """Loads, records and compacts conversations.
+
+    Once a conversation has more than CONVERSATION_MAX_TURNS messages, the
+    older ones are folded into a rolling LLM summary so prompts built from
+    it stay bounded; compaction runs after the response has been sent.
+    """
+
+    def __init__(
+        self,
+        store: ConversationStore = None,
+        summarizer: Callable[[str, List[Dict[str, str]]], str] = None,
+    ):
+        self.store = store or create_conversation_store()
+        self._summarizer = summarizer
+        self._background = set()
+
+    @property
+    def summarizer(self) -> Callable[[str, List[Dict[str, str]]], str]:
+        if self._summarizer is None:
+            self._summarizer = _default_summarizer()
+        return self._summarizer
+
+    def load(self, conversation_id: str) -> Conversation:
+        try:
+            conversation = self.store.get(conversation_id)
+        except Exception as e:
+            logging.error(f"Failed to load conversation {conversation_id}: {e}")
+            conversation = None
+        return conversation or Conversation(conversation_id=conversation_id)
+
+    def save(self, conversation: Conversation) -> None:
+        try:
+            self.store.save(conversation)
+        except Exception as e:
+            logging.error(
+                f"Failed to save conversation {conversation.conversation_id}: {e}"
+            )
+
+    def needs_compaction(self, conversation: Conversation) -> bool:
+        return len(conversation.turns) > settings.CONVERSATION_MAX_TURNS
+
+    def _summarize(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        try:
+            summary = self.summarizer(summary, turns)
+        except Exception as e:
+            logging.warning(f"Conversation summarization failed, truncating: {e}")
+            summary = " ".join(
+                [summary] + [f"{t['role']}: {t['content']}" for t in turns]
+            )
+        return summary.strip()[: settings.CONVERSATION_SUMMARY_MAX_CHARS]
+
+    def compact(self, conversation: Conversation) -> Conversation:
+        """Fold all but the most recent turns into the rolling summary"""
+        old_turns = conversation.turns[: -settings.CONVERSATION_KEEP_TURNS]
+        if old_turns:
+            conversation.summary = self._summarize(conversation.summary, old_turns)
+            conversation.turns = conversation.turns[len(old_turns) :]
+        return conversation
+
+    def record(self, conversation: Conversation, user_message: str, response: str):
+        """Add a finished turn, compacting inline (sync callers)"""
+        conversation.add_exchange(user_message, response)
+        if self.needs_compaction(conversation):
+            self.compact(conversation)
+        self.save(conversation)
+
+    async def arecord(
+        self, conversation: Conversation, user_message: str, response: str
+    ) -> None:
+        """Add a finished turn now; compact in the background if needed"""
+        conversation.add_exchange(user_message, response)
+        await run_blocking(db_executor, self.save, conversation)
+
+        if self.needs_compaction(conversation):
+            task = asyncio.create_task(self._acompact(conversation))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _acompact(self, conversation: Conversation) -> None:
+        old_turns = conversation.turns[: -settings.CONVERSATION_KEEP_TURNS]
+        # Summarizing is a slow LLM call, so keep it off the DB pool
+        summary = await run_blocking(
+            None, self._summarize, conversation.summary, old_turns
+        )
+
+        # A newer turn may have been saved meanwhile: only drop what we folded
+        latest = await run_blocking(
+            db_executor, self.load, conversation.conversation_id
+        )
+        if latest.turns[: len(old_turns)] == old_turns:
+            latest.turns = latest.turns[len(old_turns) :]
+            latest.summary = summary
+            await run_blocking(db_executor, self.save, latest)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.store).__name__,
+            "conversations": len(self.store),
+        }
+
+
+# Global instance
+conversation_memory = ConversationMemory()
@@ -1,5 +1,5 @@
 # ai_services/src/services/database_services.py
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, text, String
 from typing import List, Dict, Any, Optional, Tuple
 from backend.src.utils.logger.logging import logger as logging
@@ -8,6 +8,7 @@ from backend.src.app.models.specification import Specification
 from backend.src.app.models.price_snapshot import PriceSnapshot
 from backend.src.app.models.review import Review
 from backend.src.app.models.questions_answer import QuestionsAnswer
+from ai_services.src.services.lexical_index import tokenize
 
 
 class DatabaseService:
@@ -192,6 +193,70 @@ class DatabaseService:
             logging.error(f"Error in text search: {e}")
             return []
 
+    @staticmethod
+    def _keyword_search(
+        db: Session,
+        model,
+        columns,
+        query: str,
+        laptop_id: Optional[int],
+        limit: int,
+    ) -> List[Any]:
+        """Rows matching the most query keywords, then the most helpful"""
+        terms = [term for term in dict.fromkeys(tokenize(query)) if len(term) > 2]
+        if not terms:
+            return []
+        rows = (
+            db.query(model)
+            .options(joinedload(model.laptop))
+            .filter(or_(*[column.ilike(f"%{t}%") for t in terms for column in columns]))
+        )
+        if laptop_id:
+            rows = rows.filter(model.laptop_id == laptop_id)
+        rows = rows.order_by(model.helpful_count.desc()).limit(limit * 10).all()
+
+        def matched(row) -> int:
+            content = " ".join(str(getattr(row, c.key) or "") for c in columns).lower()
+            return sum(term in content for term in terms)
+
+        return sorted(rows, key=matched, reverse=True)[:limit]
+
+    @staticmethod
+    def search_reviews_text(
+        db: Session, query: str, laptop_id: Optional[int] = None, limit: int = 5
+    ) -> List[Review]:
+        """Keyword search over reviews, used while the vector index is built"""
+        try:
+            return DatabaseService._keyword_search(
+                db,
+                Review,
+                [Review.review_title, Review.review_text],
+                query,
+                laptop_id,
+                limit,
+            )
+        except Exception as e:
+            logging.error(f"Error in review text search: {e}")
+            return []
+
+    @staticmethod
+    def search_qa_text(
+        db: Session, query: str, laptop_id: Optional[int] = None, limit: int = 5
+    ) -> List[QuestionsAnswer]:
+        """Keyword search over Q&A, used while the vector index is built"""
+        try:
+            return DatabaseService._keyword_search(
+                db,
+                QuestionsAnswer,
+                [QuestionsAnswer.question_text, QuestionsAnswer.answer_text],
+                query,
+                laptop_id,
+                limit,
+            )
+        except Exception as e:
+            logging.error(f"Error in Q&A text search: {e}")
+            return []
+
     @staticmethod
     def get_price_trends(
         db: Session, laptop_id: int, days: int = 30
@@ -0,0 +1,110 @@
+# ai_services/src/services/embedding_pool.py
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+
+# Model instance owned by each worker process
+_worker_model = None
+
+
+def load_text_embedding(model_name: str, threads: Optional[int]) -> Any:
+    from fastembed import TextEmbedding
+
+    return TextEmbedding(model_name=model_name, threads=threads)
+
+
+def _init_worker(factory: Callable, model_name: str, threads: Optional[int]) -> None:
+    global _worker_model
+    _worker_model = factory(model_name, threads)
+
+
+def _embed_chunk(texts: List[str], batch_size: int) -> np.ndarray:
+    return np.asarray(
+        list(_worker_model.embed(texts, batch_size=batch_size)), dtype=np.float32
+    )
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class EmbeddingPool:
+    """Data-parallel embedding across worker processes, for bulk indexing.
+
+    One ONNX session leaves most cores of a large machine idle during a full
+    re-index, so each worker process loads its own model instance with
+    `threads` intra-op threads (by default the cores split evenly between
+    workers). Texts are split into one contiguous chunk per worker and the
+    vectors come back in input order. Workers are spawned on first use and
+    kept for later batches; `workers=0` means one per core.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        threads: int = None,
+        model_name: str = None,
+        batch_size: int = None,
+        factory: Callable = load_text_embedding,
+    ):
+        workers = AIConfig.EMBEDDING_WORKERS if workers is None else workers
+        self.workers = workers or cpu_count()
+        self.threads = (
+            threads or AIConfig.EMBEDDING_THREADS or max(1, cpu_count() // self.workers)
+        )
+        self.model_name = model_name or AIConfig.EMBEDDING_MODEL
+        self.batch_size = batch_size or AIConfig.EMBEDDING_BATCH_SIZE
+        self.factory = factory
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the parent runs ONNX and server threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.factory, self.model_name, self.threads),
+                )
+                logging.info(
+                    f"Embedding pool started: {self.workers} workers x "
+                    f"{self.threads} threads"
+                )
+            return self._executor
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32 vectors, in input order"""
+        if not texts:
+            return np.empty((0, AIConfig.EMBEDDING_DIMENSION), dtype=np.float32)
+        size = math.ceil(len(texts) / self.workers)
+        chunks = [texts[start : start + size] for start in range(0, len(texts), size)]
+        results = self._pool().map(_embed_chunk, chunks, repeat(self.batch_size))
+        return np.concatenate(list(results))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global instance
+embedding_pool = EmbeddingPool()
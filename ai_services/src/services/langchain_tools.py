@@ -4,6 +4,8 @@ from typing import List, Dict, Any, Optional, Type
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.core.cache import cache, make_key, laptop_tag
+from backend.src.app.config.cache_config import CacheConfig
 from ai_services.src.services.database_services import database_service
 from ai_services.src.services.vector_service import vector_service
 
@@ -101,6 +103,14 @@ class LaptopSummaryTool(BaseTool):
         except (ValueError, TypeError):
             return f"Error: Invalid laptop ID format: {laptop_id}"
 
+        return cache.get_or_set(
+            make_key("laptop_summary", laptop_id),
+            lambda: self._build_summary(db, laptop_id),
+            ttl=CacheConfig.LAPTOP_SUMMARY_TTL,
+            tags=["laptops", laptop_tag(laptop_id)],
+        )
+
+    def _build_summary(self, db: Session, laptop_id: int) -> str:
         summary = database_service.get_laptop_summary(db, laptop_id)
 
         if not summary:
@@ -128,6 +138,8 @@ class ReviewSearchTool(BaseTool):
     def _run(
         self, query: str, laptop_id: Optional[int] = None, limit: int = 5, **kwargs
     ) -> str:
+        if not vector_service.ready:
+            return self._keyword_search(query, laptop_id, limit, kwargs.get("db"))
         results = vector_service.search_reviews(query, laptop_id, limit)
 
         if not results:
@@ -136,11 +148,36 @@ class ReviewSearchTool(BaseTool):
 
         result = f"Found {len(results)} relevant reviews:\n"
         for i, review in enumerate(results):
-            result += f"{i+1}. {review['metadata']['laptop_name']} - Rating: {review['metadata']['rating']}\n"
+            result += f"{i+1}. {review['metadata']['laptop_name']} - Rating: {review['metadata']['rating']}"
+            result += f" - Helpful votes: {review['metadata'].get('helpful_count', 0)}"
+            result += f" - Match: {1 - review['distance']:.2f}\n"
             result += f"   {review['document'][:150]}...\n\n"
 
         return result
 
+    def _keyword_search(
+        self, query: str, laptop_id: Optional[int], limit: int, db: Session
+    ) -> str:
+        """SQL keyword matches while the vector index is still being built"""
+        if not db:
+            logging.warning("Database session not available")
+            return "Database session not available"
+
+        reviews = database_service.search_reviews_text(db, query, laptop_id, limit)
+        if not reviews:
+            return f"No reviews found for query: {query} (semantic search is still indexing)"
+
+        result = f"Found {len(reviews)} reviews matching keywords (semantic search is still indexing):\n"
+        for i, review in enumerate(reviews):
+            result += (
+                f"{i+1}. {review.laptop.full_model_name} - Rating: {review.rating or 0}"
+            )
+            result += f" - Helpful votes: {review.helpful_count or 0}\n"
+            text = f"{review.review_title or ''} {review.review_text or ''}".strip()
+            result += f"   {text[:150]}...\n\n"
+
+        return result
+
 
 class QASearchTool(BaseTool):
     name: str = "search_qa"  # Add type annotation
@@ -150,6 +187,8 @@ class QASearchTool(BaseTool):
     def _run(
         self, query: str, laptop_id: Optional[int] = None, limit: int = 5, **kwargs
     ) -> str:
+        if not vector_service.ready:
+            return self._keyword_search(query, laptop_id, limit, kwargs.get("db"))
         results = vector_service.search_qa(query, laptop_id, limit)
 
         if not results:
@@ -158,12 +197,37 @@ class QASearchTool(BaseTool):
 
         result = f"Found {len(results)} relevant Q&A pairs:\n"
         for i, qa in enumerate(results):
-            result += f"{i+1}. {qa['metadata']['laptop_name']}\n"
+            result += f"{i+1}. {qa['metadata']['laptop_name']}"
+            result += f" - Helpful votes: {qa['metadata'].get('helpful_count', 0)}"
+            result += f" - Match: {1 - qa['distance']:.2f}\n"
             result += f"   Q: {qa['metadata']['question'][:100]}...\n"
             result += f"   A: {qa['metadata']['answer'][:100]}...\n\n"
 
         return result
 
+    def _keyword_search(
+        self, query: str, laptop_id: Optional[int], limit: int, db: Session
+    ) -> str:
+        """SQL keyword matches while the vector index is still being built"""
+        if not db:
+            logging.warning("Database session not available")
+            return "Database session not available"
+
+        pairs = database_service.search_qa_text(db, query, laptop_id, limit)
+        if not pairs:
+            return (
+                f"No Q&A found for query: {query} (semantic search is still indexing)"
+            )
+
+        result = f"Found {len(pairs)} Q&A pairs matching keywords (semantic search is still indexing):\n"
+        for i, qa in enumerate(pairs):
+            result += f"{i+1}. {qa.laptop.full_model_name}"
+            result += f" - Helpful votes: {qa.helpful_count or 0}\n"
+            result += f"   Q: {qa.question_text[:100]}...\n"
+            result += f"   A: {(qa.answer_text or '')[:100]}...\n\n"
+
+        return result
+
 
 # Tool list for the agent
 def get_laptop_tools() -> List[BaseTool]:
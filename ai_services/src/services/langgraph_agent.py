@@ -1,5 +1,5 @@
 # backend/src/app/services/langgraph_agent.py
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
 
 try:
     from langgraph.graph import StateGraph, END
@@ -13,33 +13,92 @@ except ImportError:
 
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from sqlalchemy.orm import Session
+from concurrent.futures import wait
+import asyncio
 import json
 
 from backend.src.utils.logger.logging import logger as logging
-from ai_services.src.services.langchain_tools import get_laptop_tools
+from ai_services.src.services.conversation_store import Conversation
+from ai_services.src.services.agent_toolkit import (
+    AgentState,
+    AgentToolkit,
+    conversation_text,
+    initial_state,
+)
+from ai_services.src.services.context_builder import (
+    build_context,
+    count_message_tokens,
+)
+from ai_services.src.core.config import settings
+from ai_services.src.core.executors import run_blocking, embedding_executor
+from ai_services.src.core.admission import Overloaded
+from ai_services.src.services.model_router import (
+    ModelRouter,
+    ANALYSIS_STEP,
+    SYNTHESIS_STEP,
+)
 from backend.src.app.config.ai_config import AIConfig
-
-
-class AgentState(Dict):
-    """State object for the agent graph"""
-
-    messages: List[Any]
-    user_query: str
-    context: Dict[str, Any]
-    db_session: Session
-    final_response: str
+from backend.src.app.services.llm_cache import llm_call_cache, LangChainLLMCache
+from backend.src.app.services.llm_cassette import llm_cassette, http_clients
+from backend.src.app.core.tracing import tracer, annotate
+
+# Every failure response starts with this, so callers can avoid caching them
+ERROR_RESPONSE_PREFIX = "I encountered an error"
+
+
+def _chat_model(model: str, temperature: float = None) -> ChatOpenAI:
+    temperature = AIConfig.TEMPERATURE if temperature is None else temperature
+    # Record/replay OpenAI traffic when LLM_CASSETTE_MODE is set
+    http_client, http_async_client = http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=AIConfig.OPENAI_API_KEY or ("cassette" if llm_cassette else None),
+        http_client=http_client,
+        http_async_client=http_async_client,
+        # Only deterministic calls are answered from disk; replaying a
+        # sampled answer would pin one sample for the whole cache TTL
+        cache=(
+            LangChainLLMCache(llm_call_cache)
+            if llm_call_cache and temperature == 0
+            else None
+        ),
+        # Report token usage on streamed responses too
+        stream_usage=True,
+    )
 
 
 class LaptopAgent:
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model=AIConfig.DEFAULT_MODEL,
-            temperature=AIConfig.TEMPERATURE,
-            api_key=AIConfig.OPENAI_API_KEY,
-        )
-        self.tools = get_laptop_tools()
-        self.tool_map = {tool.name: tool for tool in self.tools}
+    def __init__(
+        self,
+        llm=None,
+        session_factory=None,
+        router=None,
+        admission=None,
+        fast_llm=None,
+    ):
+        self.llm = llm or _chat_model(AIConfig.DEFAULT_MODEL)
+        if fast_llm is None and llm is None and settings.MODEL_ROUTING_ENABLED:
+            fast_llm = _chat_model(AIConfig.FALLBACK_MODEL)
+        # Picks the model per call; bounded by admission control
+        self.models = ModelRouter(self.llm, fast_llm, admission=admission)
+        # Analysis only picks tools, so it runs at temperature 0 and is cached
+        self.analysis_models = self.models
+        if llm is None:
+            self.analysis_models = ModelRouter(
+                _chat_model(AIConfig.DEFAULT_MODEL, temperature=0),
+                (
+                    _chat_model(AIConfig.FALLBACK_MODEL, temperature=0)
+                    if fast_llm is not None
+                    else None
+                ),
+                admission=admission,
+            )
+        # Tool execution and local routing, shared with the tool-calling agent
+        self.toolkit = AgentToolkit(session_factory=session_factory, router=router)
+        self.tool_map = self.toolkit.tool_map
 
         # Create the graph
         self.graph = self._create_graph()
@@ -48,10 +107,19 @@ class LaptopAgent:
         """Create the LangGraph workflow"""
         graph = StateGraph(AgentState)
 
-        # Add nodes
-        graph.add_node("analyze_query", self._analyze_query)
-        graph.add_node("execute_tools", self._execute_tools)
-        graph.add_node("synthesize_response", self._synthesize_response)
+        # Add nodes (sync for invoke, async for ainvoke)
+        graph.add_node(
+            "analyze_query",
+            RunnableLambda(self._analyze_query, afunc=self._aanalyze_query),
+        )
+        graph.add_node(
+            "execute_tools",
+            RunnableLambda(self._execute_tools, afunc=self._aexecute_tools),
+        )
+        graph.add_node(
+            "synthesize_response",
+            RunnableLambda(self._synthesize_response, afunc=self._asynthesize_response),
+        )
 
         # Add edges
         graph.add_edge("analyze_query", "execute_tools")
@@ -63,8 +131,8 @@ class LaptopAgent:
 
         return graph.compile()
 
-    def _analyze_query(self, state: AgentState) -> AgentState:
-        """Analyze user query and determine which tools to use"""
+    def _analysis_messages(self, state: AgentState) -> List[Any]:
+        """Build the prompt asking the LLM which tools to use"""
         system_prompt = """You are a laptop recommendation assistant. Analyze the user query and determine which tools you need to use.
 
 Available tools:
@@ -96,62 +164,174 @@ Return a JSON object with:
     "intent": "budget_search|spec_search|laptop_details|experience_question|technical_question"
 }"""
 
-        messages = [
+        return [
             SystemMessage(content=system_prompt),
-            HumanMessage(content=f"User query: {state['user_query']}"),
+            HumanMessage(
+                content=f"{conversation_text(state)}User query: {state['user_query']}"
+            ),
         ]
 
+    def _fallback_analysis(self, state: AgentState, error: Exception) -> Dict[str, Any]:
+        """Keyword-based analysis used when the LLM output can't be parsed"""
+        logging.warning(f"Failed to parse analysis, using fallback: {error}")
+        query_lower = state["user_query"].lower()
+        if any(word in query_lower for word in ["price", "budget", "cost", "$"]):
+            return {
+                "tools_needed": ["search_laptops_by_budget"],
+                "tool_params": {
+                    "search_laptops_by_budget": {"min_price": 0, "max_price": 2000}
+                },
+                "intent": "budget_search",
+            }
+        return {
+            "tools_needed": ["search_reviews"],
+            "tool_params": {
+                "search_reviews": {"query": state["user_query"], "limit": 3}
+            },
+            "intent": "general_question",
+        }
+
+    @staticmethod
+    def _with_analysis(state: AgentState, analysis: Dict[str, Any]) -> AgentState:
+        state["context"]["analysis"] = analysis
+        annotate(
+            intent=analysis.get("intent"),
+            tools=analysis.get("tools_needed"),
+            routed_by=analysis.get("routed_by", "llm"),
+        )
+        return state
+
+    @tracer.traced("node.analyze_query")
+    def _analyze_query(self, state: AgentState) -> AgentState:
+        """Analyze user query and determine which tools to use"""
+        analysis = self.toolkit.route(state)
+        if analysis is not None:
+            return self._with_analysis(state, analysis)
+
         try:
-            response = self.llm.invoke(messages)
+            response = self._invoke(self._analysis_messages(state), ANALYSIS_STEP)
             analysis = json.loads(response.content)
-            state["context"]["analysis"] = analysis
+        except Overloaded:
+            raise
         except (json.JSONDecodeError, Exception) as e:
-            logging.warning(f"Failed to parse analysis, using fallback: {e}")
-            # Fallback analysis based on keywords
-            query_lower = state["user_query"].lower()
-            if any(word in query_lower for word in ["price", "budget", "cost", "$"]):
-                analysis = {
-                    "tools_needed": ["search_laptops_by_budget"],
-                    "tool_params": {
-                        "search_laptops_by_budget": {"min_price": 0, "max_price": 2000}
-                    },
-                    "intent": "budget_search",
-                }
-            else:
-                analysis = {
-                    "tools_needed": ["search_reviews"],
-                    "tool_params": {
-                        "search_reviews": {"query": state["user_query"], "limit": 3}
-                    },
-                    "intent": "general_question",
-                }
-            state["context"]["analysis"] = analysis
+            analysis = self._fallback_analysis(state, e)
 
-        return state
+        return self._with_analysis(state, analysis)
 
-    def _execute_tools(self, state: AgentState) -> AgentState:
-        """Execute the determined tools"""
-        analysis = state["context"]["analysis"]
-        tool_results = {}
+    @tracer.traced("node.analyze_query")
+    async def _aanalyze_query(self, state: AgentState) -> AgentState:
+        """Async variant of _analyze_query"""
+        # Routing may embed the query or load the catalog, so run it off-loop
+        analysis = await run_blocking(embedding_executor, self.toolkit.route, state)
+        if analysis is not None:
+            return self._with_analysis(state, analysis)
+
+        try:
+            response = await self.analysis_models.ainvoke(
+                self._analysis_messages(state), step=ANALYSIS_STEP
+            )
+            analysis = json.loads(response.content)
+        except Overloaded:
+            raise
+        except (json.JSONDecodeError, Exception) as e:
+            analysis = self._fallback_analysis(state, e)
 
+        return self._with_analysis(state, analysis)
+
+    def _invoke(self, messages: List[Any], step: str, intent: str = None) -> Any:
+        """Blocking model call for the synchronous pipeline, under the same
+        routing and admission limits as the async one"""
+        models = self.analysis_models if step == ANALYSIS_STEP else self.models
+        return models.invoke(messages, step=step, intent=intent)
+
+    @staticmethod
+    def _intent(state: AgentState) -> Optional[str]:
+        return state["context"].get("analysis", {}).get("intent")
+
+    def _tool_calls(self, state: AgentState) -> List[Any]:
+        """Resolve (name, tool, params) for each tool the analysis asked for"""
+        analysis = state["context"]["analysis"]
+        calls = []
         for tool_name in analysis["tools_needed"]:
             if tool_name in self.tool_map:
-                tool = self.tool_map[tool_name]
-                params = analysis["tool_params"].get(tool_name, {})
-                params["db"] = state["db_session"]
+                params = dict(analysis["tool_params"].get(tool_name, {}))
+                calls.append((tool_name, self.tool_map[tool_name], params))
+        return calls
+
+    @staticmethod
+    def _reuse_tool_results(state: AgentState, calls: List[Any]):
+        """Split calls into results reused from earlier turns and calls to run"""
+        conversation = state["context"].get("conversation")
+        if conversation is None:
+            return {}, calls
+        reused, pending = {}, []
+        for tool_name, tool, params in calls:
+            result = conversation.tool_result(tool_name, params)
+            if result is not None:
+                reused[tool_name] = result
+            else:
+                pending.append((tool_name, tool, params))
+        if reused:
+            logging.info(f"Reusing conversation tool results for {list(reused)}")
+            annotate(reused_tools=list(reused))
+        return reused, pending
+
+    @staticmethod
+    def _remember_tool_results(
+        state: AgentState, calls: List[Any], results: Dict[str, str]
+    ) -> None:
+        conversation = state["context"].get("conversation")
+        if conversation is not None:
+            for tool_name, _, params in calls:
+                conversation.remember_tool_result(tool_name, params, results[tool_name])
+
+    @tracer.traced("node.execute_tools")
+    def _execute_tools(self, state: AgentState) -> AgentState:
+        """Execute the determined tools concurrently, keeping partial results"""
+        tool_results, calls = self._reuse_tool_results(state, self._tool_calls(state))
+        futures = {}
+        for tool_name, tool, params in calls:
+            future = self.toolkit.submit(
+                tool_name, self.toolkit.run, tool_name, tool, params
+            )
+            if future is None:
+                tool_results[tool_name] = self.toolkit.busy_message(tool_name)
+            else:
+                futures[tool_name] = future
+        done = set()
+        if futures:
+            done, _ = wait(futures.values(), timeout=settings.TOOL_TIMEOUT_SECONDS)
+
+        for tool_name, future in futures.items():
+            if future in done:
+                tool_results[tool_name] = future.result()
+            else:
+                tool_results[tool_name] = self.toolkit.abandon(tool_name, future)
 
-                try:
-                    result = tool._run(**params)
-                    tool_results[tool_name] = result
-                except Exception as e:
-                    logging.error(f"Tool {tool_name} failed: {e}")
-                    tool_results[tool_name] = f"Error executing {tool_name}: {str(e)}"
+        self._remember_tool_results(state, calls, tool_results)
+        state["context"]["tool_results"] = tool_results
+        return state
+
+    @tracer.traced("node.execute_tools")
+    async def _aexecute_tools(self, state: AgentState) -> AgentState:
+        """Async variant of _execute_tools"""
+        tool_results, calls = self._reuse_tool_results(state, self._tool_calls(state))
+        results = await asyncio.gather(
+            *(
+                self.toolkit.await_call(
+                    tool_name, self.toolkit.run, tool_name, tool, params
+                )
+                for tool_name, tool, params in calls
+            )
+        )
+        tool_results.update({call[0]: result for call, result in zip(calls, results)})
 
+        self._remember_tool_results(state, calls, tool_results)
         state["context"]["tool_results"] = tool_results
         return state
 
-    def _synthesize_response(self, state: AgentState) -> AgentState:
-        """Synthesize final response from tool results"""
+    def _synthesis_messages(self, state: AgentState) -> List[Any]:
+        """Build the prompt that turns tool results into the final answer"""
         system_prompt = """You are a helpful laptop recommendation assistant. Based on the tool results, provide a comprehensive, helpful response to the user's query.
 
 INVENTORY CONSTRAINT:
@@ -179,19 +359,14 @@ FORBIDDEN:
 
 """
 
-        tool_results = state["context"]["tool_results"]
-        context_text = "\n".join(
-            [
-                f"=== {tool.upper()} RESULTS ===\n{result}\n"
-                for tool, result in tool_results.items()
-            ]
-        )
+        # Ranked, deduplicated tool snippets that fit the token budget
+        context_text, context_stats = build_context(state["context"]["tool_results"])
 
         messages = [
             SystemMessage(content=system_prompt),
             HumanMessage(
                 content=f"""
-User Query: {state['user_query']}
+{conversation_text(state)}User Query: {state['user_query']}
 
 Tool Results:
 {context_text}
@@ -201,9 +376,52 @@ Please provide a helpful response based on this information.
             ),
         ]
 
+        prompt_tokens = count_message_tokens(messages)
+        state["context"]["prompt_tokens"] = prompt_tokens
+        annotate(
+            prompt_tokens=prompt_tokens,
+            context_tokens=context_stats["context_tokens"],
+            snippets_dropped=context_stats["dropped"],
+        )
+        logging.info(
+            f"Synthesis prompt: {prompt_tokens} tokens "
+            f"(context {context_stats['context_tokens']}/{context_stats['budget']}, "
+            f"{context_stats['snippets']} snippets kept, "
+            f"{context_stats['dropped']} dropped, "
+            f"{context_stats['duplicates']} duplicates)"
+        )
+        return messages
+
+    @tracer.traced("node.synthesize_response")
+    def _synthesize_response(self, state: AgentState) -> AgentState:
+        """Synthesize final response from tool results"""
+        try:
+            response = self._invoke(
+                self._synthesis_messages(state), SYNTHESIS_STEP, self._intent(state)
+            )
+            state["final_response"] = response.content
+        except Overloaded:
+            raise
+        except Exception as e:
+            logging.error(f"LLM synthesis failed: {e}")
+            state["final_response"] = (
+                "I encountered an error processing your request. Please try again or rephrase your question."
+            )
+
+        return state
+
+    @tracer.traced("node.synthesize_response")
+    async def _asynthesize_response(self, state: AgentState) -> AgentState:
+        """Async variant of _synthesize_response"""
         try:
-            response = self.llm.invoke(messages)
+            response = await self.models.ainvoke(
+                self._synthesis_messages(state),
+                step=SYNTHESIS_STEP,
+                intent=self._intent(state),
+            )
             state["final_response"] = response.content
+        except Overloaded:
+            raise
         except Exception as e:
             logging.error(f"LLM synthesis failed: {e}")
             state["final_response"] = (
@@ -212,23 +430,113 @@ Please provide a helpful response based on this information.
 
         return state
 
-    def process_query(self, user_query: str, db_session: Session) -> str:
+    @tracer.traced("agent.run")
+    def process_query(
+        self,
+        user_query: str,
+        db_session: Session,
+        conversation: Optional[Conversation] = None,
+    ) -> str:
         """Process a user query and return a response"""
-        initial_state = AgentState(
-            messages=[],
-            user_query=user_query,
-            context={},
-            db_session=db_session,
-            final_response="",
-        )
+        try:
+            final_state = self.graph.invoke(
+                initial_state(user_query, db_session, conversation)
+            )
+            return final_state["final_response"]
+        except Overloaded:
+            raise
+        except Exception as e:
+            logging.error(f"Agent processing failed: {e}")
+            return f"I encountered an error processing your query: {str(e)}. Please try rephrasing your question."
 
+    @tracer.traced("agent.run")
+    async def aprocess_query(
+        self,
+        user_query: str,
+        db_session: Session,
+        conversation: Optional[Conversation] = None,
+    ) -> str:
+        """Process a user query without blocking the event loop"""
         try:
-            final_state = self.graph.invoke(initial_state)
+            final_state = await self.graph.ainvoke(
+                initial_state(user_query, db_session, conversation)
+            )
             return final_state["final_response"]
+        except Overloaded:
+            raise
         except Exception as e:
             logging.error(f"Agent processing failed: {e}")
             return f"I encountered an error processing your query: {str(e)}. Please try rephrasing your question."
 
+    @tracer.traced("agent.stream")
+    async def astream_query(
+        self,
+        user_query: str,
+        db_session: Optional[Session] = None,
+        conversation: Optional[Conversation] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the agent step by step, yielding progress events and answer tokens.
+
+        Events are dicts with an "event" name and a "data" payload:
+        "analysis" once tools are chosen, "tools" once they have run, one
+        "token" per synthesis chunk, then "done" with the full response
+        (or "error" if the pipeline fails). If synthesis fails after some
+        tokens were sent, "done" carries them with "partial": True.
+        """
+        state = initial_state(user_query, db_session, conversation)
+        try:
+            state = await self._aanalyze_query(state)
+            analysis = state["context"]["analysis"]
+            yield {
+                "event": "analysis",
+                "data": {
+                    "intent": analysis.get("intent"),
+                    "tools": analysis.get("tools_needed", []),
+                },
+            }
+
+            state = await self._aexecute_tools(state)
+            yield {
+                "event": "tools",
+                "data": {"completed": list(state["context"]["tool_results"])},
+            }
+
+            chunks = []
+            partial = False
+            try:
+                async for chunk in self.models.astream(
+                    self._synthesis_messages(state),
+                    step=SYNTHESIS_STEP,
+                    intent=self._intent(state),
+                ):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield {"event": "token", "data": {"content": chunk.content}}
+            except Overloaded:
+                raise
+            except Exception as e:
+                logging.error(f"LLM synthesis failed: {e}")
+                if not chunks:
+                    raise
+                # Keep what the client has already been shown, flagged as cut off
+                partial = True
+
+            yield {
+                "event": "done",
+                "data": {"response": "".join(chunks), "partial": partial},
+            }
+
+        except Overloaded as e:
+            yield {"event": "error", "data": e.to_dict()}
+        except Exception as e:
+            logging.error(f"Agent streaming failed: {e}")
+            yield {
+                "event": "error",
+                "data": {
+                    "detail": f"I encountered an error processing your query: {str(e)}. Please try rephrasing your question."
+                },
+            }
+
 
 # Global instance
 laptop_agent = LaptopAgent()
@@ -0,0 +1,138 @@
+# ai_services/src/services/lexical_index.py
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Model numbers and ports stay whole: "i7-1355U", "RJ-45", "USB-C", "3.5mm"
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by does for from has have how i if in is it its "
+    "me my of on or so that the this to was what which with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms without stopwords; compound terms also yield their
+    parts and a joined form, so "RJ-45" matches "RJ45" and "rj 45"."""
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        terms.append(token)
+        parts = re.split(r"[-./]", token)
+        if len(parts) > 1:
+            joined = "".join(parts)
+            terms.append(joined)
+            terms.extend(p for p in parts if p not in _STOPWORDS and p != joined)
+    return terms
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: each id scores sum(1 / (k + rank)) over the lists
+    it appears in (rank from 1). Best first; ties keep first-seen order."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class BM25Index:
+    """In-memory Okapi BM25 index over the documents of one collection.
+
+    Complements the embeddings with exact-term matching on model numbers,
+    ports and brand names. Documents are upserted and deleted by id as the
+    vector collection changes; scores use the current corpus statistics.
+    Thread-safe.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._documents: Dict[str, Tuple[Tuple[str, ...], int, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _remove(self, doc_id: str) -> None:
+        entry = self._documents.pop(doc_id, None)
+        if entry is None:
+            return
+        terms, length, _ = entry
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        metadatas = metadatas or [{}] * len(ids)
+        with self._lock:
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                self._remove(doc_id)
+                frequencies: Dict[str, int] = defaultdict(int)
+                terms = tokenize(document or "")
+                for term in terms:
+                    frequencies[term] += 1
+                for term, count in frequencies.items():
+                    self._postings[term][doc_id] = count
+                self._documents[doc_id] = (
+                    tuple(frequencies),
+                    len(terms),
+                    (metadata or {}).get("laptop_id"),
+                )
+                self._total_length += len(terms)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._total_length = 0
+
+    def search(
+        self, query: str, limit: int, laptop_id: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Top `limit` (id, score) pairs, optionally for one laptop only"""
+        with self._lock:
+            count = len(self._documents)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, frequency in postings.items():
+                    _, length, doc_laptop_id = self._documents[doc_id]
+                    if laptop_id and doc_laptop_id != laptop_id:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[doc_id] += (
+                        idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,270 @@
+# ai_services/src/services/model_router.py
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from backend.src.utils.logger.logging import logger as logging
+from ai_services.src.core.config import settings
+from ai_services.src.core.admission import llm_admission, Overloaded
+from backend.src.app.core.tracing import tracer, annotate
+
+# Pipeline steps; analysis only has to pick tools, so the fast model does it
+ANALYSIS_STEP = "analysis"
+SYNTHESIS_STEP = "synthesis"
+SUMMARY_STEP = "summary"  # conversation compaction
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def token_usage(message: Any) -> Tuple[int, int]:
+    """(input, output) tokens reported on an LLM response, if any"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    if not usage:
+        usage = (getattr(message, "response_metadata", None) or {}).get(
+            "token_usage", {}
+        )
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+class ModelMetrics:
+    """Per-model latency percentiles, failures, hedges and token usage"""
+
+    def __init__(self, window: int = None):
+        self.window = window or settings.MODEL_METRICS_WINDOW
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, name: str) -> Dict[str, Any]:
+        if name not in self._models:
+            self._models[name] = {
+                "latencies": deque(maxlen=self.window),
+                "calls": 0,
+                "errors": 0,
+                "hedges": 0,
+                "failovers": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+            }
+        return self._models[name]
+
+    def record(self, name: str, latency: float, message: Any = None) -> None:
+        input_tokens, output_tokens = token_usage(message)
+        with self._lock:
+            model = self._model(name)
+            model["calls"] += 1
+            model["latencies"].append(latency)
+            model["input_tokens"] += input_tokens
+            model["output_tokens"] += output_tokens
+
+    def count(self, name: str, event: str) -> None:
+        """Count an "errors", "hedges" or "failovers" event for a model"""
+        with self._lock:
+            self._model(name)[event] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": model["calls"],
+                    "errors": model["errors"],
+                    "hedges": model["hedges"],
+                    "failovers": model["failovers"],
+                    "p50": _percentile(model["latencies"], 0.5),
+                    "p95": _percentile(model["latencies"], 0.95),
+                    "input_tokens": model["input_tokens"],
+                    "output_tokens": model["output_tokens"],
+                }
+                for name, model in self._models.items()
+            }
+
+
+def model_name(llm: Any) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "_llm_type", "llm")
+
+
+class ModelRouter:
+    """Chooses between the primary and fast model for each LLM call.
+
+    Analysis and synthesis for simple intents go to the fast model, the
+    rest to the primary. If the chosen model errors the call fails over to
+    the other one, and if it is still running after the latency SLO the
+    other model is started as a hedge; whichever succeeds first wins and
+    the loser is cancelled. Every attempt takes an admission slot, and a
+    hedge is only started when a slot is free right away.
+    """
+
+    def __init__(
+        self,
+        primary,
+        fast=None,
+        primary_name: str = None,
+        fast_name: str = None,
+        admission=None,
+        metrics: ModelMetrics = None,
+        slo_seconds: float = None,
+        hedge: bool = None,
+        fast_intents: Sequence[str] = None,
+    ):
+        self.primary = (primary_name or model_name(primary), primary)
+        self.fast = (fast_name or model_name(fast), fast) if fast is not None else None
+        self.admission = admission or llm_admission
+        self.metrics = metrics or model_metrics
+        self.slo_seconds = slo_seconds or settings.LLM_LATENCY_SLO_SECONDS
+        self.hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.fast_intents = set(
+            settings.FAST_MODEL_INTENTS if fast_intents is None else fast_intents
+        )
+
+    def bind_tools(self, tools: Sequence[Any]) -> "ModelRouter":
+        """Same routing over both models with tools bound"""
+        return ModelRouter(
+            self.primary[1].bind_tools(tools),
+            self.fast[1].bind_tools(tools) if self.fast else None,
+            primary_name=self.primary[0],
+            fast_name=self.fast[0] if self.fast else None,
+            admission=self.admission,
+            metrics=self.metrics,
+            slo_seconds=self.slo_seconds,
+            hedge=self.hedge,
+            fast_intents=self.fast_intents,
+        )
+
+    def candidates(self, step: str, intent: Optional[str] = None) -> List[Tuple]:
+        """(name, model) pairs in the order they should be tried"""
+        if self.fast is None:
+            return [self.primary]
+        if step == ANALYSIS_STEP or intent in self.fast_intents:
+            return [self.fast, self.primary]
+        return [self.primary, self.fast]
+
+    async def _call(self, name: str, llm, messages: List[Any], step: str) -> Any:
+        with tracer.span("llm.call", model=name, step=step):
+            async with self.admission.slot():
+                started = time.perf_counter()
+                try:
+                    response = await llm.ainvoke(messages)
+                except Exception:
+                    self.metrics.count(name, "errors")
+                    raise
+                self.metrics.record(name, time.perf_counter() - started, response)
+            input_tokens, output_tokens = token_usage(response)
+            annotate(input_tokens=input_tokens, output_tokens=output_tokens)
+            return response
+
+    def _call_blocking(self, name: str, llm, messages: List[Any], step: str) -> Any:
+        """_call for worker threads"""
+        with tracer.span("llm.call", model=name, step=step):
+            with self.admission.blocking_slot():
+                started = time.perf_counter()
+                try:
+                    response = llm.invoke(messages)
+                except Exception:
+                    self.metrics.count(name, "errors")
+                    raise
+                self.metrics.record(name, time.perf_counter() - started, response)
+            input_tokens, output_tokens = token_usage(response)
+            annotate(input_tokens=input_tokens, output_tokens=output_tokens)
+            return response
+
+    def invoke(
+        self, messages: List[Any], step: str = SYNTHESIS_STEP, intent: str = None
+    ) -> Any:
+        """Blocking ainvoke for synchronous callers: same routing, admission
+        and failover, but no hedging"""
+        candidates = self.candidates(step, intent)
+        for index, (name, llm) in enumerate(candidates):
+            try:
+                return self._call_blocking(name, llm, messages, step)
+            except Overloaded:
+                raise
+            except Exception as e:
+                if index == len(candidates) - 1:
+                    raise
+                self.metrics.count(name, "failovers")
+                logging.warning(f"{name} failed ({e}), failing over")
+
+    def _can_hedge(self) -> bool:
+        return self.hedge and self.admission.active < self.admission.max_concurrent
+
+    async def ainvoke(
+        self, messages: List[Any], step: str = SYNTHESIS_STEP, intent: str = None
+    ) -> Any:
+        (name, llm), *backups = self.candidates(step, intent)
+        pending = {asyncio.ensure_future(self._call(name, llm, messages, step))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.slo_seconds if backups else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    if isinstance(error, Overloaded) and not pending:
+                        raise error
+
+                if not backups:
+                    continue
+                if done:
+                    self.metrics.count(name, "failovers")
+                    logging.warning(f"{name} failed ({error}), failing over")
+                elif self._can_hedge():
+                    self.metrics.count(name, "hedges")
+                    logging.warning(f"{name} exceeded {self.slo_seconds}s, hedging")
+                else:
+                    continue
+                backup_name, backup = backups.pop(0)
+                pending.add(
+                    asyncio.ensure_future(
+                        self._call(backup_name, backup, messages, step)
+                    )
+                )
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def astream(
+        self, messages: List[Any], step: str = SYNTHESIS_STEP, intent: str = None
+    ) -> AsyncIterator[Any]:
+        """Stream from the chosen model, failing over if it errors before
+        the first chunk. Streams are not hedged: tokens already shown to the
+        client can't be taken back."""
+        candidates = self.candidates(step, intent)
+        for index, (name, llm) in enumerate(candidates):
+            gathered = None
+            try:
+                with tracer.span("llm.stream", model=name, step=step):
+                    async with self.admission.slot():
+                        started = time.perf_counter()
+                        async for chunk in llm.astream(messages):
+                            gathered = chunk if gathered is None else gathered + chunk
+                            yield chunk
+                    elapsed = time.perf_counter() - started
+                    self.metrics.record(name, elapsed, gathered)
+                    input_tokens, output_tokens = token_usage(gathered)
+                    annotate(input_tokens=input_tokens, output_tokens=output_tokens)
+                return
+            except Overloaded:
+                raise
+            except Exception as e:
+                self.metrics.count(name, "errors")
+                if gathered is not None or index == len(candidates) - 1:
+                    raise
+                self.metrics.count(name, "failovers")
+                logging.warning(f"{name} stream failed ({e}), failing over")
+
+
+# Global instance shared by every router
+model_metrics = ModelMetrics()
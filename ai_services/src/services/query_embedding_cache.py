@@ -0,0 +1,83 @@
+# ai_services/src/services/query_embedding_cache.py
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.tracing import annotate
+from backend.src.app.services.embedding_cache import normalize_text
+
+
+class QueryEmbeddingCache:
+    """Per-process LRU of query embeddings keyed by normalized text.
+
+    Shared by every collection search, the query router and the semantic
+    cache, so one query is embedded once however many of them look at it.
+    Threads asking for a query that is being embedded wait for that result
+    instead of embedding it again. Cached vectors are read-only.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or AIConfig.QUERY_EMBEDDING_CACHE_SIZE
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_embed(self, text: str, embed: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Cached vector for `text`, calling `embed(normalized_text)` on a miss"""
+        key = normalize_text(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            future = self._inflight.get(key)
+            leader = vector is None and future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        annotate(query_embedding_cache_hit=not leader)
+        if vector is not None:
+            return vector
+        if not leader:
+            return future.result()
+
+        try:
+            vector = np.array(embed(key), dtype=np.float32)
+            vector.flags.writeable = False
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = vector
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(vector)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+# Global instance
+query_embedding_cache = QueryEmbeddingCache()
@@ -0,0 +1,414 @@
+# ai_services/src/services/query_router.py
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.core.cache import cache, make_key
+from backend.src.app.config.cache_config import CacheConfig
+from backend.src.app.models.laptop import Laptop
+from ai_services.src.core.config import settings
+from ai_services.src.core.database import SessionLocal
+from ai_services.src.services.vector_service import vector_service
+
+_AMOUNT = r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*(k\b)?"
+# Numbers followed by these are specs ("16GB", "14 inch"), never prices
+_NOT_PRICE = r"(?!\s*(?:gb|tb|mb|ghz|hz|inch|in\b|\"|hours?|hrs?|lbs?|kg|mm|w\b|%))"
+
+_RANGE_PATTERN = re.compile(
+    rf"(?:between\s+)?{_AMOUNT}{_NOT_PRICE}\s*(?:-|to|and)\s*{_AMOUNT}{_NOT_PRICE}"
+)
+_MAX_PATTERN = re.compile(
+    r"(?:under|below|less than|up to|max(?:imum)?(?: of)?|no more than|within|"
+    rf"cheaper than|at most|budget (?:of|is)|i have)\s*{_AMOUNT}{_NOT_PRICE}"
+)
+_MIN_PATTERN = re.compile(
+    rf"(?:over|above|more than|at least|starting at|from)\s*{_AMOUNT}{_NOT_PRICE}"
+)
+_AROUND_PATTERN = re.compile(
+    rf"(?:around|about|approximately|roughly|near)\s*{_AMOUNT}{_NOT_PRICE}"
+)
+_PRICE_WORDS = re.compile(r"\$|\b(?:price[ds]?|budget|cost|dollars?|usd|cheap|afford)")
+
+_LAPTOP_ID_PATTERN = re.compile(r"\b(?:laptop\s*)?id\s*(?:#|:|=|is)?\s*(\d+)\b")
+
+_SPEC_PATTERNS = [
+    ("Processor", re.compile(r"\b(?:core\s*)?(i[3579])\b"), lambda m: m.group(1)),
+    (
+        "Processor",
+        re.compile(r"\bryzen\s*([3579])\b"),
+        lambda m: f"Ryzen {m.group(1)}",
+    ),
+    (
+        "Processor",
+        re.compile(r"\bcore\s*ultra\s*([579])\b"),
+        lambda m: f"Ultra {m.group(1)}",
+    ),
+    (
+        "Memory",
+        re.compile(r"\b(\d+)\s*gb\s*(?:of\s*)?(?:ram|memory|ddr\d?)\b"),
+        lambda m: f"{m.group(1)}GB",
+    ),
+    (
+        "Storage",
+        re.compile(r"\b(\d+)\s*(gb|tb)\s*(?:of\s*)?(?:ssd|storage|nvme|hdd|drive)\b"),
+        lambda m: f"{m.group(1)}{m.group(2).upper()}",
+    ),
+    (
+        "Graphics",
+        re.compile(r"\b(rtx|gtx)\s*(\d{4})\b"),
+        lambda m: f"{m.group(1).upper()} {m.group(2)}",
+    ),
+]
+
+_REVIEW_CUES = re.compile(
+    r"\b(?:reviews?|reviewers?|users? (?:say|think)|people (?:say|think)|"
+    r"experiences?|opinions?|complain(?:ts?)?|ratings?|rated|satisf\w*|"
+    r"worth it|reliab\w*)\b"
+)
+_QA_CUES = re.compile(
+    r"\b(?:how (?:do|can|to)|can i|is it possible|does it support|"
+    r"compatible|upgrad\w*|install\w*|replace\w*)\b"
+)
+# Follow-ups pointing back at the laptop discussed in the previous turn
+_REFERENT_CUES = re.compile(
+    r"\b(?:it|its|it's|this (?:one|laptop|model)|that (?:one|laptop|model)|"
+    r"the same (?:one|laptop|model))\b"
+)
+# Comparisons and multi-part requests need the LLM's planning
+_COMPLEX_CUES = re.compile(r"\b(?:compare|comparison|vs\.?|versus|difference|better)\b")
+
+# Short example queries per intent for the embedding classifier
+INTENT_PROTOTYPES = {
+    "experience_question": [
+        "what do users say about the battery life",
+        "is the keyboard comfortable according to owners",
+        "how is the build quality in practice",
+        "does it overheat during daily use",
+        "how loud are the fans",
+        "is the screen bright enough outdoors",
+    ],
+    "technical_question": [
+        "how do I upgrade the memory",
+        "can the SSD be replaced",
+        "does it have a thunderbolt port",
+        "which wifi standard does it support",
+        "can it drive two external monitors",
+        "does it charge over usb-c",
+    ],
+    "laptop_details": [
+        "tell me about this laptop",
+        "give me the full specifications",
+        "what are the specs and price",
+    ],
+    "budget_search": [
+        "what can I get for my budget",
+        "show me cheap laptops",
+        "affordable options",
+    ],
+    "spec_search": [
+        "laptops with a fast processor and lots of ram",
+        "which laptops have dedicated graphics",
+        "models with a large ssd",
+    ],
+}
+
+# Intents the classifier may route on its own: they only need the query text
+_EMBEDDING_ROUTES = {
+    "experience_question": "search_reviews",
+    "technical_question": "search_qa",
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def _amount(number: str, thousands: Optional[str]) -> float:
+    value = float(number.replace(",", ""))
+    return value * 1000 if thousands else value
+
+
+def extract_price_range(query: str) -> Optional[Tuple[float, float]]:
+    """Pull a (min_price, max_price) budget out of a query, if it has one"""
+    text = query.lower()
+    if not _PRICE_WORDS.search(text) and not re.search(
+        r"\b(?:under|below|over|above|between)\b", text
+    ):
+        return None
+
+    match = _RANGE_PATTERN.search(text)
+    if match and ("$" in match.group(0) or _PRICE_WORDS.search(text)):
+        low = _amount(match.group(1), match.group(2))
+        high = _amount(match.group(3), match.group(4))
+        return (min(low, high), max(low, high))
+
+    low, high = 0.0, None
+    match = _AROUND_PATTERN.search(text)
+    if match:
+        value = _amount(match.group(1), match.group(2))
+        return (round(value * 0.85), round(value * 1.15))
+    match = _MAX_PATTERN.search(text)
+    if match:
+        high = _amount(match.group(1), match.group(2))
+    match = _MIN_PATTERN.search(text)
+    if match:
+        low = _amount(match.group(1), match.group(2))
+
+    if high is None and low == 0:
+        return None
+    # Same default ceiling BudgetSearchTool uses
+    return (low, high if high is not None else 10000.0)
+
+
+def extract_spec_filters(query: str) -> Dict[str, str]:
+    """Map recognizable spec mentions to search_laptops_by_specs filters"""
+    text = query.lower()
+    filters = {}
+    for category, pattern, value in _SPEC_PATTERNS:
+        match = pattern.search(text)
+        if match and category not in filters:
+            filters[category] = value(match)
+    return filters
+
+
+def load_laptop_catalog() -> List[Dict[str, Any]]:
+    """Names of every laptop in inventory, cached until laptops change"""
+
+    def load():
+        db = SessionLocal()
+        try:
+            return [
+                {
+                    "id": laptop.id,
+                    "brand": laptop.brand,
+                    "model_name": laptop.model_name,
+                    "variant": laptop.variant,
+                    "full_model_name": laptop.full_model_name,
+                }
+                for laptop in db.query(Laptop).all()
+            ]
+        finally:
+            db.close()
+
+    return cache.get_or_set(
+        make_key("laptop_catalog"),
+        load,
+        ttl=CacheConfig.LAPTOPS_TTL,
+        tags=["laptops"],
+    )
+
+
+class QueryRouter:
+    """Chooses agent tools locally for queries whose intent is obvious.
+
+    Regex rules handle laptop ids and names, budgets and common spec
+    mentions; a nearest-prototype embedding classifier handles review and
+    Q&A questions. `route` returns an analysis dict shaped like the LLM's,
+    or None when confidence is low and the LLM should decide.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        catalog_loader: Callable[[], List[Dict[str, Any]]] = None,
+        min_similarity: float = None,
+        min_margin: float = None,
+    ):
+        self.embed_fn = embed_fn
+        self.catalog_loader = catalog_loader or load_laptop_catalog
+        self.min_similarity = min_similarity or settings.QUERY_ROUTER_MIN_SIMILARITY
+        self.min_margin = min_margin or settings.QUERY_ROUTER_MIN_MARGIN
+        self._prototypes: Optional[Tuple[List[str], np.ndarray]] = None
+        self._lock = threading.Lock()
+        self.routed = {"rules": 0, "embedding": 0}
+        self.fallbacks = 0
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _prototype_matrix(self) -> Tuple[List[str], np.ndarray]:
+        with self._lock:
+            if self._prototypes is None:
+                labels, vectors = [], []
+                for intent, examples in INTENT_PROTOTYPES.items():
+                    for example in examples:
+                        labels.append(intent)
+                        vectors.append(self._embed(example))
+                self._prototypes = (labels, np.vstack(vectors))
+            return self._prototypes
+
+    def classify(self, query: str) -> Tuple[Optional[str], float]:
+        """Nearest-prototype intent and its similarity, if clearly ahead"""
+        if self.embed_fn is None:
+            return None, 0.0
+        try:
+            labels, matrix = self._prototype_matrix()
+            similarities = matrix @ self._embed(query)
+        except Exception as e:
+            logging.warning(f"Router embedding failed: {e}")
+            return None, 0.0
+
+        best = {}
+        for label, similarity in zip(labels, similarities):
+            best[label] = max(best.get(label, -1.0), float(similarity))
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        (intent, top), runner_up = ranked[0], ranked[1][1] if len(ranked) > 1 else -1
+        if top < self.min_similarity or top - runner_up < self.min_margin:
+            return None, top
+        return intent, top
+
+    def resolve_laptop_ids(self, query: str) -> List[int]:
+        """Ids of the laptops named in the query (several if ambiguous)"""
+        try:
+            catalog = self.catalog_loader() or []
+        except Exception as e:
+            logging.warning(f"Router could not load laptop catalog: {e}")
+            return []
+
+        text = f" {_normalize(query)} "
+        by_model: Dict[str, List[Dict[str, Any]]] = {}
+        for laptop in catalog:
+            model = laptop["model_name"] or ""
+            tokens = model.split()
+            aliases = {
+                laptop["full_model_name"],
+                f"{laptop['brand']} {model}",
+                model,
+                f"{model} {laptop['variant'] or ''}",
+            }
+            # Leading words of the model name, e.g. "ThinkPad E14"
+            aliases.update(
+                " ".join(tokens[:n])
+                for n in range(2, len(tokens))
+                if any(ch.isdigit() for ch in tokens[n - 1])
+            )
+            if any(
+                alias and f" {_normalize(alias)} " in text
+                for alias in aliases
+                if _normalize(alias or "")
+            ):
+                by_model.setdefault(_normalize(model), []).append(laptop)
+
+        laptop_ids = []
+        for laptops in by_model.values():
+            if len(laptops) > 1:
+                # Shared model name, e.g. Intel and AMD variants
+                named = [
+                    laptop
+                    for laptop in laptops
+                    if laptop["variant"]
+                    and f" {_normalize(laptop['variant'])} " in text
+                ]
+                laptops = named if len(named) == 1 else laptops
+            laptop_ids.extend(laptop["id"] for laptop in laptops)
+        return laptop_ids
+
+    def _analysis(
+        self, intent: str, tool_params: Dict[str, Dict[str, Any]], routed_by: str
+    ) -> Dict[str, Any]:
+        self.routed[routed_by] += 1
+        return {
+            "tools_needed": list(tool_params),
+            "tool_params": tool_params,
+            "intent": intent,
+            "routed_by": routed_by,
+        }
+
+    def route(
+        self, query: str, default_laptop_ids: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return an LLM-style analysis for confident queries, else None.
+
+        `default_laptop_ids` are the laptops in focus from earlier turns of
+        the conversation, used when the query says "it" or "this one".
+        """
+        text = query.lower()
+        if _COMPLEX_CUES.search(text):
+            self.fallbacks += 1
+            return None
+
+        review_cue = bool(_REVIEW_CUES.search(text))
+        qa_cue = bool(_QA_CUES.search(text))
+
+        id_match = _LAPTOP_ID_PATTERN.search(text)
+        laptop_ids = (
+            [int(id_match.group(1))] if id_match else self.resolve_laptop_ids(query)
+        )
+        if not laptop_ids and default_laptop_ids and _REFERENT_CUES.search(text):
+            laptop_ids = list(default_laptop_ids)
+        if len(laptop_ids) > 1:
+            self.fallbacks += 1
+            return None
+
+        if laptop_ids:
+            laptop_id = laptop_ids[0]
+            search = {"query": query, "laptop_id": laptop_id, "limit": 5}
+            if review_cue and not qa_cue:
+                return self._analysis(
+                    "experience_question", {"search_reviews": search}, "rules"
+                )
+            if qa_cue and not review_cue:
+                return self._analysis(
+                    "technical_question", {"search_qa": search}, "rules"
+                )
+            if review_cue or qa_cue:
+                self.fallbacks += 1
+                return None
+            intent, _ = self.classify(query)
+            if intent in _EMBEDDING_ROUTES:
+                return self._analysis(
+                    intent, {_EMBEDDING_ROUTES[intent]: search}, "embedding"
+                )
+            return self._analysis(
+                "laptop_details",
+                {"get_laptop_summary": {"laptop_id": laptop_id}},
+                "rules",
+            )
+
+        price_range = extract_price_range(query)
+        spec_filters = extract_spec_filters(query)
+        if price_range or spec_filters:
+            if review_cue or qa_cue:
+                self.fallbacks += 1
+                return None
+            tool_params = {}
+            if price_range:
+                tool_params["search_laptops_by_budget"] = {
+                    "min_price": price_range[0],
+                    "max_price": price_range[1],
+                }
+            if spec_filters:
+                tool_params["search_laptops_by_specs"] = {"spec_filters": spec_filters}
+            intent = "budget_search" if price_range else "spec_search"
+            return self._analysis(intent, tool_params, "rules")
+
+        search = {"query": query, "limit": 5}
+        if review_cue != qa_cue:
+            intent = "experience_question" if review_cue else "technical_question"
+            return self._analysis(intent, {_EMBEDDING_ROUTES[intent]: search}, "rules")
+
+        intent, _ = self.classify(query)
+        if intent in _EMBEDDING_ROUTES:
+            return self._analysis(
+                intent, {_EMBEDDING_ROUTES[intent]: search}, "embedding"
+            )
+
+        self.fallbacks += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        routed = sum(self.routed.values())
+        total = routed + self.fallbacks
+        return {
+            "routed": dict(self.routed),
+            "llm_fallbacks": self.fallbacks,
+            "hit_rate": (routed / total) if total else 0.0,
+        }
+
+
+# Global instance
+query_router = QueryRouter(embed_fn=vector_service.embed_query)
@@ -0,0 +1,157 @@
+# ai_services/src/services/semantic_cache.py
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.core.cache import cache
+from ai_services.src.core.config import settings
+from ai_services.src.services.vector_service import vector_service
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _numbers(text: str) -> frozenset:
+    """Numbers in a query (prices, ids); paraphrases must agree on them"""
+    return frozenset(n.replace(",", "") for n in _NUMBER_PATTERN.findall(text))
+
+
+@dataclass
+class _Entry:
+    message: str
+    response: str
+    numbers: frozenset
+    data_version: str
+    expires_at: float
+
+
+class SemanticCache:
+    """Answers paraphrased queries from earlier responses.
+
+    Messages are embedded with the shared FastEmbed model and matched by
+    cosine similarity within a namespace (one per endpoint). Entries are
+    stamped with the shared data version, so any scraper write makes them
+    stale, and a hit also requires both queries to mention the same numbers
+    so "under $800" never answers "under $900".
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Sequence[float]],
+        threshold: float = None,
+        max_entries: int = None,
+        ttl: float = None,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold or settings.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.SEMANTIC_CACHE_TTL_SECONDS
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._entries: Dict[str, List[_Entry]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.guarded = 0  # similar enough, but blocked by the number guard
+
+    def _embed(self, message: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(message), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(
+        self, namespace: str, message: str
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """Return (cached response or None, message embedding for store())"""
+        try:
+            vector = self._embed(message)
+        except Exception as e:
+            logging.warning(f"Semantic cache embedding failed: {e}")
+            return None, None
+
+        numbers = _numbers(message)
+        version = cache.data_version()
+        now = time.time()
+
+        with self._lock:
+            vectors = self._vectors.get(namespace)
+            if vectors is not None:
+                similarities = vectors @ vector
+                for index in np.argsort(-similarities):
+                    if similarities[index] < self.threshold:
+                        break
+                    entry = self._entries[namespace][index]
+                    if entry.data_version != version or entry.expires_at < now:
+                        continue
+                    if entry.numbers != numbers:
+                        self.guarded += 1
+                        continue
+                    self.hits += 1
+                    logging.info(
+                        f"Semantic cache hit ({similarities[index]:.3f}): "
+                        f"'{message}' ~ '{entry.message}'"
+                    )
+                    return entry.response, vector
+            self.misses += 1
+
+        return None, vector
+
+    def store(
+        self,
+        namespace: str,
+        message: str,
+        response: str,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        try:
+            vector = vector if vector is not None else self._embed(message)
+        except Exception as e:
+            logging.warning(f"Semantic cache embedding failed: {e}")
+            return
+
+        version = cache.data_version()
+        entry = _Entry(
+            message=message,
+            response=response,
+            numbers=_numbers(message),
+            data_version=version,
+            expires_at=time.time() + self.ttl,
+        )
+
+        with self._lock:
+            entries = self._entries.get(namespace, [])
+            vectors = self._vectors.get(namespace)
+
+            # Drop stale entries, then the oldest ones beyond the size bound
+            keep = [
+                i
+                for i, e in enumerate(entries)
+                if e.data_version == version and e.expires_at > time.time()
+            ]
+            keep = keep[max(0, len(keep) - self.max_entries + 1) :]
+            entries = [entries[i] for i in keep] + [entry]
+            rows = [vectors[keep]] if vectors is not None and keep else []
+            self._vectors[namespace] = np.vstack(rows + [vector[np.newaxis, :]])
+            self._entries[namespace] = entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "guarded": self.guarded,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": {ns: len(entries) for ns, entries in self._entries.items()},
+            "threshold": self.threshold,
+        }
+
+
+# Global instance
+semantic_cache = SemanticCache(embed_fn=vector_service.embed_query)
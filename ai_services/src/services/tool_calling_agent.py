@@ -0,0 +1,334 @@
+# ai_services/src/services/tool_calling_agent.py
+from typing import Any, AsyncIterator, Dict, List, Optional
+from concurrent.futures import wait
+import asyncio
+import uuid
+
+from langchain.schema import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, ToolMessage
+from sqlalchemy.orm import Session
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.tracing import tracer
+from ai_services.src.core.config import settings
+from ai_services.src.core.executors import run_blocking, embedding_executor
+from ai_services.src.core.admission import Overloaded
+from ai_services.src.services.model_router import ModelRouter
+from ai_services.src.services.agent_toolkit import (
+    AgentState,
+    AgentToolkit,
+    conversation_text,
+    initial_state,
+)
+from ai_services.src.services.langgraph_agent import (
+    ERROR_RESPONSE_PREFIX,
+    _chat_model,
+)
+from ai_services.src.services.conversation_store import Conversation
+
+SYSTEM_PROMPT = """You are a helpful laptop recommendation assistant for our store. Use the provided tools to look up laptops, prices, specifications, reviews and Q&A, then answer the user's question.
+
+Tool usage:
+- Call every tool you need in a single turn; they run in parallel
+- Answer directly without tools for greetings or questions that need no inventory data
+- Use get_laptop_summary with the laptop IDs returned by the search tools
+
+INVENTORY CONSTRAINT:
+- NEVER recommend laptops outside our inventory
+- If tools return no results, say "We don't currently have laptops matching those requirements in our inventory"
+- Never mention MSI, Acer, Dell, or other brands not in our inventory
+- Never suggest external retailers or competitors
+
+Guidelines:
+- Be specific and cite information from the tools
+- Include relevant laptop models, prices, and specifications when available
+- Mention user reviews and ratings when relevant
+- Provide clear recommendations with reasoning
+- If tool results show errors, acknowledge limitations but still try to be helpful
+- Keep the response conversational, professional and clearly formatted
+"""
+
+
+class ToolCallingAgent:
+    """Agent that lets the model call tools natively instead of planning in JSON.
+
+    The model sees the `get_laptop_tools()` schemas and requests tools
+    itself, so a query needing no data is answered in one LLM call and a
+    typical one in two. When the local router is confident, its tools are
+    run up front and the model only writes the answer. Uses the same
+    AgentToolkit (sessions, executors, timeouts) as the graph agent so the
+    two modes can be compared like for like.
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        session_factory=None,
+        router=None,
+        max_rounds=None,
+        admission=None,
+    ):
+        self.llm = llm or _chat_model(AIConfig.DEFAULT_MODEL)
+        fast_llm = None
+        if llm is None and settings.MODEL_ROUTING_ENABLED:
+            fast_llm = _chat_model(AIConfig.FALLBACK_MODEL)
+        self.models = ModelRouter(self.llm, fast_llm, admission=admission)
+        self.toolkit = AgentToolkit(session_factory=session_factory, router=router)
+        self.models_with_tools = self.models.bind_tools(self.toolkit.tools)
+        self.max_rounds = max_rounds or settings.TOOL_CALLING_MAX_ROUNDS
+
+    def _initial_messages(self, state: AgentState) -> List[Any]:
+        messages = [SystemMessage(content=SYSTEM_PROMPT)]
+        history = conversation_text(state)
+        if history:
+            messages.append(SystemMessage(content=history))
+        messages.append(HumanMessage(content=state["user_query"]))
+        return messages
+
+    def _routed_tool_calls(self, state: AgentState) -> List[Dict[str, Any]]:
+        """Tool calls chosen by the local router, if it is confident"""
+        analysis = self.toolkit.route(state)
+        if analysis is None:
+            return []
+        return [
+            {
+                "name": name,
+                "args": analysis["tool_params"].get(name, {}),
+                "id": f"routed_{uuid.uuid4().hex[:8]}",
+            }
+            for name in analysis["tools_needed"]
+            if name in self.toolkit.tool_map
+        ]
+
+    def _call_tool(self, tool_call: Dict[str, Any]) -> str:
+        tool = self.toolkit.tool_map.get(tool_call["name"])
+        if tool is None:
+            return f"Unknown tool: {tool_call['name']}"
+        return self.toolkit.run(tool_call["name"], tool, dict(tool_call["args"]))
+
+    @staticmethod
+    def _reuse_call_results(state: AgentState, tool_calls: List[Dict[str, Any]]):
+        """Split calls into outputs reused from earlier turns and calls to run"""
+        conversation = state["context"].get("conversation")
+        contents, pending = {}, []
+        for call in tool_calls:
+            reused = (
+                conversation.tool_result(call["name"], call["args"])
+                if conversation
+                else None
+            )
+            if reused is not None:
+                contents[call["id"]] = reused
+            else:
+                pending.append(call)
+        return contents, pending
+
+    @staticmethod
+    def _tool_messages(
+        state: AgentState,
+        tool_calls: List[Dict[str, Any]],
+        pending: List[Dict[str, Any]],
+        contents: Dict[str, str],
+    ) -> List[ToolMessage]:
+        conversation = state["context"].get("conversation")
+        if conversation is not None:
+            for call in pending:
+                conversation.remember_tool_result(
+                    call["name"], call["args"], contents[call["id"]]
+                )
+        return [
+            ToolMessage(content=contents[call["id"]], tool_call_id=call["id"])
+            for call in tool_calls
+        ]
+
+    def _run_tool_calls(
+        self, state: AgentState, tool_calls: List[Dict[str, Any]]
+    ) -> List[ToolMessage]:
+        """Run the requested tools concurrently, keeping partial results"""
+        contents, pending = self._reuse_call_results(state, tool_calls)
+        futures = {}
+        for call in pending:
+            future = self.toolkit.submit(call["name"], self._call_tool, call)
+            if future is None:
+                contents[call["id"]] = self.toolkit.busy_message(call["name"])
+            else:
+                futures[call["id"]] = (call, future)
+        done = set()
+        if futures:
+            done, _ = wait(
+                [future for _, future in futures.values()],
+                timeout=settings.TOOL_TIMEOUT_SECONDS,
+            )
+
+        for call, future in futures.values():
+            if future in done:
+                contents[call["id"]] = future.result()
+            else:
+                contents[call["id"]] = self.toolkit.abandon(call["name"], future)
+        return self._tool_messages(state, tool_calls, pending, contents)
+
+    async def _arun_tool_calls(
+        self, state: AgentState, tool_calls: List[Dict[str, Any]]
+    ) -> List[ToolMessage]:
+        """Async variant of _run_tool_calls"""
+        contents, pending = self._reuse_call_results(state, tool_calls)
+        results = await asyncio.gather(
+            *(
+                self.toolkit.await_call(call["name"], self._call_tool, call)
+                for call in pending
+            )
+        )
+        contents.update({call["id"]: result for call, result in zip(pending, results)})
+        return self._tool_messages(state, tool_calls, pending, contents)
+
+    def _models_for_round(self, round_number: int) -> ModelRouter:
+        # The last round must produce an answer, so tools are withheld
+        return self.models_with_tools if round_number < self.max_rounds else self.models
+
+    @tracer.traced("agent.run")
+    def process_query(
+        self,
+        user_query: str,
+        db_session: Session,
+        conversation: Optional[Conversation] = None,
+    ) -> str:
+        """Process a user query with native tool calling"""
+        state = initial_state(user_query, db_session, conversation)
+        try:
+            messages = self._initial_messages(state)
+            routed = self._routed_tool_calls(state)
+            if routed:
+                messages.append(AIMessage(content="", tool_calls=routed))
+                messages.extend(self._run_tool_calls(state, routed))
+
+            for round_number in range(self.max_rounds + 1):
+                response = self._models_for_round(round_number).invoke(messages)
+                if not response.tool_calls:
+                    logging.info(
+                        f"Tool-calling agent answered in {round_number + 1} LLM call(s)"
+                    )
+                    return response.content
+                messages.append(response)
+                messages.extend(self._run_tool_calls(state, response.tool_calls))
+            raise RuntimeError(f"no answer after {self.max_rounds} tool rounds")
+
+        except Overloaded:
+            raise
+        except Exception as e:
+            logging.error(f"Tool-calling agent failed: {e}")
+            return f"{ERROR_RESPONSE_PREFIX} processing your query: {str(e)}. Please try rephrasing your question."
+
+    @tracer.traced("agent.run")
+    async def aprocess_query(
+        self,
+        user_query: str,
+        db_session: Session,
+        conversation: Optional[Conversation] = None,
+    ) -> str:
+        """Process a user query with native tool calling, without blocking"""
+        state = initial_state(user_query, db_session, conversation)
+        try:
+            messages = self._initial_messages(state)
+            routed = await run_blocking(
+                embedding_executor, self._routed_tool_calls, state
+            )
+            if routed:
+                messages.append(AIMessage(content="", tool_calls=routed))
+                messages.extend(await self._arun_tool_calls(state, routed))
+
+            for round_number in range(self.max_rounds + 1):
+                response = await self._models_for_round(round_number).ainvoke(messages)
+                if not response.tool_calls:
+                    logging.info(
+                        f"Tool-calling agent answered in {round_number + 1} LLM call(s)"
+                    )
+                    return response.content
+                messages.append(response)
+                messages.extend(await self._arun_tool_calls(state, response.tool_calls))
+            raise RuntimeError(f"no answer after {self.max_rounds} tool rounds")
+
+        except Overloaded:
+            raise
+        except Exception as e:
+            logging.error(f"Tool-calling agent failed: {e}")
+            return f"{ERROR_RESPONSE_PREFIX} processing your query: {str(e)}. Please try rephrasing your question."
+
+    @tracer.traced("agent.stream")
+    async def astream_query(
+        self,
+        user_query: str,
+        db_session: Optional[Session] = None,
+        conversation: Optional[Conversation] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the same events as the graph agent, one LLM round at a time"""
+        state = initial_state(user_query, db_session, conversation)
+        try:
+            messages = self._initial_messages(state)
+            routed = await run_blocking(
+                embedding_executor, self._routed_tool_calls, state
+            )
+            if routed:
+                yield {
+                    "event": "analysis",
+                    "data": {
+                        "intent": "routed",
+                        "tools": [call["name"] for call in routed],
+                    },
+                }
+                messages.append(AIMessage(content="", tool_calls=routed))
+                messages.extend(await self._arun_tool_calls(state, routed))
+                yield {
+                    "event": "tools",
+                    "data": {"completed": [call["name"] for call in routed]},
+                }
+
+            # Text the model writes alongside tool calls is shown too, so
+            # the response is everything streamed, not just the last round
+            chunks = []
+            for round_number in range(self.max_rounds + 1):
+                gathered = None
+                async for chunk in self._models_for_round(round_number).astream(
+                    messages
+                ):
+                    gathered = chunk if gathered is None else gathered + chunk
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield {"event": "token", "data": {"content": chunk.content}}
+
+                if gathered is None or not gathered.tool_calls:
+                    logging.info(
+                        f"Tool-calling agent answered in {round_number + 1} LLM call(s)"
+                    )
+                    break
+
+                tool_names = [call["name"] for call in gathered.tool_calls]
+                yield {
+                    "event": "analysis",
+                    "data": {"intent": "tool_calling", "tools": tool_names},
+                }
+                messages.append(gathered)
+                messages.extend(await self._arun_tool_calls(state, gathered.tool_calls))
+                yield {"event": "tools", "data": {"completed": tool_names}}
+            else:
+                raise RuntimeError(f"no answer after {self.max_rounds} tool rounds")
+
+            yield {
+                "event": "done",
+                "data": {"response": "".join(chunks), "partial": False},
+            }
+
+        except Overloaded as e:
+            yield {"event": "error", "data": e.to_dict()}
+        except Exception as e:
+            logging.error(f"Tool-calling agent streaming failed: {e}")
+            yield {
+                "event": "error",
+                "data": {
+                    "detail": f"{ERROR_RESPONSE_PREFIX} processing your query: {str(e)}. Please try rephrasing your question."
+                },
+            }
+
+
+# Global instance
+tool_calling_agent = ToolCallingAgent()
@@ -1,26 +1,51 @@
+import contextvars
+import fcntl
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from fastembed import TextEmbedding
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, contains_eager
 from backend.src.utils.logger.logging import logger as logging
 
 from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.config.cache_config import CacheConfig
+from backend.src.app.core.cache import cache, make_key
+from backend.src.app.core.tracing import tracer
 from backend.src.app.models.laptop import Laptop
 from backend.src.app.models.specification import Specification
 from backend.src.app.models.price_snapshot import PriceSnapshot
 from backend.src.app.models.review import Review
 from backend.src.app.models.questions_answer import QuestionsAnswer
+from backend.src.app.models.vector_index_state import VectorIndexState
+from ai_services.src.services.embedding_pool import embedding_pool
+from ai_services.src.services.query_embedding_cache import query_embedding_cache
+from ai_services.src.services.lexical_index import BM25Index, reciprocal_rank_fusion
+from backend.src.app.services.embedding_cache import embedding_cache, normalize_text
+
+
+def _row_id(vector_id: str) -> int:
+    """SQL row id of a vector id, e.g. 12 for review_12"""
+    return int(vector_id.rsplit("_", 1)[1])
 
 
 class VectorService:
-    def __init__(self):
+    def __init__(self, persist_directory=None):
         # Ensure directories exist
         AIConfig.ensure_directories()
 
         # Initialize ChromaDB client
+        self.persist_directory = Path(
+            persist_directory or AIConfig.CHROMA_PERSIST_DIRECTORY
+        )
         self.chroma_client = chromadb.PersistentClient(
-            path=AIConfig.CHROMA_PERSIST_DIRECTORY,
+            path=str(self.persist_directory),
             settings=Settings(anonymized_telemetry=False),
         )
 
@@ -33,8 +58,45 @@ class VectorService:
         )
         self.qa_collection = self._get_or_create_collection(AIConfig.QA_COLLECTION)
 
+        # Incremental sync state; index writes go through _write_lock()
+        self._sync_lock = threading.Lock()
+        self.last_sync: Dict[str, Dict[str, Any]] = {}
+        self.sync_progress: Dict[str, Dict[str, Any]] = {}
+
+        # Set once the index has been synced or if it already holds
+        # documents; until then the search tools fall back to SQL keywords
+        self._ready = threading.Event()
+        if self.has_documents():
+            self._ready.set()
+
+        # BM25 indexes for hybrid search, loaded per collection on first use
+        self._lexical: Dict[str, BM25Index] = {}
+        self._lexical_lock = threading.Lock()
+
+        # Fans search_all out across collections
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="vector-search"
+        )
+
         logging.info("VectorService initialized successfully")
 
+    @contextmanager
+    def _write_lock(self):
+        """Serialize index writers across threads and processes.
+
+        The startup bootstrap, the periodic sync, the change listener and
+        the indexing script may all write the same persist directory; an
+        exclusive flock on a file inside it makes them take turns. Not
+        re-entrant.
+        """
+        with self._sync_lock:
+            with open(self.persist_directory / "write.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
     def _get_or_create_collection(self, collection_name: str):
         """Get existing collection or create new one"""
         try:
@@ -44,214 +106,755 @@ class VectorService:
                 name=collection_name, metadata={"hnsw:space": "cosine"}
             )
 
-    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings using FastEmbed"""
+    def _embed_texts(self, texts: List[str], bulk: bool) -> np.ndarray:
+        """Run the model; `bulk` batches go to the multi-process embedding
+        pool when one is configured"""
+        if bulk and embedding_pool.enabled:
+            try:
+                return embedding_pool.embed(texts)
+            except Exception as e:
+                logging.error(f"Embedding pool failed, embedding in-process: {e}")
+        # Fill a preallocated matrix rather than stacking a list of vectors
+        vectors = np.empty((len(texts), AIConfig.EMBEDDING_DIMENSION), dtype=np.float32)
+        for row, vector in enumerate(
+            self.embedding_model.embed(texts, batch_size=AIConfig.EMBEDDING_BATCH_SIZE)
+        ):
+            vectors[row] = vector
+        return vectors
+
+    def _generate_embeddings(self, texts: List[str], bulk: bool = False) -> np.ndarray:
+        """Generate embeddings using FastEmbed as a contiguous (len(texts), dim)
+        float32 array, reusing cached vectors for text embedded before and
+        embedding repeated text only once. Empty (0, dim) on failure."""
         try:
-            embeddings = list(self.embedding_model.embed(texts))
-            return [embedding.tolist() for embedding in embeddings]
+            texts = [normalize_text(text) for text in texts]
+            cached = [None] * len(texts)
+            if embedding_cache is not None:
+                try:
+                    cached = embedding_cache.get_many(texts)
+                except Exception as e:
+                    logging.warning(f"Embedding cache lookup failed: {e}")
+
+            missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+            if len(missing) == len(texts):
+                # Nothing cached and no repeats: use the model output as is
+                embeddings = self._embed_texts(missing, bulk)
+                computed = embeddings
+            else:
+                embeddings = np.empty(
+                    (len(texts), AIConfig.EMBEDDING_DIMENSION), dtype=np.float32
+                )
+                computed = self._embed_texts(missing, bulk) if missing else None
+                rows = {text: row for row, text in enumerate(missing)}
+                for row, (text, vector) in enumerate(zip(texts, cached)):
+                    embeddings[row] = computed[rows[text]] if vector is None else vector
+            if missing and embedding_cache is not None:
+                try:
+                    embedding_cache.set_many(missing, computed)
+                except Exception as e:
+                    logging.warning(f"Embedding cache update failed: {e}")
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
         except Exception as e:
             logging.error(f"Error generating embeddings: {e}")
-            return []
+            return np.empty((0, AIConfig.EMBEDDING_DIMENSION), dtype=np.float32)
+
+    def _embed_query_uncached(self, text: str) -> np.ndarray:
+        # Queries stay out of the disk cache, which holds indexed documents;
+        # repeats are served by the in-memory query LRU instead
+        embeddings = self._embed_texts([normalize_text(text)], bulk=False)
+        if len(embeddings) == 0:
+            raise ValueError("Failed to generate query embedding")
+        return embeddings[0]
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query string as a read-only 1-D float32 array,
+        raising if the model fails. Repeated queries come from the LRU."""
+        return query_embedding_cache.get_or_embed(text, self._embed_query_uncached)
+
+    @staticmethod
+    def _review_record(review: Review) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """Build the (id, document, metadata) triple stored for a review"""
+        # Combine title and text for better context
+        document = f"{review.review_title or ''} {review.review_text or ''}".strip()
+        if not document:
+            return None
+
+        metadata = {
+            "laptop_id": review.laptop_id,
+            "laptop_name": review.laptop.full_model_name,
+            "rating": review.rating or 0,
+            "reviewer_name": review.reviewer_name or "Anonymous",
+            "configuration": review.configuration_summary or "",
+            "verified": review.reviewer_verified or False,
+            "helpful_count": review.helpful_count or 0,
+        }
+        return f"review_{review.id}", document, metadata
+
+    @staticmethod
+    def _qa_record(qa: QuestionsAnswer) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """Build the (id, document, metadata) triple stored for a Q&A pair"""
+        # Combine question and answer
+        document = (
+            f"Q: {qa.question_text} A: {qa.answer_text or 'No answer yet'}".strip()
+        )
+        if not document:
+            return None
+
+        metadata = {
+            "laptop_id": qa.laptop_id,
+            "laptop_name": qa.laptop.full_model_name,
+            "question": qa.question_text,
+            "answer": qa.answer_text or "",
+            "asker_name": qa.asker_name or "Anonymous",
+            "answerer_name": qa.answerer_name or "Anonymous",
+            "helpful_count": qa.helpful_count or 0,
+            "configuration": qa.configuration_summary or "",
+        }
+        return f"qa_{qa.id}", document, metadata
+
+    def _sources(self) -> Dict[str, Tuple[Any, Any, Callable, str]]:
+        """(model, collection, record builder, id prefix) per collection name"""
+        return {
+            AIConfig.REVIEWS_COLLECTION: (
+                Review,
+                self.reviews_collection,
+                self._review_record,
+                "review",
+            ),
+            AIConfig.QA_COLLECTION: (
+                QuestionsAnswer,
+                self.qa_collection,
+                self._qa_record,
+                "qa",
+            ),
+        }
+
+    def _upsert_records(self, collection, collection_name: str, records) -> bool:
+        """Embed and upsert (id, document, metadata) records in batches"""
+        batch_size = min(
+            AIConfig.VECTOR_INDEX_BATCH_SIZE, self.chroma_client.get_max_batch_size()
+        )
+        for start in range(0, len(records), batch_size):
+            batch = records[start : start + batch_size]
+            ids, documents, metadatas = (list(col) for col in zip(*batch))
+            embeddings = self._generate_embeddings(documents, bulk=True)
+            if len(embeddings) == 0:
+                logging.error(f"Failed to generate embeddings for {collection_name}")
+                return False
+            collection.upsert(
+                embeddings=embeddings, documents=documents, metadatas=metadatas, ids=ids
+            )
+            lexical = self._lexical.get(collection.name)
+            if lexical is not None:
+                lexical.upsert(ids, documents, metadatas)
+        return True
+
+    def _delete_ids(self, collection, ids: List[str]) -> None:
+        """Delete vectors and their lexical index entries"""
+        collection.delete(ids=ids)
+        lexical = self._lexical.get(collection.name)
+        if lexical is not None:
+            lexical.delete(ids)
+
+    def _lexical_index(self, collection) -> BM25Index:
+        """BM25 index of a collection's documents. Built from the collection
+        on first use, or when its size shows another process changed it, and
+        kept in step with this service's own upserts and deletes."""
+        with self._lexical_lock:
+            index = self._lexical.get(collection.name)
+            if index is not None and len(index) == collection.count():
+                return index
+            index = BM25Index()
+            page_size = self.chroma_client.get_max_batch_size()
+            offset = 0
+            while True:
+                page = collection.get(
+                    include=["documents", "metadatas"], limit=page_size, offset=offset
+                )
+                if not page["ids"]:
+                    break
+                index.upsert(page["ids"], page["documents"], page["metadatas"])
+                offset += len(page["ids"])
+            self._lexical[collection.name] = index
+            logging.info(f"Built BM25 index for {collection.name}: {len(index)} docs")
+            return index
+
+    def _backfill_missing(
+        self, db: Session, model, collection, collection_name, build_record, prefix
+    ) -> int:
+        """Upsert rows that have no vector, streaming ids in batches"""
+        batch_size = AIConfig.VECTOR_INDEX_BATCH_SIZE
+        upserted = 0
+
+        def flush(missing: List[int]) -> int:
+            rows = (
+                db.query(model)
+                .join(Laptop)
+                .options(contains_eager(model.laptop))
+                .filter(model.id.in_(missing))
+                .all()
+            )
+            records = [r for r in map(build_record, rows) if r]
+            if records and not self._upsert_records(
+                collection, collection_name, records
+            ):
+                raise RuntimeError(f"Failed to backfill {collection_name}")
+            return len(records)
+
+        missing = []
+        ids = db.execute(
+            select(model.id).order_by(model.id).execution_options(yield_per=batch_size)
+        )
+        for chunk in ids.scalars().partitions():
+            vector_ids = [f"{prefix}_{row_id}" for row_id in chunk]
+            found = set(collection.get(ids=vector_ids, include=[])["ids"])
+            missing += [_row_id(i) for i in vector_ids if i not in found]
+            if len(missing) >= batch_size:
+                upserted += flush(missing)
+                missing = []
+        if missing:
+            upserted += flush(missing)
+        return upserted
+
+    def _delete_stale(self, db: Session, model, collection) -> int:
+        """Delete vectors whose rows are gone, paging through the collection"""
+        batch_size = AIConfig.VECTOR_INDEX_BATCH_SIZE
+        stale_ids = []
+        offset = 0
+        while True:
+            page = collection.get(include=[], limit=batch_size, offset=offset)["ids"]
+            if not page:
+                break
+            present = {
+                row_id
+                for (row_id,) in db.query(model.id).filter(
+                    model.id.in_([_row_id(i) for i in page])
+                )
+            }
+            stale_ids += [i for i in page if _row_id(i) not in present]
+            offset += len(page)
+
+        for start in range(0, len(stale_ids), batch_size):
+            self._delete_ids(collection, stale_ids[start : start + batch_size])
+        return len(stale_ids)
+
+    def sync_collection(
+        self, db: Session, collection_name: str, full: bool = False
+    ) -> Optional[Dict[str, int]]:
+        """Bring one collection up to date with the SQL database.
+
+        Rows past the stored watermarks (a higher id, a newer scraped_at, or
+        a laptop updated since, as its name is part of the metadata) are
+        embedded and upserted in fixed-size batches, in id order. `full`
+        re-embeds every row. Memory use is bounded by the batch size, not the
+        corpus.
+
+        Routine runs only read past the watermarks; deletes arrive through the
+        change listener. Only a full sync, or a collection whose size no
+        longer matches the table, pays for the O(corpus) scans that backfill
+        missing vectors and delete vectors whose rows are gone.
+
+        After each batch the last row id is committed as a checkpoint, so an
+        interrupted run resumes where it stopped. Returns the counts, or None
+        on failure, leaving the watermarks for a retry.
+        """
+        model, collection, build_record, prefix = self._sources()[collection_name]
+        batch_size = AIConfig.VECTOR_INDEX_BATCH_SIZE
+        with self._write_lock():
+            try:
+                state = db.get(VectorIndexState, collection_name)
+                if state is None:
+                    state = VectorIndexState(collection=collection_name, last_id=0)
+                    db.add(state)
+                    full = True
+                after_id = state.checkpoint_id or 0
+                if state.checkpoint_id is not None:
+                    full = full or state.checkpoint_full
+                    logging.info(
+                        f"Resuming {collection_name} sync after row {after_id}"
+                    )
+
+                # Read before the rows, so changes landing mid-sync are
+                # picked up by the next run
+                last_id, last_scraped_at, last_laptop_update = (
+                    db.query(
+                        func.max(model.id),
+                        func.max(model.scraped_at),
+                        func.max(Laptop.updated_at),
+                    )
+                    .select_from(model)
+                    .join(Laptop)
+                    .one()
+                )
 
-    def index_reviews(self, db: Session) -> bool:
-        """Index all reviews into ChromaDB"""
-        try:
-            # Get all reviews with laptop information
-            reviews = db.query(Review).join(Laptop).all()
+                changed = (
+                    db.query(model).join(Laptop).options(contains_eager(model.laptop))
+                )
+                if not full:
+                    conditions = [model.id > state.last_id]
+                    if state.last_scraped_at is not None:
+                        conditions.append(model.scraped_at > state.last_scraped_at)
+                    if state.last_laptop_update is not None:
+                        conditions.append(Laptop.updated_at > state.last_laptop_update)
+                    changed = changed.filter(or_(*conditions))
+                total = changed.filter(model.id > after_id).count()
+                progress = {"done": 0, "total": total, "full": full}
+                self.sync_progress[collection_name] = progress
+
+                upserted = deleted = 0
+                started = logged = time.monotonic()
+                while True:
+                    rows = (
+                        changed.filter(model.id > after_id)
+                        .order_by(model.id)
+                        .limit(batch_size)
+                        .all()
+                    )
+                    if not rows:
+                        break
+
+                    records, empty_ids = [], []
+                    for row in rows:
+                        record = build_record(row)
+                        if record:
+                            records.append(record)
+                        else:
+                            empty_ids.append(f"{prefix}_{row.id}")
+                    if records and not self._upsert_records(
+                        collection, collection_name, records
+                    ):
+                        db.rollback()
+                        return None
+                    # Rows that no longer have any text lose their vectors
+                    if empty_ids:
+                        empty_ids = collection.get(ids=empty_ids, include=[])["ids"]
+                        if empty_ids:
+                            self._delete_ids(collection, empty_ids)
+                    upserted += len(records)
+                    deleted += len(empty_ids)
+
+                    after_id = rows[-1].id
+                    state.checkpoint_id = after_id
+                    state.checkpoint_full = full
+                    db.commit()
+
+                    progress["done"] += len(rows)
+                    now = time.monotonic()
+                    if now - logged >= 5 or progress["done"] >= total:
+                        logged = now
+                        rate = progress["done"] / max(now - started, 1e-6)
+                        logging.info(
+                            f"Indexed {progress['done']}/{total} {collection_name}"
+                            f" rows ({rate:.0f}/s)"
+                        )
+
+                # Rows without text have no vector, so a table holding some
+                # keeps the counts apart and falls back to scanning each run
+                if full or collection.count() != db.query(model).count():
+                    if not full:
+                        upserted += self._backfill_missing(
+                            db, model, collection, collection_name, build_record, prefix
+                        )
+                    deleted += self._delete_stale(db, model, collection)
+
+                state.last_id = last_id or 0
+                state.last_scraped_at = last_scraped_at
+                state.last_laptop_update = last_laptop_update
+                state.checkpoint_id = None
+                state.checkpoint_full = False
+                state.indexed_count = collection.count()
+                db.commit()
+
+                if upserted or deleted:
+                    cache.invalidate_tags(collection_name)
+                result = {
+                    "upserted": upserted,
+                    "deleted": deleted,
+                    "indexed": state.indexed_count,
+                }
+                self.last_sync[collection_name] = result
+                logging.info(f"Synced {collection_name}: {result}")
+                return result
+
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Error syncing {collection_name}: {e}")
+                return None
+
+    def sync_index(
+        self, db: Session, full: bool = False, collections: List[str] = None
+    ) -> Dict[str, Optional[Dict[str, int]]]:
+        """Incrementally sync the given collections (default: all)"""
+        results = {
+            name: self.sync_collection(db, name, full=full)
+            for name in collections or self._sources()
+        }
+        if not collections and all(r is not None for r in results.values()):
+            self.mark_ready()
+        return results
+
+    @property
+    def ready(self) -> bool:
+        """Whether vector search can serve queries"""
+        return self._ready.is_set()
+
+    def mark_ready(self) -> None:
+        if not self._ready.is_set():
+            self._ready.set()
+            # Answers built from the SQL keyword fallback are stale now
+            cache.bump_data_version()
+            logging.info("Vector index ready for search")
+
+    def has_documents(self) -> bool:
+        """Whether every collection already holds documents"""
+        return all(
+            collection.count() > 0 for _, collection, _, _ in self._sources().values()
+        )
 
-            if not reviews:
-                logging.warning("No reviews found to index")
-                return True
+    def index_reviews(self, db: Session) -> bool:
+        """Re-index all reviews; upserts, so re-running never duplicates"""
+        return (
+            self.sync_collection(db, AIConfig.REVIEWS_COLLECTION, full=True) is not None
+        )
 
-            # Prepare documents and metadata
-            documents = []
-            metadatas = []
-            ids = []
+    def index_qa(self, db: Session) -> bool:
+        """Re-index all Q&A pairs; upserts, so re-running never duplicates"""
+        return self.sync_collection(db, AIConfig.QA_COLLECTION, full=True) is not None
+
+    def _sync_rows(
+        self, db: Session, model, row_ids, collection, collection_name, build_record
+    ) -> bool:
+        """Upsert the given rows and drop vectors whose rows no longer exist"""
+        row_ids = {int(row_id) for row_id in row_ids}
+        if not row_ids:
+            return True
 
-            for review in reviews:
-                # Combine title and text for better context
-                document = (
-                    f"{review.review_title or ''} {review.review_text or ''}".strip()
+        with self._write_lock():
+            try:
+                rows = (
+                    db.query(model)
+                    .join(Laptop)
+                    .options(contains_eager(model.laptop))
+                    .filter(model.id.in_(row_ids))
+                    .all()
                 )
-                if not document:
-                    continue
-
-                documents.append(document)
-                metadatas.append(
-                    {
-                        "laptop_id": review.laptop_id,
-                        "laptop_name": review.laptop.full_model_name,
-                        "rating": review.rating or 0,
-                        "reviewer_name": review.reviewer_name or "Anonymous",
-                        "configuration": review.configuration_summary or "",
-                        "verified": review.reviewer_verified or False,
-                        "helpful_count": review.helpful_count or 0,
-                    }
+                records = [r for r in map(build_record, rows) if r]
+                present_ids = {row.id for row in rows}
+                prefix = self._sources()[collection_name][3]
+
+                if records and not self._upsert_records(
+                    collection, collection_name, records
+                ):
+                    db.rollback()
+                    return False
+
+                # Rows that are gone (or now have no text) lose their vectors
+                indexed_ids = {record[0] for record in records}
+                stale_ids = [
+                    f"{prefix}_{row_id}"
+                    for row_id in row_ids
+                    if row_id not in present_ids
+                    or f"{prefix}_{row_id}" not in indexed_ids
+                ]
+                if stale_ids:
+                    self._delete_ids(collection, stale_ids)
+
+                cache.invalidate_tags(collection_name)
+                logging.info(
+                    f"Synced {collection_name}: {len(records)} upserted, {len(stale_ids)} removed"
                 )
-                ids.append(f"review_{review.id}")
-
-            if not documents:
-                logging.warning("No valid review documents to index")
                 return True
 
-            # Generate embeddings
-            embeddings = self._generate_embeddings(documents)
-            if not embeddings:
-                logging.error("Failed to generate embeddings for reviews")
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Error syncing {collection_name}: {e}")
                 return False
 
-            # Add to collection
-            self.reviews_collection.add(
-                embeddings=embeddings, documents=documents, metadatas=metadatas, ids=ids
-            )
-
-            logging.info(f"Successfully indexed {len(documents)} reviews")
-            return True
-
-        except Exception as e:
-            logging.error(f"Error indexing reviews: {e}")
-            return False
-
-    def index_qa(self, db: Session) -> bool:
-        """Index all Q&A pairs into ChromaDB"""
-        try:
-            # Get all Q&A with laptop information
-            qa_pairs = db.query(QuestionsAnswer).join(Laptop).all()
+    def sync_reviews(self, db: Session, review_ids) -> bool:
+        """Re-index specific reviews after they were inserted, updated or deleted"""
+        return self._sync_rows(
+            db,
+            Review,
+            review_ids,
+            self.reviews_collection,
+            AIConfig.REVIEWS_COLLECTION,
+            self._review_record,
+        )
 
-            if not qa_pairs:
-                logging.warning("No Q&A pairs found to index")
-                return True
+    def sync_qa(self, db: Session, qa_ids) -> bool:
+        """Re-index specific Q&A pairs after they were inserted, updated or deleted"""
+        return self._sync_rows(
+            db,
+            QuestionsAnswer,
+            qa_ids,
+            self.qa_collection,
+            AIConfig.QA_COLLECTION,
+            self._qa_record,
+        )
 
-            # Prepare documents and metadata
-            documents = []
-            metadatas = []
-            ids = []
-
-            for qa in qa_pairs:
-                # Combine question and answer
-                document = f"Q: {qa.question_text} A: {qa.answer_text or 'No answer yet'}".strip()
-                if not document:
-                    continue
-
-                documents.append(document)
-                metadatas.append(
-                    {
-                        "laptop_id": qa.laptop_id,
-                        "laptop_name": qa.laptop.full_model_name,
-                        "question": qa.question_text,
-                        "answer": qa.answer_text or "",
-                        "asker_name": qa.asker_name or "Anonymous",
-                        "answerer_name": qa.answerer_name or "Anonymous",
-                        "helpful_count": qa.helpful_count or 0,
-                        "configuration": qa.configuration_summary or "",
-                    }
+    def apply_changes(self, db: Session, changes: List[Dict[str, Any]]) -> None:
+        """Apply a batch of row-change notifications as vector-index deltas"""
+        review_ids = {c["id"] for c in changes if c.get("table") == "reviews"}
+        qa_ids = {c["id"] for c in changes if c.get("table") == "questions_answers"}
+
+        # A renamed laptop changes the laptop_name metadata of its documents
+        renamed_ids = {
+            c["id"]
+            for c in changes
+            if c.get("table") == "laptops" and c.get("op") == "UPDATE"
+        }
+        if renamed_ids:
+            review_ids |= {
+                row.id
+                for row in db.query(Review.id).filter(Review.laptop_id.in_(renamed_ids))
+            }
+            qa_ids |= {
+                row.id
+                for row in db.query(QuestionsAnswer.id).filter(
+                    QuestionsAnswer.laptop_id.in_(renamed_ids)
                 )
-                ids.append(f"qa_{qa.id}")
-
-            if not documents:
-                logging.warning("No valid Q&A documents to index")
-                return True
+            }
 
-            # Generate embeddings
-            embeddings = self._generate_embeddings(documents)
-            if not embeddings:
-                logging.error("Failed to generate embeddings for Q&A")
-                return False
+        if review_ids:
+            self.sync_reviews(db, review_ids)
+        if qa_ids:
+            self.sync_qa(db, qa_ids)
+
+    def _query_collection(
+        self,
+        collection,
+        query: str,
+        laptop_id: Optional[int],
+        limit: int,
+        mode: str = None,
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a search against one collection and format the hits.
+
+        "vector" ranks by cosine distance only. "hybrid" also ranks the same
+        documents with BM25, so exact terms like "RJ-45" or "i7-1355U" are
+        found, and fuses both candidate lists with reciprocal rank fusion
+        (RRF). Each hit gets a `score` in [0, 1], comparable across
+        collections: cosine similarity, or the RRF score relative to a
+        document ranked first by both.
+        """
+        hybrid = (mode or AIConfig.SEARCH_MODE) == "hybrid"
+        depth = max(limit, AIConfig.HYBRID_CANDIDATES) if hybrid else limit
+
+        # Generate query embedding
+        if query_embedding is None:
+            with tracer.span("embed.query"):
+                query_embedding = self.embed_query(query)
+
+        # Prepare where clause for filtering
+        where_clause = {}
+        if laptop_id:
+            where_clause["laptop_id"] = laptop_id
+
+        # Search
+        with tracer.span("chroma.query"):
+            results = collection.query(
+                query_embeddings=query_embedding[np.newaxis, :],
+                n_results=depth,
+                where=where_clause if where_clause else None,
+            )
 
-            # Add to collection
-            self.qa_collection.add(
-                embeddings=embeddings, documents=documents, metadatas=metadatas, ids=ids
+        # Format results
+        vector_ids = results["ids"][0]
+        hits = {
+            doc_id: {
+                "id": doc_id,
+                "document": results["documents"][0][i],
+                "metadata": results["metadatas"][0][i],
+                "distance": results["distances"][0][i],
+            }
+            for i, doc_id in enumerate(vector_ids)
+        }
+        if not hybrid:
+            return [
+                {**hits[doc_id], "score": max(0.0, 1 - hits[doc_id]["distance"])}
+                for doc_id in vector_ids
+            ]
+
+        with tracer.span("bm25.query") as span:
+            lexical = self._lexical_index(collection).search(query, depth, laptop_id)
+            if span is not None:
+                span.set(results=len(lexical))
+        fused = reciprocal_rank_fusion(
+            [vector_ids, [doc_id for doc_id, _ in lexical]], AIConfig.RRF_K
+        )[:limit]
+
+        # Lexical-only hits: fetch them and compute their cosine distance
+        missing = [doc_id for doc_id, _ in fused if doc_id not in hits]
+        if missing:
+            extra = collection.get(
+                ids=missing, include=["documents", "metadatas", "embeddings"]
             )
+            vectors = np.asarray(extra["embeddings"], dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query_embedding)
+            similarities = vectors @ query_embedding / np.maximum(norms, 1e-12)
+            for doc_id, document, metadata, similarity in zip(
+                extra["ids"], extra["documents"], extra["metadatas"], similarities
+            ):
+                hits[doc_id] = {
+                    "id": doc_id,
+                    "document": document,
+                    "metadata": metadata,
+                    "distance": float(1 - similarity),
+                }
+
+        best = 2 / (AIConfig.RRF_K + 1)
+        return [
+            {**hits[doc_id], "score": score / best}
+            for doc_id, score in fused
+            if doc_id in hits
+        ]
+
+    def _cached_search(
+        self,
+        collection,
+        collection_name: str,
+        query: str,
+        laptop_id: Optional[int],
+        limit: int,
+        mode: Optional[str],
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """Serve repeated searches from the shared cache, tagged by collection"""
+        mode = mode or AIConfig.SEARCH_MODE
+        key = make_key(
+            "vector_search",
+            collection_name,
+            mode,
+            laptop_id or "all",
+            limit,
+            " ".join(query.split()),
+        )
+        loaded = []
 
-            logging.info(f"Successfully indexed {len(documents)} Q&A pairs")
-            return True
+        def load():
+            loaded.append(True)
+            return self._query_collection(
+                collection, query, laptop_id, limit, mode, query_embedding
+            )
 
-        except Exception as e:
-            logging.error(f"Error indexing Q&A: {e}")
-            return False
+        with tracer.span(
+            "vector.search",
+            collection=collection_name,
+            mode=mode,
+            laptop_id=laptop_id,
+            limit=limit,
+        ) as span:
+            results = cache.get_or_set(
+                key,
+                load,
+                ttl=CacheConfig.VECTOR_SEARCH_TTL,
+                tags=[collection_name],
+            )
+            if span is not None:
+                span.set(cache_hit=not loaded, results=len(results))
+            return results
 
     def search_reviews(
-        self, query: str, laptop_id: Optional[int] = None, limit: int = None
+        self,
+        query: str,
+        laptop_id: Optional[int] = None,
+        limit: int = None,
+        mode: str = None,
     ) -> List[Dict[str, Any]]:
-        """Search reviews using vector similarity"""
+        """Search reviews ("hybrid" or "vector" mode, default SEARCH_MODE)"""
         try:
             limit = limit or AIConfig.MAX_SEARCH_RESULTS
-
-            # Generate query embedding
-            query_embedding = self._generate_embeddings([query])
-            if not query_embedding:
-                return []
-
-            # Prepare where clause for filtering
-            where_clause = {}
-            if laptop_id:
-                where_clause["laptop_id"] = laptop_id
-
-            # Search
-            results = self.reviews_collection.query(
-                query_embeddings=query_embedding,
-                n_results=limit,
-                where=where_clause if where_clause else None,
+            return self._cached_search(
+                self.reviews_collection,
+                AIConfig.REVIEWS_COLLECTION,
+                query,
+                laptop_id,
+                limit,
+                mode,
             )
 
-            # Format results
-            formatted_results = []
-            for i in range(len(results["ids"][0])):
-                formatted_results.append(
-                    {
-                        "document": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "distance": results["distances"][0][i],
-                    }
-                )
-
-            return formatted_results
-
         except Exception as e:
             logging.error(f"Error searching reviews: {e}")
             return []
 
     def search_qa(
-        self, query: str, laptop_id: Optional[int] = None, limit: int = None
+        self,
+        query: str,
+        laptop_id: Optional[int] = None,
+        limit: int = None,
+        mode: str = None,
     ) -> List[Dict[str, Any]]:
-        """Search Q&A using vector similarity"""
+        """Search Q&A ("hybrid" or "vector" mode, default SEARCH_MODE)"""
         try:
             limit = limit or AIConfig.MAX_SEARCH_RESULTS
-
-            # Generate query embedding
-            query_embedding = self._generate_embeddings([query])
-            if not query_embedding:
-                return []
-
-            # Prepare where clause for filtering
-            where_clause = {}
-            if laptop_id:
-                where_clause["laptop_id"] = laptop_id
-
-            # Search
-            results = self.qa_collection.query(
-                query_embeddings=query_embedding,
-                n_results=limit,
-                where=where_clause if where_clause else None,
+            return self._cached_search(
+                self.qa_collection,
+                AIConfig.QA_COLLECTION,
+                query,
+                laptop_id,
+                limit,
+                mode,
             )
 
-            # Format results
-            formatted_results = []
-            for i in range(len(results["ids"][0])):
-                formatted_results.append(
-                    {
-                        "document": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "distance": results["distances"][0][i],
-                    }
-                )
-
-            return formatted_results
-
         except Exception as e:
             logging.error(f"Error searching Q&A: {e}")
             return []
 
+    def search_all(
+        self,
+        query: str,
+        laptop_id: Optional[int] = None,
+        limit: int = None,
+        sources: Optional[List[str]] = None,
+        mode: str = None,
+    ) -> List[Dict[str, Any]]:
+        """Search every collection (or the given `sources`, e.g. ["review"])
+        with one query embedding, querying them concurrently.
+
+        Returns up to `limit` hits overall, best `score` first, each tagged
+        with its `source` and `collection`. Errors propagate to the caller.
+        """
+        limit = limit or AIConfig.MAX_SEARCH_RESULTS
+        targets = [
+            (name, collection, prefix)
+            for name, (_, collection, _, prefix) in self._sources().items()
+            if not sources or prefix in sources or name in sources
+        ]
+        with tracer.span(
+            "vector.search_all", sources=len(targets), limit=limit
+        ) as span:
+            with tracer.span("embed.query"):
+                query_embedding = self.embed_query(query)
+
+            futures = [
+                (
+                    name,
+                    prefix,
+                    self._search_executor.submit(
+                        contextvars.copy_context().run,
+                        self._cached_search,
+                        collection,
+                        name,
+                        query,
+                        laptop_id,
+                        limit,
+                        mode,
+                        query_embedding,
+                    ),
+                )
+                for name, collection, prefix in targets
+            ]
+            merged = [
+                {**hit, "source": prefix, "collection": name}
+                for name, prefix, future in futures
+                for hit in future.result()
+            ]
+            merged.sort(key=lambda hit: -hit["score"])
+            if span is not None:
+                span.set(results=len(merged))
+            return merged[:limit]
+
     def get_collection_stats(self) -> Dict[str, int]:
         """Get statistics about the collections"""
         try:
@@ -0,0 +1,21 @@
+# ai_services/test/conftest.py
+import itertools
+
+import pytest
+
+
+@pytest.fixture
+def make_vector_service(tmp_path):
+    """Builds a VectorService (or subclass) on its own Chroma directory under
+    pytest's tmp_path, so indexes are removed with it. Pass
+    `persist_directory` to open a second service on an existing directory."""
+    from ai_services.src.services.vector_service import VectorService
+
+    directories = itertools.count()
+
+    def make(service_class=VectorService, persist_directory=None):
+        if persist_directory is None:
+            persist_directory = tmp_path / f"chroma-{next(directories)}"
+        return service_class(persist_directory=str(persist_directory))
+
+    return make
@@ -0,0 +1,203 @@
+# ai_services/test/test_admission_control.py
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from backend.src.app.core.admission import (
+    AdmissionController,
+    AsyncAdmissionController,
+    Overloaded,
+)
+from ai_services.src.services.langgraph_agent import LaptopAgent
+from ai_services.test.test_async_agent import StubChatModel
+
+
+async def _burst(agent: LaptopAgent, requests: int) -> Counter:
+    """Fire concurrent queries and count outcomes by HTTP status"""
+
+    async def one(i):
+        try:
+            await agent.aprocess_query(f"laptops under $1000 #{i}", None)
+            return 200
+        except Overloaded as e:
+            assert e.retry_after >= 1
+            return e.status_code
+
+    return Counter(await asyncio.gather(*(one(i) for i in range(requests))))
+
+
+def test_burst_is_bounded_and_shed():
+    admission = AsyncAdmissionController(max_concurrent=2, max_queue=4, queue_timeout=5)
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0.05),
+        session_factory=lambda: None,
+        admission=admission,
+    )
+
+    outcomes = asyncio.run(_burst(agent, 20))
+    stats = admission.stats()
+    print(f"Burst outcomes: {dict(outcomes)}, admission: {stats}")
+
+    # Two run, four queue, the rest are shed immediately instead of erroring
+    assert outcomes[429] > 0 and outcomes[200] >= 6
+    assert outcomes[200] + outcomes[429] == 20
+    assert stats["peak_queue_depth"] == 4
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+
+def test_queue_timeout_returns_503():
+    admission = AsyncAdmissionController(
+        max_concurrent=1, max_queue=10, queue_timeout=0.1
+    )
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0.3),
+        session_factory=lambda: None,
+        admission=admission,
+    )
+
+    outcomes = asyncio.run(_burst(agent, 3))
+    assert outcomes == Counter({200: 1, 503: 2})
+    assert admission.stats()["timed_out"] == 2
+    assert admission.stats()["active"] == 0
+
+
+def test_cancelled_waiter_frees_its_place():
+    admission = AsyncAdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+
+    async def hold(seconds):
+        async with admission.slot():
+            await asyncio.sleep(seconds)
+
+    async def scenario():
+        holder = asyncio.create_task(hold(0.1))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(hold(0))
+        await asyncio.sleep(0.01)
+        waiter.cancel()  # client went away while queued
+        await asyncio.sleep(0.01)
+        await hold(0)  # queue slot is free again
+        await holder
+
+    asyncio.run(scenario())
+    assert admission.stats()["active"] == 0
+
+
+def test_threaded_controller():
+    admission = AdmissionController(max_concurrent=2, max_queue=2, queue_timeout=5)
+    running = []
+    peak = []
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def call():
+        try:
+            with admission.slot():
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.1)
+                with lock:
+                    running.pop()
+            outcomes[200] += 1
+        except Overloaded as e:
+            outcomes[e.status_code] += 1
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+    assert outcomes[200] == 4 and outcomes[429] == 4
+
+
+def test_sync_callers_share_the_async_limit():
+    admission = AsyncAdmissionController(max_concurrent=2, max_queue=8, queue_timeout=5)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with admission.blocking_slot():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+    async def coroutine_call():
+        async with admission.slot():
+            await asyncio.sleep(0.05)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) <= 2 and admission.admitted == 6
+
+    # Coroutines can hold slots while threads wait on their event loop
+    async def mixed():
+        thread = threading.Thread(target=call)
+        holders = [asyncio.create_task(coroutine_call()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        thread.start()
+        await asyncio.gather(*holders)
+        await asyncio.to_thread(thread.join)
+
+    asyncio.run(mixed())
+    assert admission.admitted == 9 and admission.stats()["active"] == 0
+
+
+def test_sync_agent_is_admitted():
+    admission = AsyncAdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1)
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0),
+        session_factory=lambda: None,
+        admission=admission,
+    )
+    agent.process_query("laptops under $1000", None)
+    assert admission.admitted > 0 and admission.stats()["active"] == 0
+
+    admission.active = 1  # another caller holds the only slot
+    try:
+        agent.process_query("laptops under $1000", None)
+        assert False, "expected Overloaded"
+    except Overloaded as e:
+        assert e.status_code == 429
+    finally:
+        admission.active = 0
+
+
+def test_one_event_loop_at_a_time():
+    admission = AsyncAdmissionController(max_concurrent=2, max_queue=2, queue_timeout=5)
+    with admission.blocking_slot():
+        # Held through the controller's loop, so another loop can't join in
+        try:
+            asyncio.run(admission.acquire())
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            assert "another event loop" in str(e)
+
+    # Once idle, it follows the caller to a new loop
+    async def use():
+        async with admission.slot():
+            pass
+
+    asyncio.run(use())
+    asyncio.run(use())
+    assert admission.stats()["active"] == 0
+
+
+if __name__ == "__main__":
+    test_burst_is_bounded_and_shed()
+    test_queue_timeout_returns_503()
+    test_cancelled_waiter_frees_its_place()
+    test_threaded_controller()
+    test_sync_callers_share_the_async_limit()
+    test_sync_agent_is_admitted()
+    test_one_event_loop_at_a_time()
+    print("Admission control tests passed!")
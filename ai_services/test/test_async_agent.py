@@ -0,0 +1,210 @@
+# ai_services/test/test_async_agent.py
+import asyncio
+import json
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ai_services.src.core.executors import AbandonedCalls, abandoned_calls, db_executor
+from ai_services.src.services.langgraph_agent import LaptopAgent
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model that answers instantly-shaped prompts after a fixed delay"""
+
+    latency: float = 0.5
+    analysis: dict = {
+        "tools_needed": ["search_laptops_by_budget"],
+        "tool_params": {
+            "search_laptops_by_budget": {"min_price": 0, "max_price": 1000}
+        },
+        "intent": "budget_search",
+    }
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        if "Return a JSON object" in messages[0].content:
+            content = json.dumps(self.analysis)
+        else:
+            content = "Here are the laptops we have under $1000."
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=content))]
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+
+async def _measure(run_one, concurrency: int) -> dict:
+    """Run `concurrency` requests alongside a 10ms heartbeat measuring loop lag"""
+    worst_lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal worst_lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst_lag = max(worst_lag, time.perf_counter() - started - 0.01)
+
+    ticker = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(run_one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker
+
+    return {"elapsed": elapsed, "worst_loop_lag": worst_lag}
+
+
+def test_async_pipeline_concurrency(concurrency: int = 10, latency: float = 0.2):
+    """Compare blocking process_query with aprocess_query under concurrent load"""
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=latency), session_factory=lambda: None
+    )
+
+    async def blocking_request(i):
+        # What the endpoints used to do: sync agent call inside `async def`
+        return agent.process_query(f"laptops under $1000 #{i}", None)
+
+    async def async_request(i):
+        return await agent.aprocess_query(f"laptops under $1000 #{i}", None)
+
+    blocking = asyncio.run(_measure(blocking_request, concurrency))
+    non_blocking = asyncio.run(_measure(async_request, concurrency))
+
+    print(f"Concurrency {concurrency}, stub LLM latency {latency}s per call")
+    print(
+        f"  blocking: {blocking['elapsed']:.2f}s total, "
+        f"worst event loop stall {blocking['worst_loop_lag'] * 1000:.0f}ms"
+    )
+    print(
+        f"  async:    {non_blocking['elapsed']:.2f}s total, "
+        f"worst event loop stall {non_blocking['worst_loop_lag'] * 1000:.0f}ms"
+    )
+
+    # Two LLM round-trips per request: async should take ~2x latency overall
+    assert non_blocking["elapsed"] < blocking["elapsed"] / 2
+    assert non_blocking["worst_loop_lag"] < latency
+
+
+class SleepTool:
+    """Tool stand-in that takes a fixed time, or fails"""
+
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+
+    def _run(self, db=None, **kwargs) -> str:
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return f"slept {self.delay}s"
+
+
+def test_parallel_tool_execution():
+    """Tool latency should track the slowest tool, with partial results kept"""
+    from ai_services.src.core.config import settings
+
+    tools = {
+        "search_laptops_by_budget": SleepTool(0.3),
+        "search_reviews": SleepTool(0.3),
+        "search_qa": SleepTool(0.1, fail=True),
+        "get_laptop_summary": SleepTool(5.0),
+    }
+    analysis = {
+        "tools_needed": list(tools),
+        "tool_params": {name: {} for name in tools},
+        "intent": "mixed",
+    }
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0, analysis=analysis), session_factory=lambda: None
+    )
+    agent.tool_map = tools
+
+    original_timeout = settings.TOOL_TIMEOUT_SECONDS
+    settings.TOOL_TIMEOUT_SECONDS = 1.0
+    try:
+        for label, run in [
+            ("sync", lambda s: agent._execute_tools(s)),
+            ("async", lambda s: asyncio.run(agent._aexecute_tools(s))),
+        ]:
+            state = {"context": {"analysis": analysis}}
+            started = time.perf_counter()
+            results = run(state)["context"]["tool_results"]
+            elapsed = time.perf_counter() - started
+            print(f"  {label}: 4 tools in {elapsed:.2f}s -> {results}")
+
+            assert elapsed < 1.5  # sequential would be 5.7s
+            assert results["search_laptops_by_budget"] == "slept 0.3s"
+            assert results["search_qa"].startswith("Error executing search_qa")
+            assert results["get_laptop_summary"].startswith("Timed out")
+    finally:
+        settings.TOOL_TIMEOUT_SECONDS = original_timeout
+
+
+def test_timed_out_tools_are_bounded():
+    """Timed-out calls keep their workers; past the limit, tools are skipped"""
+    from ai_services.src.core.config import settings
+
+    analysis = {
+        "tools_needed": ["get_laptop_summary"],
+        "tool_params": {"get_laptop_summary": {}},
+        "intent": "laptop_details",
+    }
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0, analysis=analysis), session_factory=lambda: None
+    )
+    agent.tool_map = {"get_laptop_summary": SleepTool(0.6)}
+
+    def run():
+        state = agent._execute_tools({"context": {"analysis": analysis}})
+        return state["context"]["tool_results"]["get_laptop_summary"]
+
+    def arun():
+        state = {"context": {"analysis": analysis}}
+        state = asyncio.run(agent._aexecute_tools(state))
+        return state["context"]["tool_results"]["get_laptop_summary"]
+
+    original_timeout = settings.TOOL_TIMEOUT_SECONDS
+    original_calls = abandoned_calls[db_executor]
+    settings.TOOL_TIMEOUT_SECONDS = 0.1
+    abandoned_calls[db_executor] = calls = AbandonedCalls("db", 2)
+    try:
+        assert run().startswith("Timed out")
+        assert arun().startswith("Timed out")
+        assert calls.running == 2
+        # Both paths stop submitting while the pool holds abandoned calls
+        started = time.perf_counter()
+        assert run().startswith("Error executing get_laptop_summary")
+        assert arun().startswith("Error executing get_laptop_summary")
+        assert time.perf_counter() - started < 0.1
+
+        time.sleep(0.7)
+        print(f"Abandoned tool calls: {calls.stats()}")
+        assert calls.stats() == {"running": 0, "abandoned": 2, "limit": 2}
+        assert run().startswith("Timed out")
+    finally:
+        settings.TOOL_TIMEOUT_SECONDS = original_timeout
+        abandoned_calls[db_executor] = original_calls
+
+
+if __name__ == "__main__":
+    print("Benchmarking async agent pipeline...")
+    test_async_pipeline_concurrency()
+    print("Testing parallel tool execution...")
+    test_parallel_tool_execution()
+    test_timed_out_tools_are_bounded()
@@ -0,0 +1,54 @@
+# ai_services/test/test_context_builder.py
+from ai_services.src.services.context_builder import build_context, count_tokens
+
+
+def _review_output(count: int) -> str:
+    result = f"Found {count} relevant reviews:\n"
+    for i in range(count):
+        match = 0.9 - i * 0.01
+        result += f"{i+1}. HP ProBook 450 G10 - Rating: 4 - Helpful votes: 0"
+        result += f" - Match: {match:.2f}\n"
+        result += (
+            f"   Review {i}: battery lasts all day and the keyboard is solid...\n\n"
+        )
+    return result
+
+
+def test_context_fits_budget_and_ranks():
+    tool_results = {
+        "search_laptops_by_budget": "Found 2 laptops in budget $0-$1000:\n"
+        "- HP ProBook 450 G10 (ID: 3)\n- HP ProBook 440 G11 (ID: 4)\n",
+        "search_reviews": _review_output(60),
+    }
+    raw_tokens = count_tokens("\n".join(tool_results.values()))
+    context, stats = build_context(tool_results, budget=400)
+    print(f"Raw tool output {raw_tokens} tokens -> context {stats}")
+
+    assert stats["context_tokens"] <= 400
+    assert count_tokens(context) < raw_tokens / 3
+    # Database facts always survive; the best review match comes first
+    assert "(ID: 3)" in context and "(ID: 4)" in context
+    assert context.index("Review 0:") < context.index("Review 1:")
+    assert "Review 59:" not in context
+    assert "lower-ranked results omitted" in context
+
+
+def test_helpful_votes_and_duplicates():
+    tool_results = {
+        "search_reviews": "Found 2 relevant reviews:\n"
+        "1. Laptop A - Rating: 5 - Helpful votes: 0 - Match: 0.80\n   Great screen...\n\n"
+        "2. Laptop A - Rating: 5 - Helpful votes: 40 - Match: 0.78\n   Great keyboard...\n",
+        "search_qa": "Found 1 relevant Q&A pairs:\n"
+        "1. Laptop A - Helpful votes: 0 - Match: 0.80\n   Great screen...\n",
+    }
+    context, stats = build_context(tool_results, budget=1000)
+
+    assert stats["duplicates"] == 1
+    # 40 helpful votes outweigh a 0.02 similarity difference
+    assert context.index("Great keyboard") < context.index("Great screen")
+
+
+if __name__ == "__main__":
+    test_context_fits_budget_and_ranks()
+    test_helpful_votes_and_duplicates()
+    print("Context builder tests passed!")
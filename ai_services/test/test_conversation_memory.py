@@ -0,0 +1,138 @@
+# ai_services/test/test_conversation_memory.py
+import asyncio
+import time
+
+import pytest
+
+from ai_services.src.core.config import settings
+from backend.src.app.core.cache import cache
+from ai_services.src.services.conversation_store import (
+    Conversation,
+    ConversationMemory,
+    MemoryConversationStore,
+    SQLiteConversationStore,
+)
+from ai_services.src.services.langgraph_agent import LaptopAgent
+from ai_services.src.services.query_router import QueryRouter
+from ai_services.test.test_async_agent import StubChatModel
+from ai_services.test.test_query_router import CATALOG
+
+
+class CountingTool:
+    """Tool stand-in that records every call"""
+
+    def __init__(self, output: str):
+        self.output = output
+        self.calls = []
+
+    def _run(self, db=None, **kwargs) -> str:
+        self.calls.append(kwargs)
+        return self.output
+
+
+def _stores(directory):
+    return [
+        MemoryConversationStore(max_entries=2, ttl=1),
+        SQLiteConversationStore(
+            path=directory / "conversations.sqlite3", max_entries=2, ttl=1
+        ),
+    ]
+
+
+def test_store_eviction_and_ttl(tmp_path):
+    for store in _stores(tmp_path):
+        for name in ["a", "b", "c"]:
+            conversation = Conversation(conversation_id=name)
+            conversation.add_exchange(f"hi from {name}", "hello")
+            store.save(conversation)
+            time.sleep(0.01)
+
+        assert store.get("a") is None, type(store).__name__
+        assert store.get("c").turns[0]["content"] == "hi from c"
+        assert len(store) == 2
+
+        time.sleep(1.1)
+        assert store.get("c") is None, type(store).__name__
+
+
+def test_follow_up_reuses_laptop_and_tool_results():
+    summary_tool = CountingTool("Laptop: HP ProBook 450 G10 (ID: 3)")
+    review_tool = CountingTool("Found 1 relevant reviews: great battery")
+    agent = LaptopAgent(
+        llm=StubChatModel(latency=0),
+        session_factory=lambda: None,
+        router=QueryRouter(embed_fn=None, catalog_loader=lambda: CATALOG),
+    )
+    agent.tool_map = {
+        "get_laptop_summary": summary_tool,
+        "search_reviews": review_tool,
+    }
+    memory = ConversationMemory(store=MemoryConversationStore())
+
+    def turn(message: str) -> None:
+        conversation = memory.load("conv_test")
+        response = agent.process_query(message, None, conversation)
+        memory.record(conversation, message, response)
+
+    turn("Tell me about the HP ProBook 450")
+    assert summary_tool.calls == [{"laptop_id": 3}]
+    assert memory.load("conv_test").laptop_ids == [3]
+
+    # "it" resolves to the laptop from the previous turn, no LLM analysis
+    turn("What do reviews say about it?")
+    assert review_tool.calls[0]["laptop_id"] == 3
+
+    # Same tool call as turn one: answered from the conversation
+    turn("Tell me more about it")
+    assert len(summary_tool.calls) == 1
+    assert len(memory.load("conv_test").turns) == 6
+
+
+def test_tool_results_expire_with_data_changes():
+    conversation = Conversation(conversation_id="conv_versions")
+    params = {"laptop_id": 3}
+    conversation.remember_tool_result("get_laptop_summary", params, "$899 (ID: 3)")
+    assert conversation.tool_result("get_laptop_summary", params) == "$899 (ID: 3)"
+
+    # Survives a round trip through the store
+    restored = Conversation.from_json(conversation.to_json())
+    assert restored.tool_result("get_laptop_summary", params) == "$899 (ID: 3)"
+
+    # A price change bumps the data version; the old output is not replayed
+    cache.bump_data_version()
+    assert conversation.tool_result("get_laptop_summary", params) is None
+    conversation.remember_tool_result("get_laptop_summary", params, "$849 (ID: 3)")
+    assert conversation.tool_result("get_laptop_summary", params) == "$849 (ID: 3)"
+
+
+def test_compaction_bounds_prompt_size():
+    summaries = []
+
+    def summarizer(summary, turns):
+        summaries.append(len(turns))
+        return f"{summary} discussed {len(turns)} messages".strip()
+
+    memory = ConversationMemory(store=MemoryConversationStore(), summarizer=summarizer)
+
+    async def chat():
+        for i in range(10):
+            # Each request loads the conversation afresh, like the endpoints
+            conversation = memory.load("conv_long")
+            await memory.arecord(conversation, f"question {i}", "answer " * 200)
+            await asyncio.sleep(0.05)  # let background compaction finish
+
+    asyncio.run(chat())
+    stored = memory.load("conv_long")
+    context = stored.prompt_context()
+    print(f"Compactions: {summaries}, context {len(context)} chars")
+
+    assert summaries, "long conversations must be summarized"
+    assert len(stored.turns) <= settings.CONVERSATION_MAX_TURNS
+    assert stored.summary.startswith("discussed")
+    assert len(context) < (settings.CONVERSATION_MAX_TURNS + 2) * (
+        settings.CONVERSATION_TURN_MAX_CHARS + 20
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -1,11 +1,23 @@
 # backend/tests/test_full_agent.py
 import sys
 import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
 
 from backend.src.app.core.db import SessionLocal
-from ai_services.src.services.langgraph_agent import laptop_agent
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.services import llm_service
+from ai_services.src.services.langgraph_agent import laptop_agent, LaptopAgent
+from ai_services.src.services.agent_toolkit import initial_state
 from backend.src.utils.logger.logging import logger as logging
+from scripts.stub_llm_server import StubProfile, StubServer
 
 
 def test_simple_query():
@@ -72,7 +84,208 @@ def test_multiple_queries():
         db.close()
 
 
+# Offline benchmarks: every LLM call goes to the local stub server
+
+BENCHMARK_QUERIES = [
+    "What laptops are available under $1000?",
+    "What do reviews say about battery life?",
+    "Which laptop is best for programming and travel?",
+    "Compare the ThinkPad E14 and the HP ProBook 450",
+]
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {"p50": round(pick(0.5), 3), "p95": round(pick(0.95), 3)}
+
+
+def _stub_chat_model(server: StubServer, model: str) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        api_key="stub",
+        base_url=server.base_url,
+        temperature=AIConfig.TEMPERATURE,
+        stream_usage=True,
+        max_retries=0,
+    )
+
+
+def stub_agent(server: StubServer) -> LaptopAgent:
+    """LaptopAgent whose primary and fast models are served by the stub"""
+    return LaptopAgent(
+        llm=_stub_chat_model(server, AIConfig.DEFAULT_MODEL),
+        fast_llm=_stub_chat_model(server, AIConfig.FALLBACK_MODEL),
+    )
+
+
+async def _timed_run(agent: LaptopAgent, query: str):
+    """End-to-end latency and per-node latencies for one graph run"""
+    node_latencies = {}
+    db = SessionLocal()
+    try:
+        started = last = time.perf_counter()
+        state = initial_state(query, db)
+        async for update in agent.graph.astream(state, stream_mode="updates"):
+            now = time.perf_counter()
+            for node in update:
+                node_latencies[node] = now - last
+            last = now
+        return time.perf_counter() - started, node_latencies
+    finally:
+        db.close()
+
+
+def benchmark_agent(
+    requests: int = 40, concurrency: int = 8, profile: StubProfile = None
+) -> Dict:
+    """Throughput and per-node latency of LaptopAgent against the stub"""
+    profile = profile or StubProfile(seed=7)
+
+    async def run(agent):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                return await _timed_run(agent, BENCHMARK_QUERIES[i % 4] + f" #{i}")
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(requests)))
+        return time.perf_counter() - started, results
+
+    with StubServer(profile) as server:
+        elapsed, results = asyncio.run(run(stub_agent(server)))
+        llm_calls = server.requests
+
+    nodes = {}
+    for _, node_latencies in results:
+        for node, latency in node_latencies.items():
+            nodes.setdefault(node, []).append(latency)
+    summary = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / elapsed, 2),
+        "llm_calls": llm_calls,
+        "end_to_end": _percentiles([total for total, _ in results]),
+        "nodes": {node: _percentiles(values) for node, values in nodes.items()},
+    }
+    print(f"Agent benchmark: {summary}")
+    return summary
+
+
+def benchmark_chat_endpoint(
+    requests: int = 40, concurrency: int = 8, profile: StubProfile = None
+) -> Dict:
+    """Throughput of /ai/chat in-process (ASGI), with the agent on the stub"""
+    from ai_services.src import main
+
+    profile = profile or StubProfile(seed=11)
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://ai", timeout=120
+        ) as client:
+
+            async def one(i):
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/ai/chat",
+                        # Distinct messages so the response caches don't answer
+                        json={"message": f"{BENCHMARK_QUERIES[i % 4]} #{i}"},
+                    )
+                    return response.status_code, time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(one(i) for i in range(requests)))
+            return time.perf_counter() - started, results
+
+    original = dict(main.AGENTS)
+    with StubServer(profile) as server:
+        main.AGENTS["graph"] = stub_agent(server)
+        try:
+            elapsed, results = asyncio.run(run())
+        finally:
+            main.AGENTS.update(original)
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    summary = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / elapsed, 2),
+        "statuses": statuses,
+        "latency": _percentiles([latency for _, latency in results]),
+    }
+    print(f"/ai/chat benchmark: {summary}")
+    return summary
+
+
+def benchmark_structure_specification(
+    specs: int = 40, workers: int = 8, profile: StubProfile = None
+) -> Dict:
+    """Throughput of the structure_data.py LLM step against the stub"""
+    profile = profile or StubProfile(seed=13, output_tokens=40)
+    original = (llm_service.client, llm_service.llm_call_cache)
+
+    def structure(i):
+        started = time.perf_counter()
+        result = llm_service.structure_specification(
+            "Memory", f"{8 * (i + 1)}GB DDR5-5600 soldered", "Memory"
+        )
+        return result is not None, time.perf_counter() - started
+
+    with StubServer(profile) as server:
+        llm_service.client = OpenAI(
+            api_key="stub", base_url=server.base_url, max_retries=0
+        )
+        llm_service.llm_call_cache = None  # measure the calls, not the cache
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(structure, range(specs)))
+            elapsed = time.perf_counter() - started
+        finally:
+            llm_service.client, llm_service.llm_call_cache = original
+
+    summary = {
+        "specs": specs,
+        "workers": workers,
+        "throughput_sps": round(specs / elapsed, 2),
+        "structured": sum(ok for ok, _ in results),
+        "latency": _percentiles([latency for _, latency in results]),
+    }
+    print(f"structure_specification benchmark: {summary}")
+    return summary
+
+
+def run_benchmarks():
+    print("Benchmarking against the local stub LLM server (no network)...")
+    agent = benchmark_agent()
+    assert agent["llm_calls"] > 0
+    assert set(agent["nodes"]) == {
+        "analyze_query",
+        "execute_tools",
+        "synthesize_response",
+    }
+
+    chat = benchmark_chat_endpoint()
+    assert chat["statuses"] == {200: chat["requests"]}
+
+    structuring = benchmark_structure_specification()
+    assert structuring["structured"] == structuring["specs"]
+
+
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        run_benchmarks()
+        sys.exit(0)
+
     print("Testing LangGraph Agent...")
 
     # Test simple query first
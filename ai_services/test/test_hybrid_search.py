@@ -0,0 +1,190 @@
+# ai_services/test/test_hybrid_search.py
+"""BM25 + vector hybrid search tests and a labeled recall/latency benchmark.
+
+    python -m ai_services.test.test_hybrid_search
+    python -m ai_services.test.test_hybrid_search --benchmark [--filler 5000]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from backend.src.app.config.ai_config import AIConfig
+from ai_services.src.services.lexical_index import (
+    BM25Index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from ai_services.src.services.vector_service import VectorService
+
+# Reviews that answer exactly one labeled query each
+LABELED_DOCS = {
+    "review_tb": "Two Thunderbolt 4 ports let me run dual 4K monitors from one dock.",
+    "review_rj": "No RJ-45 jack, so I carry a USB ethernet dongle to the office.",
+    "review_cpu": "The i7-1355U stays cool but throttles in long Handbrake exports.",
+    "review_battery": "I get through a full workday on one charge, around ten hours.",
+    "review_keys": "Typing feels great, the keys have deep travel and a firm bottom.",
+    "review_screen": "The panel is dim outdoors; at 250 nits it washes out in sunlight.",
+    "review_fans": "Under load the fans get noisy enough to hear in a quiet library.",
+    "review_weight": "At 1.1 kg it disappears in my backpack on the commute.",
+    "review_hdmi": "The HDMI 2.1 port drives my 120Hz TV without adapters.",
+    "review_ram": "Upgraded from 16GB to 32GB of DDR5 myself, two SODIMM slots.",
+    "review_linux": "Ubuntu 24.04 runs out of the box, even Wi-Fi and suspend.",
+    "review_webcam": "The 1080p webcam is sharp enough for client calls.",
+}
+
+# (query, relevant id): exact terms first, then paraphrases
+LABELED_QUERIES = [
+    ("Thunderbolt", "review_tb"),
+    ("does it have an RJ45 ethernet port", "review_rj"),
+    ("i7-1355U performance", "review_cpu"),
+    ("DDR5 SODIMM", "review_ram"),
+    ("how long does the battery last", "review_battery"),
+    ("keyboard comfort for typing", "review_keys"),
+    ("is the screen bright enough outside", "review_screen"),
+    ("fan noise", "review_fans"),
+    ("lightweight for travel", "review_weight"),
+    ("can I connect a TV over HDMI", "review_hdmi"),
+    ("Linux compatibility", "review_linux"),
+    ("camera quality for video meetings", "review_webcam"),
+]
+EXACT_TERM_QUERIES = 4
+
+
+def _filler(count: int) -> List[Tuple[str, str, Dict]]:
+    uses = ["office work", "gaming", "college", "photo editing", "travel"]
+    aspects = ["the battery", "the screen", "the keyboard", "performance", "build"]
+    verdicts = ["is great", "is average", "could be better", "is a letdown"]
+    return [
+        (
+            f"review_filler_{i}",
+            f"Solid laptop for {uses[i % 5]}; {aspects[i % 5]} {verdicts[i % 4]}"
+            f" after {i % 24 + 1} months of use.",
+            {"laptop_id": i % 20 + 1, "rating": i % 5 + 1},
+        )
+        for i in range(count)
+    ]
+
+
+def _populate(service: VectorService, filler: int) -> VectorService:
+    records = [
+        (doc_id, text, {"laptop_id": 99, "rating": 4})
+        for doc_id, text in LABELED_DOCS.items()
+    ] + _filler(filler)
+    assert service._upsert_records(
+        service.reviews_collection, AIConfig.REVIEWS_COLLECTION, records
+    )
+    return service
+
+
+def test_tokenize_and_fusion():
+    terms = tokenize("Has an RJ-45 port and the i7-1355U")
+    assert {"rj-45", "rj45", "rj", "45", "port", "i7-1355u", "i71355u"} <= set(terms)
+    assert "the" not in terms and "an" not in terms
+    assert set(tokenize("RJ45")) & set(tokenize("RJ-45"))
+
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+    assert [doc_id for doc_id, _ in fused] == ["c", "a", "b", "d"]
+    assert abs(fused[0][1] - (1 / 63 + 1 / 61)) < 1e-12
+
+
+def test_bm25_index():
+    index = BM25Index()
+    index.upsert(
+        ["r1", "r2", "r3"],
+        [
+            "Thunderbolt 4 and USB-C charging",
+            "USB-C only, no Thunderbolt",
+            "Great speakers",
+        ],
+        [{"laptop_id": 1}, {"laptop_id": 2}, {"laptop_id": 1}],
+    )
+    assert [doc_id for doc_id, _ in index.search("thunderbolt 4", 5)] == ["r1", "r2"]
+    assert [doc_id for doc_id, _ in index.search("usbc", 5, laptop_id=2)] == ["r2"]
+
+    index.upsert(["r1"], ["Loud fans"], [{"laptop_id": 1}])  # replaced, not added
+    index.delete(["r2"])
+    assert len(index) == 2
+    assert index.search("thunderbolt", 5) == []
+    assert index.search("fans", 5)[0][0] == "r1"
+
+
+def test_hybrid_finds_exact_terms(make_vector_service):
+    service = _populate(make_vector_service(), filler=200)
+    for query, relevant in LABELED_QUERIES[:EXACT_TERM_QUERIES]:
+        results = service._query_collection(
+            service.reviews_collection, query, None, 5, mode="hybrid"
+        )
+        print(f"{query!r}: {[r['id'] for r in results]}")
+        assert relevant in [r["id"] for r in results]
+        assert len(results) == 5 and all("score" in r for r in results)
+        assert all(0 <= r["distance"] <= 2 for r in results)
+
+    # Filters apply to both rankers
+    results = service._query_collection(
+        service.reviews_collection, "Thunderbolt", 3, 5, mode="hybrid"
+    )
+    assert results and all(r["metadata"]["laptop_id"] == 3 for r in results)
+
+    # Deleted documents leave the lexical index too
+    service._delete_ids(service.reviews_collection, ["review_tb"])
+    results = service._query_collection(
+        service.reviews_collection, "Thunderbolt", None, 5, mode="hybrid"
+    )
+    assert "review_tb" not in [r["id"] for r in results]
+
+
+def benchmark_hybrid(filler: int = 2000, limit: int = 5) -> Dict[str, Dict]:
+    """recall@limit and per-query latency of vector and hybrid search over
+    the labeled queries, with `filler` unrelated reviews in the index"""
+    with tempfile.TemporaryDirectory() as directory:
+        service = _populate(VectorService(persist_directory=directory), filler)
+        return _measure(service, limit)
+
+
+def _measure(service: VectorService, limit: int) -> Dict[str, Dict]:
+    collection = service.reviews_collection
+    for query, _ in LABELED_QUERIES:  # warm query embeddings and BM25
+        service._query_collection(collection, query, None, limit, mode="hybrid")
+
+    results = {}
+    for mode in ("vector", "hybrid"):
+        found, latencies = [], []
+        for query, relevant in LABELED_QUERIES:
+            started = time.perf_counter()
+            hits = service._query_collection(collection, query, None, limit, mode)
+            latencies.append(time.perf_counter() - started)
+            found.append(relevant in [hit["id"] for hit in hits])
+        latencies.sort()
+        results[mode] = {
+            "recall": sum(found) / len(found),
+            "exact_term_recall": sum(found[:EXACT_TERM_QUERIES]) / EXACT_TERM_QUERIES,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        }
+        stats = results[mode]
+        print(
+            f"{mode:>7}: recall@{limit} {stats['recall']:.2f}"
+            f" (exact terms {stats['exact_term_recall']:.2f}),"
+            f" p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--filler", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(
+            f"{len(LABELED_QUERIES)} labeled queries over"
+            f" {len(LABELED_DOCS) + args.filler} reviews"
+        )
+        benchmark_hybrid(args.filler)
+    else:
+        raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,289 @@
+# ai_services/test/test_incremental_indexing.py
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.db import Base
+from backend.src.app.models.laptop import Laptop
+from backend.src.app.models.review import Review
+from backend.src.app.models.questions_answer import QuestionsAnswer
+from backend.src.app.models.vector_index_state import VectorIndexState
+from backend.src.app.services.embedding_cache import EmbeddingCache
+from ai_services.src.services import vector_service as vector_service_module
+from ai_services.src.services.vector_service import VectorService
+
+
+class CountingVectorService(VectorService):
+    """Counts embedded documents so tests can see what was re-embedded,
+    and can fail after a number of embedding batches"""
+
+    embedded = 0
+    largest_batch = 0
+    fail_after_batches = None
+    scans = 0
+
+    def _delete_stale(self, db, model, collection):
+        self.scans += 1
+        return super()._delete_stale(db, model, collection)
+
+    def _generate_embeddings(self, texts, bulk=False):
+        if self.fail_after_batches is not None:
+            if self.fail_after_batches == 0:
+                return []
+            self.fail_after_batches -= 1
+        self.embedded += len(texts)
+        self.largest_batch = max(self.largest_batch, len(texts))
+        return super()._generate_embeddings(texts, bulk)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Laptop.__table__,
+            Review.__table__,
+            QuestionsAnswer.__table__,
+            VectorIndexState.__table__,
+        ],
+    )
+    return sessionmaker(bind=engine)()
+
+
+def _review(db, laptop, text, scraped_at, title="Review"):
+    review = Review(laptop_id=laptop.id, review_title=title, review_text=text, rating=4)
+    review.scraped_at = scraped_at
+    db.add(review)
+    db.commit()
+    return review
+
+
+def test_sync_embeds_only_changes(make_vector_service):
+    db = _session()
+    service = make_vector_service(CountingVectorService)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    laptop = Laptop(
+        brand="HP",
+        model_name="ProBook 450",
+        full_model_name="HP ProBook 450 G10",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    laptop.updated_at = now
+    db.add(laptop)
+    db.commit()
+    reviews = [_review(db, laptop, f"Battery lasts {i} hours", now) for i in range(5)]
+    db.add(QuestionsAnswer(laptop_id=laptop.id, question_text="Has it USB-C?"))
+    db.commit()
+
+    first = service.sync_index(db)
+    assert first[AIConfig.REVIEWS_COLLECTION] == {
+        "upserted": 5,
+        "deleted": 0,
+        "indexed": 5,
+    }
+    assert first[AIConfig.QA_COLLECTION]["indexed"] == 1
+    assert service.embedded == 6
+
+    # Nothing changed: nothing is embedded again, and nothing is scanned
+    service.embedded = 0
+    service.scans = 0
+    again = service.sync_index(db)
+    assert again[AIConfig.REVIEWS_COLLECTION]["upserted"] == 0
+    assert service.embedded == 0
+    assert service.scans == 0
+
+    # One new row, one edited row, one deleted row
+    _review(db, laptop, "Fans are loud", now + timedelta(hours=1))
+    reviews[0].review_text = "Battery lasts 12 hours after the update"
+    reviews[0].scraped_at = now + timedelta(hours=1)
+    db.delete(reviews[1])
+    db.commit()
+
+    result = service.sync_collection(db, AIConfig.REVIEWS_COLLECTION)
+    print(f"Incremental sync: {result}")
+    assert result == {"upserted": 2, "deleted": 1, "indexed": 5}
+    assert service.embedded == 2
+    assert service.scans == 1  # the deleted row made the counts disagree
+    document = service.reviews_collection.get(ids=[f"review_{reviews[0].id}"])
+    assert "12 hours" in document["documents"][0]
+
+    state = db.get(VectorIndexState, AIConfig.REVIEWS_COLLECTION)
+    assert state.last_id == max(review.id for review in db.query(Review))
+    assert state.indexed_count == 5
+
+    # A full re-index upserts: re-running never duplicates
+    assert service.index_reviews(db) and service.index_reviews(db)
+    assert service.reviews_collection.count() == 5
+
+
+def test_missing_vectors_are_backfilled(make_vector_service):
+    db = _session()
+    service = make_vector_service(CountingVectorService)
+    laptop = Laptop(
+        brand="Lenovo",
+        model_name="E14",
+        full_model_name="ThinkPad E14",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    db.add(laptop)
+    db.commit()
+    reviews = [
+        _review(db, laptop, f"Keyboard review {i}", datetime.now(timezone.utc))
+        for i in range(3)
+    ]
+    service.sync_collection(db, AIConfig.REVIEWS_COLLECTION)
+
+    # A vector lost outside the sync (e.g. a failed change notification)
+    service.reviews_collection.delete(ids=[f"review_{reviews[2].id}"])
+    result = service.sync_collection(db, AIConfig.REVIEWS_COLLECTION)
+    assert result["upserted"] == 1
+    assert service.reviews_collection.count() == 3
+
+
+def test_interrupted_sync_resumes(make_vector_service):
+    db = _session()
+    service = make_vector_service(CountingVectorService)
+    laptop = Laptop(
+        brand="Dell",
+        model_name="Latitude 5440",
+        full_model_name="Dell Latitude 5440",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    db.add(laptop)
+    db.commit()
+    for i in range(7):
+        _review(db, laptop, f"Display review {i}", datetime.now(timezone.utc))
+
+    original_batch_size = AIConfig.VECTOR_INDEX_BATCH_SIZE
+    AIConfig.VECTOR_INDEX_BATCH_SIZE = 2
+    try:
+        # The embedding model fails on the third batch
+        service.fail_after_batches = 2
+        assert service.sync_collection(db, AIConfig.REVIEWS_COLLECTION) is None
+        state = db.get(VectorIndexState, AIConfig.REVIEWS_COLLECTION)
+        db.refresh(state)
+        assert state.checkpoint_id is not None and state.checkpoint_full
+        assert service.reviews_collection.count() == 4
+
+        # The next run picks up after the checkpoint
+        service.fail_after_batches = None
+        service.embedded = 0
+        result = service.sync_collection(db, AIConfig.REVIEWS_COLLECTION)
+        print(f"Resumed sync: {result}, progress {service.sync_progress}")
+        assert result["upserted"] == 3 and result["indexed"] == 7
+        assert service.embedded == 3
+        assert service.largest_batch == 2  # writes stay bounded by the batch size
+        db.refresh(state)
+        assert state.checkpoint_id is None
+    finally:
+        AIConfig.VECTOR_INDEX_BATCH_SIZE = original_batch_size
+
+
+def test_reindex_uses_embedding_cache(make_vector_service, tmp_path):
+    db = _session()
+    service = make_vector_service()
+    model_calls = []
+    embed_texts = service._embed_texts
+    service._embed_texts = lambda texts, bulk: model_calls.append(len(texts)) or (
+        embed_texts(texts, bulk)
+    )
+
+    laptop = Laptop(
+        brand="HP",
+        model_name="EliteBook 840",
+        full_model_name="HP EliteBook 840 G10",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    db.add(laptop)
+    db.commit()
+    # Scraped reviews carry no title, only a variant label
+    for variant in ("16GB RAM", "32GB RAM"):
+        for i in range(3):
+            text = f"[{variant}] Speakers {i}"
+            _review(db, laptop, text, datetime.now(timezone.utc), title=None)
+
+    original_cache = vector_service_module.embedding_cache
+    vector_service_module.embedding_cache = EmbeddingCache(
+        path=tmp_path / "embedding_cache.sqlite3"
+    )
+    try:
+        assert service.index_reviews(db)
+        # The same review under two variants is embedded once
+        assert model_calls == [3]
+
+        assert service.index_reviews(db)
+        assert model_calls == [3]  # a full re-index is all cache hits
+        stats = vector_service_module.embedding_cache.stats()
+        print(f"Embedding cache after re-index: {stats}")
+        assert stats["hits"] == 6 and stats["entries"] == 3
+        assert service.reviews_collection.count() == 6
+    finally:
+        vector_service_module.embedding_cache = original_cache
+
+
+def test_writers_share_one_lock(make_vector_service, tmp_path):
+    """Services writing one persist directory (one per process in
+    production) take turns through the lock file"""
+    first = make_vector_service(persist_directory=tmp_path)
+    second = make_vector_service(persist_directory=tmp_path)
+    order = []
+
+    def write():
+        with second._write_lock():
+            order.append("second")
+
+    with first._write_lock():
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.2)
+        order.append("first")
+    writer.join(timeout=5)
+    assert order == ["first", "second"]
+    assert (tmp_path / "write.lock").exists()
+
+
+def test_change_deltas_query_once_and_roll_back(make_vector_service):
+    db = _session()
+    service = make_vector_service()
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    laptop = Laptop(
+        brand="HP",
+        model_name="EliteBook 840",
+        full_model_name="HP EliteBook 840 G10",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    db.add(laptop)
+    db.commit()
+    reviews = [_review(db, laptop, f"Keyboard review {i}", now) for i in range(5)]
+    changes = [{"table": "reviews", "op": "INSERT", "id": r.id} for r in reviews]
+    db.expire_all()
+
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    service.apply_changes(db, changes)
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    # Laptops are loaded with their rows, not once per row
+    assert len(selects) == 1, selects
+    assert service.reviews_collection.count() == 5
+
+    # A failed batch leaves no transaction open on the listener's session
+    def failing_upsert(collection, collection_name, records):
+        raise RuntimeError("chroma unavailable")
+
+    service._upsert_records = failing_upsert
+    assert not service.sync_reviews(db, [reviews[0].id])
+    assert not db.in_transaction()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
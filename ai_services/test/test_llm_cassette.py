@@ -0,0 +1,80 @@
+# ai_services/test/test_llm_cassette.py
+import asyncio
+
+import openai
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+from backend.src.app.services.llm_cassette import (
+    Cassette,
+    RECORD,
+    REPLAY,
+    http_clients,
+)
+from scripts.stub_llm_server import StubProfile, StubServer
+
+
+def _clients(cassette: Cassette, base_url: str):
+    http_client, http_async_client = http_clients(cassette)
+    sdk = OpenAI(
+        api_key="stub", base_url=base_url, http_client=http_client, max_retries=0
+    )
+    chat = ChatOpenAI(
+        model="gpt-4",
+        api_key="stub",
+        base_url=base_url,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        max_retries=0,
+    )
+    return sdk, chat
+
+
+def _calls(sdk: OpenAI, chat: ChatOpenAI):
+    completion = sdk.chat.completions.create(
+        model="gpt-4-turbo-preview",
+        messages=[{"role": "user", "content": "Parse: 16GB DDR5"}],
+        response_format={"type": "json_object"},
+    )
+    answer = asyncio.run(chat.ainvoke([HumanMessage(content="Best laptop?")]))
+    streamed = "".join(
+        chunk.content for chunk in chat.stream([HumanMessage(content="And battery?")])
+    )
+    return completion.choices[0].message.content, answer.content, streamed
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+
+    with StubServer(StubProfile(ttft_median=0.05, tokens_per_second=500)) as server:
+        base_url = server.base_url
+        recorded = _calls(*_clients(Cassette(path, RECORD), base_url))
+        assert server.requests == 3
+
+    # The server is gone; every response comes from the cassette
+    replay = Cassette(path, REPLAY)
+    replayed = _calls(*_clients(replay, base_url))
+    print(f"Cassette: {replay.stats()}")
+
+    assert replayed == recorded
+    assert replay.stats()["hits"] == 3 and replay.stats()["misses"] == 0
+
+
+def test_replay_miss_fails_fast(tmp_path):
+    replay = Cassette(tmp_path / "empty.jsonl", REPLAY)
+    sdk, _ = _clients(replay, "http://127.0.0.1:9/v1")
+
+    try:
+        sdk.chat.completions.create(
+            model="gpt-4", messages=[{"role": "user", "content": "unrecorded"}]
+        )
+        raise AssertionError("unrecorded request must not succeed")
+    except openai.NotFoundError as e:
+        assert "cassette_miss" in str(e)
+    assert replay.stats()["misses"] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
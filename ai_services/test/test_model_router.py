@@ -0,0 +1,159 @@
+# ai_services/test/test_model_router.py
+import asyncio
+import time
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from backend.src.app.core.admission import AsyncAdmissionController
+from ai_services.src.services.langgraph_agent import LaptopAgent
+from ai_services.src.services.model_router import (
+    ModelMetrics,
+    ModelRouter,
+    ANALYSIS_STEP,
+    SYNTHESIS_STEP,
+)
+from ai_services.test.test_async_agent import StubChatModel
+
+
+class NamedStubModel(StubChatModel):
+    """Stub that reports its name and token usage, and can be made to fail"""
+
+    name: str = "stub"
+    fail: bool = False
+    calls: int = 0
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        result = super()._reply(messages)
+        message = result.generations[0].message
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(
+                        content=f"{message.content} ({self.name})",
+                        usage_metadata={
+                            "input_tokens": 100,
+                            "output_tokens": 20,
+                            "total_tokens": 120,
+                        },
+                    )
+                )
+            ]
+        )
+
+
+def _router(primary, fast, slo_seconds=0.5, metrics=None):
+    return ModelRouter(
+        primary,
+        fast,
+        primary_name=primary.name,
+        fast_name=fast.name,
+        admission=AsyncAdmissionController(
+            max_concurrent=8, max_queue=8, queue_timeout=5
+        ),
+        metrics=metrics or ModelMetrics(),
+        slo_seconds=slo_seconds,
+        hedge=True,
+        fast_intents=["budget_search"],
+    )
+
+
+def test_steps_and_intents_pick_models():
+    primary = NamedStubModel(name="gpt-4", latency=0.01)
+    fast = NamedStubModel(name="gpt-3.5-turbo", latency=0.01)
+    router = _router(primary, fast)
+    ask = [HumanMessage(content="Which laptop?")]
+
+    async def scenario():
+        analysis = await router.ainvoke(ask, step=ANALYSIS_STEP)
+        simple = await router.ainvoke(ask, step=SYNTHESIS_STEP, intent="budget_search")
+        complex_ = await router.ainvoke(
+            ask, step=SYNTHESIS_STEP, intent="experience_question"
+        )
+        return analysis, simple, complex_
+
+    analysis, simple, complex_ = asyncio.run(scenario())
+    assert analysis.content.endswith("(gpt-3.5-turbo)")
+    assert simple.content.endswith("(gpt-3.5-turbo)")
+    assert complex_.content.endswith("(gpt-4)")
+
+    stats = router.metrics.stats()
+    assert stats["gpt-3.5-turbo"]["calls"] == 2
+    assert stats["gpt-4"]["input_tokens"] == 100
+    assert stats["gpt-4"]["output_tokens"] == 20
+
+
+def test_slow_primary_is_hedged():
+    primary = NamedStubModel(name="gpt-4", latency=2.0)
+    fast = NamedStubModel(name="gpt-3.5-turbo", latency=0.05)
+    router = _router(primary, fast, slo_seconds=0.2)
+
+    started = time.perf_counter()
+    response = asyncio.run(router.ainvoke([HumanMessage(content="Compare these")]))
+    elapsed = time.perf_counter() - started
+    print(f"Hedged answer in {elapsed:.2f}s: {router.metrics.stats()}")
+
+    assert response.content.endswith("(gpt-3.5-turbo)")
+    assert elapsed < 0.5
+    assert router.metrics.stats()["gpt-4"]["hedges"] == 1
+    assert router.admission.active == 0  # the slow call was cancelled
+
+
+def test_errors_fail_over():
+    primary = NamedStubModel(name="gpt-4", latency=0.01, fail=True)
+    fast = NamedStubModel(name="gpt-3.5-turbo", latency=0.01)
+    router = _router(primary, fast)
+
+    async def stream():
+        return [
+            chunk.content
+            async for chunk in router.astream([HumanMessage(content="Compare these")])
+        ]
+
+    response = asyncio.run(router.ainvoke([HumanMessage(content="Compare these")]))
+    assert response.content.endswith("(gpt-3.5-turbo)")
+    assert "gpt-3.5-turbo" in "".join(asyncio.run(stream()))
+    assert router.metrics.stats()["gpt-4"]["failovers"] == 2
+
+
+def test_agent_uses_fast_model_for_analysis():
+    primary = NamedStubModel(name="gpt-4", latency=0.01)
+    fast = NamedStubModel(name="gpt-3.5-turbo", latency=0.01)
+    agent = LaptopAgent(llm=primary, fast_llm=fast, session_factory=lambda: None)
+    agent.toolkit.router = None  # force the LLM analysis step
+
+    response = asyncio.run(agent.aprocess_query("Laptops under $1000", None))
+    # budget_search is a simple intent, so both calls go to the fast model
+    assert fast.calls == 2 and primary.calls == 0
+    assert response.endswith("(gpt-3.5-turbo)")
+
+
+def test_only_deterministic_calls_are_cached():
+    from backend.src.app.config.ai_config import AIConfig
+    from ai_services.src.services import langgraph_agent
+
+    original_cache = langgraph_agent.llm_call_cache
+    langgraph_agent.llm_call_cache = object()  # any store enables caching
+    try:
+        agent = LaptopAgent(session_factory=lambda: None)
+    finally:
+        langgraph_agent.llm_call_cache = original_cache
+
+    assert AIConfig.TEMPERATURE > 0
+    # Sampled synthesis is never replayed; temperature-0 analysis is
+    assert all(llm.cache is None for _, llm in agent.models.candidates("synthesis"))
+    analysis = agent.analysis_models.candidates("analysis")
+    assert all(llm.temperature == 0 and llm.cache for _, llm in analysis)
+
+
+if __name__ == "__main__":
+    test_steps_and_intents_pick_models()
+    test_slow_primary_is_hedged()
+    test_errors_fail_over()
+    test_agent_uses_fast_model_for_analysis()
+    test_only_deterministic_calls_are_cached()
+    print("Model router tests passed!")
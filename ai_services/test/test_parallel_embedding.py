@@ -0,0 +1,118 @@
+# ai_services/test/test_parallel_embedding.py
+"""Parallel embedding pool tests and a docs/sec benchmark.
+
+    python -m ai_services.test.test_parallel_embedding
+    python -m ai_services.test.test_parallel_embedding --benchmark [--docs 5000]
+
+Only the embedding pool is imported at module level: worker processes
+import this module to unpickle the test model factory.
+"""
+import argparse
+import hashlib
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from ai_services.src.services.embedding_pool import (
+    EmbeddingPool,
+    cpu_count,
+    load_text_embedding,
+)
+from backend.src.app.config.ai_config import AIConfig
+
+
+class HashEmbedding:
+    """Deterministic stand-in for TextEmbedding, usable in worker processes"""
+
+    def __init__(self, model_name: str = None, threads: int = None):
+        self.model_name = model_name
+
+    def embed(self, texts: List[str], batch_size: int = 256):
+        for text in texts:
+            seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+            vector = np.random.default_rng(seed).standard_normal(
+                AIConfig.EMBEDDING_DIMENSION
+            )
+            yield (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+def hash_embedding(model_name: str, threads: int) -> HashEmbedding:
+    return HashEmbedding(model_name, threads)
+
+
+def _reviews(count: int) -> List[str]:
+    subjects = ["Battery life", "The keyboard", "Thermals", "The display", "Build"]
+    verdicts = ["is excellent", "is fine for work", "could be better", "surprised me"]
+    return [
+        f"{subjects[i % len(subjects)]} {verdicts[i % len(verdicts)]} "
+        f"after {i % 30 + 1} days of coding, browsing and video calls (#{i})."
+        for i in range(count)
+    ]
+
+
+def test_pool_matches_in_process():
+    texts = _reviews(101)
+    expected = np.asarray(list(HashEmbedding().embed(texts)))
+
+    pool = EmbeddingPool(workers=3, threads=1, factory=hash_embedding)
+    try:
+        assert pool.enabled
+        vectors = pool.embed(texts)
+        again = pool.embed(texts[:5])  # workers are reused
+    finally:
+        pool.shutdown()
+
+    assert vectors.shape == (101, AIConfig.EMBEDDING_DIMENSION)
+    assert vectors.dtype == np.float32
+    assert np.array_equal(vectors, expected)  # input order is kept
+    assert np.array_equal(again, expected[:5])
+    assert pool._executor is None
+    assert not EmbeddingPool(workers=1).enabled
+
+
+def benchmark_embedding(docs: int = 2000) -> Dict[int, float]:
+    """docs/sec of the real model in-process and with 1..cores workers"""
+    texts = _reviews(docs)
+    cores = cpu_count()
+    results = {}
+
+    model = load_text_embedding(AIConfig.EMBEDDING_MODEL, None)
+    list(model.embed(texts[:32]))  # warm up
+    started = time.perf_counter()
+    list(model.embed(texts, batch_size=AIConfig.EMBEDDING_BATCH_SIZE))
+    single = docs / (time.perf_counter() - started)
+    print(f"{'in-process':>12}: {single:8.1f} docs/s")
+
+    workers = 1
+    while workers <= cores:
+        pool = EmbeddingPool(workers=workers, threads=max(1, cores // workers))
+        try:
+            pool.embed(texts[: workers * 8])  # start workers and load models
+            started = time.perf_counter()
+            pool.embed(texts)
+            results[workers] = docs / (time.perf_counter() - started)
+        finally:
+            pool.shutdown()
+        print(
+            f"{workers:3d} x {pool.threads:2d} thr: {results[workers]:8.1f} docs/s"
+            f" ({results[workers] / single:.2f}x)"
+        )
+        workers *= 2
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--docs", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"Embedding {args.docs} reviews with {AIConfig.EMBEDDING_MODEL}")
+        print(f"on {cpu_count()} cores")
+        benchmark_embedding(args.docs)
+    else:
+        test_pool_matches_in_process()
+        print("Parallel embedding tests passed!")
@@ -0,0 +1,131 @@
+# ai_services/test/test_query_embedding_cache.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.cache import cache
+from backend.src.app.services.embedding_cache import EmbeddingCache
+from ai_services.src.services import vector_service as vector_service_module
+from ai_services.src.services.query_embedding_cache import (
+    QueryEmbeddingCache,
+    query_embedding_cache,
+)
+
+
+def _unit_vector(text: str) -> np.ndarray:
+    vector = np.random.default_rng(len(text)).standard_normal(8).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_lru_and_hit_rate():
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return _unit_vector(text)
+
+    lru = QueryEmbeddingCache(max_entries=2)
+    first = lru.get_or_embed("Best laptop  for coding", embed)
+    again = lru.get_or_embed(" Best laptop for\ncoding ", embed)
+    assert calls == ["Best laptop for coding"]  # keyed by normalized text
+    assert again is first and not first.flags.writeable
+
+    lru.get_or_embed("quiet fans", embed)
+    lru.get_or_embed("Best laptop for coding", embed)  # now most recent
+    lru.get_or_embed("long battery", embed)  # evicts "quiet fans"
+    lru.get_or_embed("quiet fans", embed)
+    assert calls[-1] == "quiet fans" and len(calls) == 4
+
+    stats = lru.stats()
+    print(f"Query embedding LRU: {stats}")
+    assert stats["hits"] == 2 and stats["misses"] == 4
+    assert stats["entries"] == 2 and stats["hit_rate"] == 2 / 6
+
+
+def test_concurrent_callers_embed_once():
+    calls = []
+    started = threading.Event()
+
+    def slow_embed(text):
+        calls.append(text)
+        started.set()
+        time.sleep(0.2)
+        return _unit_vector(text)
+
+    lru = QueryEmbeddingCache()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(lru.get_or_embed("oled", slow_embed))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["oled"]
+    assert all(result is results[0] for result in results)
+
+    # A failure reaches every waiter and is not cached
+    def failing_embed(text):
+        raise ValueError("model unavailable")
+
+    for _ in range(2):
+        try:
+            lru.get_or_embed("thermals", failing_embed)
+            assert False, "expected the embedding error"
+        except ValueError:
+            pass
+    assert lru.stats()["entries"] == 1
+
+
+def test_review_and_qa_search_share_one_embedding(make_vector_service):
+    service = make_vector_service()
+    model_calls = []
+    embed_texts = service._embed_texts
+    service._embed_texts = lambda texts, bulk: model_calls.append(list(texts)) or (
+        embed_texts(texts, bulk)
+    )
+
+    original_cache = vector_service_module.embedding_cache
+    vector_service_module.embedding_cache = None  # only the query LRU
+    query_embedding_cache.clear()
+    cache.clear()
+    try:
+        query = "Does it have Thunderbolt 4?"
+        service.search_reviews(query)
+        service.search_qa(query)
+        service.search_reviews(query, laptop_id=3)
+        assert model_calls == [[query]]
+    finally:
+        vector_service_module.embedding_cache = original_cache
+
+    stats = query_embedding_cache.stats()
+    print(f"Query embeddings after review + Q&A search: {stats}")
+    assert stats["hits"] >= 2
+    assert stats["max_entries"] == AIConfig.QUERY_EMBEDDING_CACHE_SIZE
+
+
+def test_queries_stay_out_of_the_disk_cache(make_vector_service, tmp_path):
+    disk_cache = EmbeddingCache(path=tmp_path / "embedding_cache.sqlite3")
+    service = make_vector_service()
+    original_cache = vector_service_module.embedding_cache
+    vector_service_module.embedding_cache = disk_cache
+    query_embedding_cache.clear()
+    try:
+        service.embed_query("which laptop has the best keyboard?")
+        assert disk_cache.stats()["entries"] == 0
+
+        # Documents are still cached on disk
+        service._generate_embeddings(["Great keyboard"], bulk=True)
+        assert disk_cache.stats()["entries"] == 1
+    finally:
+        vector_service_module.embedding_cache = original_cache
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,173 @@
+# ai_services/test/test_query_router.py
+from ai_services.src.services.query_router import (
+    QueryRouter,
+    extract_price_range,
+    extract_spec_filters,
+)
+
+CATALOG = [
+    {
+        "id": 1,
+        "brand": "Lenovo",
+        "model_name": "ThinkPad E14 Gen 5",
+        "variant": "Intel",
+        "full_model_name": "ThinkPad E14 Gen 5 (Intel)",
+    },
+    {
+        "id": 2,
+        "brand": "Lenovo",
+        "model_name": "ThinkPad E14 Gen 5",
+        "variant": "AMD",
+        "full_model_name": "ThinkPad E14 Gen 5 (AMD)",
+    },
+    {
+        "id": 3,
+        "brand": "HP",
+        "model_name": "ProBook 450",
+        "variant": "G10",
+        "full_model_name": "HP ProBook 450 G10",
+    },
+    {
+        "id": 4,
+        "brand": "HP",
+        "model_name": "ProBook 440",
+        "variant": "G11",
+        "full_model_name": "HP ProBook 440 G11",
+    },
+]
+
+# (query, expected tool -> expected params subset); None means "ask the LLM"
+LABELED_QUERIES = [
+    ("laptops under $800", {"search_laptops_by_budget": {"max_price": 800}}),
+    (
+        "Show me laptops below 900 dollars",
+        {"search_laptops_by_budget": {"max_price": 900}},
+    ),
+    (
+        "anything between $700 and $1,200?",
+        {"search_laptops_by_budget": {"min_price": 700, "max_price": 1200}},
+    ),
+    ("my budget is 1.5k", {"search_laptops_by_budget": {"max_price": 1500}}),
+    ("laptops over $1000", {"search_laptops_by_budget": {"min_price": 1000}}),
+    (
+        "something around $1000",
+        {"search_laptops_by_budget": {"min_price": 850, "max_price": 1150}},
+    ),
+    (
+        "Intel i7 with 16GB RAM",
+        {
+            "search_laptops_by_specs": {
+                "spec_filters": {"Processor": "i7", "Memory": "16GB"}
+            }
+        },
+    ),
+    (
+        "laptops with 512GB SSD",
+        {"search_laptops_by_specs": {"spec_filters": {"Storage": "512GB"}}},
+    ),
+    (
+        "Ryzen 7 laptop under $1000",
+        {
+            "search_laptops_by_budget": {"max_price": 1000},
+            "search_laptops_by_specs": {"spec_filters": {"Processor": "Ryzen 7"}},
+        },
+    ),
+    ("tell me about laptop ID 1", {"get_laptop_summary": {"laptop_id": 1}}),
+    ("details for id 3", {"get_laptop_summary": {"laptop_id": 3}}),
+    ("Tell me about the HP ProBook 450 G10", {"get_laptop_summary": {"laptop_id": 3}}),
+    ("ProBook 440 specs", {"get_laptop_summary": {"laptop_id": 4}}),
+    (
+        "What do reviews say about the ProBook 450?",
+        {"search_reviews": {"laptop_id": 3}},
+    ),
+    ("ThinkPad E14 Gen 5 AMD user reviews", {"search_reviews": {"laptop_id": 2}}),
+    (
+        "How do I upgrade the memory on the ProBook 440?",
+        {"search_qa": {"laptop_id": 4}},
+    ),
+    ("battery life reviews", {"search_reviews": {}}),
+    ("what do users say about the keyboard", {"search_reviews": {}}),
+    ("how to upgrade memory", {"search_qa": {}}),
+    ("can I install a second SSD", {"search_qa": {}}),
+    # Ambiguous, comparative or open-ended: should go to the LLM
+    ("Compare the ProBook 450 and ProBook 440", None),
+    ("Is the ThinkPad E14 good?", None),
+    ("ProBook 450 vs ThinkPad E14 battery", None),
+    ("I need a laptop for college", None),
+    ("which laptop is best for programming", None),
+    ("does the thinkpad e14 have good reviews and can I upgrade the RAM", None),
+]
+
+
+def _matches(analysis, expected) -> bool:
+    if expected is None:
+        return analysis is None
+    if analysis is None or set(analysis["tools_needed"]) != set(expected):
+        return False
+    for tool, params in expected.items():
+        actual = analysis["tool_params"][tool]
+        if any(actual.get(key) != value for key, value in params.items()):
+            return False
+    return True
+
+
+def evaluate(router: QueryRouter) -> dict:
+    """Hit rate (share answered locally) and accuracy on the labeled set"""
+    routed = correct_routed = correct = 0
+    for query, expected in LABELED_QUERIES:
+        analysis = router.route(query)
+        ok = _matches(analysis, expected)
+        correct += ok
+        if analysis is not None:
+            routed += 1
+            correct_routed += ok
+        if not ok:
+            print(f"  MISS {query!r}: {analysis}")
+
+    total = len(LABELED_QUERIES)
+    return {
+        "queries": total,
+        "hit_rate": routed / total,
+        "routed_precision": correct_routed / routed if routed else 0.0,
+        "accuracy": correct / total,
+    }
+
+
+def test_price_and_spec_extraction():
+    assert extract_price_range("under $1,299.99") == (0, 1299.99)
+    assert extract_price_range("between 800 and 1200 dollars") == (800, 1200)
+    assert extract_price_range("16GB RAM under 2TB") is None
+    assert extract_price_range("14 inch laptops") is None
+    assert extract_spec_filters("core i5, 8 GB of memory, RTX 4060") == {
+        "Processor": "i5",
+        "Memory": "8GB",
+        "Graphics": "RTX 4060",
+    }
+
+
+def test_router_on_labeled_queries():
+    router = QueryRouter(embed_fn=None, catalog_loader=lambda: CATALOG)
+    report = evaluate(router)
+    print(f"Rules only: {report}")
+
+    assert report["routed_precision"] == 1.0, "a wrong local route costs a bad answer"
+    assert report["hit_rate"] >= 0.7
+
+
+def test_router_with_embeddings():
+    """Same set with the embedding classifier (needs the FastEmbed model)"""
+    from ai_services.src.services.vector_service import vector_service
+
+    router = QueryRouter(
+        embed_fn=vector_service.embed_query, catalog_loader=lambda: CATALOG
+    )
+    report = evaluate(router)
+    print(f"Rules + embeddings: {report}, stats {router.stats()}")
+    assert report["routed_precision"] >= 0.95
+
+
+if __name__ == "__main__":
+    test_price_and_spec_extraction()
+    test_router_on_labeled_queries()
+    test_router_with_embeddings()
+    print("Query router tests passed!")
@@ -0,0 +1,98 @@
+# ai_services/test/test_search_all.py
+import pytest
+
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.cache import cache
+from ai_services.src.services.query_embedding_cache import query_embedding_cache
+from ai_services.src.services.vector_service import VectorService
+from ai_services.test.test_stream_endpoints import _post
+
+
+def _populate(service: VectorService) -> VectorService:
+    reviews = [
+        ("review_1", "Thunderbolt dock drives two monitors", {"laptop_id": 1}),
+        ("review_2", "Battery easily lasts a workday", {"laptop_id": 1}),
+        ("review_3", "Keyboard is mushy", {"laptop_id": 2}),
+    ]
+    qa = [
+        ("qa_1", "Q: Does it support Thunderbolt docks? A: Yes, TB4", {"laptop_id": 1}),
+        ("qa_2", "Q: Is the RAM upgradeable? A: No, soldered", {"laptop_id": 2}),
+    ]
+    assert service._upsert_records(
+        service.reviews_collection, AIConfig.REVIEWS_COLLECTION, reviews
+    )
+    assert service._upsert_records(service.qa_collection, AIConfig.QA_COLLECTION, qa)
+    return service
+
+
+def test_search_all_embeds_once_and_merges(make_vector_service):
+    service = _populate(make_vector_service())
+    embedded = []
+    embed_query_uncached = service._embed_query_uncached
+    service._embed_query_uncached = lambda text: embedded.append(text) or (
+        embed_query_uncached(text)
+    )
+    query_embedding_cache.clear()
+    cache.clear()
+
+    results = service.search_all("Thunderbolt dock", limit=4)
+    print(
+        f"search_all: {[(r['source'], r['id'], round(r['score'], 3)) for r in results]}"
+    )
+    assert embedded == ["Thunderbolt dock"]  # one embedding for both collections
+    assert len(results) == 4
+    assert {r["source"] for r in results} == {"review", "qa"}
+    assert {r["collection"] for r in results} == {
+        AIConfig.REVIEWS_COLLECTION,
+        AIConfig.QA_COLLECTION,
+    }
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 <= score <= 1 for score in scores)
+    assert {"review_1", "qa_1"} <= {r["id"] for r in results}
+
+    # Source and laptop filters
+    qa_only = service.search_all("Thunderbolt dock", sources=["qa"], laptop_id=1)
+    assert [r["id"] for r in qa_only] == ["qa_1"]
+    vector_only = service.search_all("Thunderbolt dock", limit=2, mode="vector")
+    assert len(vector_only) == 2
+    assert all(r["score"] == max(0.0, 1 - r["distance"]) for r in vector_only)
+
+
+def test_search_endpoint_validation_and_errors(make_vector_service):
+    from ai_services.src import main
+
+    for payload in [
+        {"query": "dock", "limit": 0},
+        {"query": "dock", "limit": 51},
+        {"query": "dock", "sources": ["specs"]},
+    ]:
+        assert _post("/ai/search", payload).status_code == 422, payload
+
+    service = _populate(make_vector_service())
+    original_service = main.vector_service
+    main.vector_service = service
+    try:
+        response = _post("/ai/search", {"query": "dock", "sources": ["qa"], "limit": 1})
+        assert response.status_code == 200
+        assert [hit["source"] for hit in response.json()["results"]] == ["qa"]
+
+        # Failures reach the endpoint instead of looking like "no results"
+        def unavailable(text):
+            raise RuntimeError("embedding model unavailable")
+
+        service.embed_query = unavailable
+        try:
+            service.search_all("dock")
+            assert False, "expected the embedding error"
+        except RuntimeError:
+            pass
+        response = _post("/ai/search", {"query": "dock"})
+        assert response.status_code == 500
+        assert "embedding model unavailable" in response.json()["detail"]
+    finally:
+        main.vector_service = original_service
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,43 @@
+# ai_services/test/test_semantic_cache.py
+from backend.src.app.core.cache import cache
+from ai_services.src.services.semantic_cache import SemanticCache
+from ai_services.src.services.vector_service import vector_service
+
+
+def test_paraphrase_hits_and_invalidation():
+    """Paraphrases hit, different budgets don't, data changes invalidate"""
+    semantic_cache = SemanticCache(embed_fn=vector_service.embed_query, threshold=0.85)
+
+    response, vector = semantic_cache.lookup("chat", "laptops under $800")
+    assert response is None
+    semantic_cache.store("chat", "laptops under $800", "Answer for $800", vector)
+
+    for paraphrase in ["laptops under 800", "Laptops under $800?"]:
+        response, _ = semantic_cache.lookup("chat", paraphrase)
+        print(f"'{paraphrase}' -> {response}")
+        assert response == "Answer for $800"
+
+    response, _ = semantic_cache.lookup("chat", "laptops under $900")
+    assert response is None, "different budget must not reuse the answer"
+
+    response, _ = semantic_cache.lookup("recommend", "laptops under $800")
+    assert response is None, "namespaces are separate"
+
+    cache.bump_data_version()
+    response, _ = semantic_cache.lookup("chat", "laptops under 800")
+    assert response is None, "data changes must invalidate cached answers"
+
+    print(f"Stats: {semantic_cache.stats()}")
+
+
+def test_size_bound():
+    semantic_cache = SemanticCache(embed_fn=vector_service.embed_query, max_entries=2)
+    for i in range(5):
+        semantic_cache.store("chat", f"question number {i}", f"answer {i}")
+    assert semantic_cache.stats()["entries"]["chat"] == 2
+
+
+if __name__ == "__main__":
+    test_paraphrase_hits_and_invalidation()
+    test_size_bound()
+    print("Semantic cache tests passed!")
@@ -0,0 +1,73 @@
+# ai_services/test/test_singleflight.py
+import asyncio
+
+from ai_services.src.core.singleflight import SingleFlight, normalize_message
+
+
+def test_identical_requests_execute_once():
+    flight = SingleFlight()
+    runs = []
+
+    async def answer(question):
+        runs.append(question)
+        await asyncio.sleep(0.1)
+        return f"answer to {question}"
+
+    async def burst():
+        keys = [normalize_message(m) for m in ["Best laptop?", " best  LAPTOP "] * 25]
+        keys += ["other question"] * 5
+        return await asyncio.gather(
+            *(flight.do(key, lambda key=key: answer(key)) for key in keys)
+        )
+
+    results = asyncio.run(burst())
+    print(f"Singleflight stats: {flight.stats()}")
+
+    assert runs == ["best laptop", "other question"]
+    assert results[0] == results[49] == "answer to best laptop"
+    assert results[-1] == "answer to other question"
+    assert flight.stats()["coalesced"] == 53
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream timeout")
+
+    async def burst():
+        return await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(10)), return_exceptions=True
+        )
+
+    results = asyncio.run(burst())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats()["executions"] == 1
+
+
+def test_leader_disconnect_keeps_shared_work():
+    flight = SingleFlight()
+
+    async def answer():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("key", answer))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.do("key", answer))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "done"
+    assert flight.stats()["executions"] == 1
+
+
+if __name__ == "__main__":
+    test_identical_requests_execute_once()
+    test_errors_reach_every_waiter()
+    test_leader_disconnect_keeps_shared_work()
+    print("Singleflight tests passed!")
@@ -0,0 +1,199 @@
+# ai_services/test/test_stream_endpoints.py
+import asyncio
+import json
+from typing import Dict, List, Tuple
+
+import httpx
+from langchain_core.messages import AIMessageChunk
+
+from ai_services.src import main
+from ai_services.src.core.config import settings
+from ai_services.src.services.conversation_store import (
+    ConversationMemory,
+    MemoryConversationStore,
+)
+from ai_services.src.services.langgraph_agent import LaptopAgent
+from ai_services.test.test_async_agent import StubChatModel
+from backend.src.app.core.admission import AsyncAdmissionController
+
+NO_TOOLS = {"tools_needed": [], "tool_params": {}, "intent": "general"}
+
+
+def parse_sse(body: str) -> List[Tuple[str, Dict]]:
+    """(event, data) pairs of an SSE body; every frame must be well formed"""
+    assert body.endswith("\n\n"), "stream must end on a frame boundary"
+    events = []
+    for frame in body.strip("\n").split("\n\n"):
+        lines = frame.split("\n")
+        assert len(lines) == 2, f"malformed frame: {frame!r}"
+        assert lines[0].startswith("event: ") and lines[1].startswith("data: ")
+        events.append(
+            (lines[0][len("event: ") :], json.loads(lines[1][len("data: ") :]))
+        )
+    return events
+
+
+def _post(path: str, payload: Dict) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await client.post(path, json=payload)
+
+    return asyncio.run(request())
+
+
+class _Patched:
+    """Run the endpoints with a stub agent, memory store and no semantic cache.
+
+    Responses the endpoints would store in the semantic cache are collected
+    in `stored`.
+    """
+
+    def __init__(self, agent: LaptopAgent):
+        self.agent = agent
+        self.memory = ConversationMemory(store=MemoryConversationStore())
+        self.stored = []
+
+    def _store(self, namespace, message, response, vector):
+        self.stored.append(response)
+
+    def __enter__(self):
+        self.saved = (
+            main.get_agent,
+            main.conversation_memory,
+            main.store_cached_response,
+            settings.SEMANTIC_CACHE_ENABLED,
+        )
+        main.get_agent = lambda mode=None: self.agent
+        main.conversation_memory = self.memory
+        main.store_cached_response = self._store
+        settings.SEMANTIC_CACHE_ENABLED = False
+        return self
+
+    def __exit__(self, *exc):
+        (
+            main.get_agent,
+            main.conversation_memory,
+            main.store_cached_response,
+            settings.SEMANTIC_CACHE_ENABLED,
+        ) = self.saved
+
+
+def _stub_agent() -> LaptopAgent:
+    return LaptopAgent(
+        llm=StubChatModel(latency=0, analysis=NO_TOOLS), session_factory=lambda: None
+    )
+
+
+def test_stream_framing_and_done_event():
+    with _Patched(_stub_agent()) as patched:
+        for path in ("/ai/chat/stream", "/ai/recommend/stream"):
+            response = _post(path, {"message": "laptops under $1000"})
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            assert response.headers["cache-control"] == "no-cache"
+
+            events = parse_sse(response.text)
+            names = [name for name, _ in events]
+            print(f"{path}: {names}")
+            assert names[0] == "analysis" and names[1] == "tools"
+            assert "token" in names and names.count("done") == 1
+            assert names[-1] == "done"
+
+            # The done payload is a ChatResponse matching the streamed tokens
+            done = events[-1][1]
+            assert set(done) == {"response", "conversation_id", "status"}
+            assert done["status"] == "success"
+            tokens = "".join(
+                data["content"] for name, data in events if name == "token"
+            )
+            assert done["response"] == tokens
+            prefix = "conv_" if path == "/ai/chat/stream" else "rec_"
+            assert done["conversation_id"].startswith(prefix)
+            assert patched.memory.load(done["conversation_id"]).has_history
+            assert patched.stored[-1] == done["response"]
+
+        # A given conversation id is kept
+        response = _post(
+            "/ai/chat/stream", {"message": "and cheaper?", "conversation_id": "c_1"}
+        )
+        assert parse_sse(response.text)[-1][1]["conversation_id"] == "c_1"
+
+
+def test_stream_error_event():
+    agent = _stub_agent()
+
+    async def failing_tools(state):
+        raise RuntimeError("tool pool exhausted")
+
+    agent._aexecute_tools = failing_tools
+    with _Patched(agent) as patched:
+        response = _post(
+            "/ai/chat/stream", {"message": "laptops", "conversation_id": "c_err"}
+        )
+        assert response.status_code == 200
+        events = parse_sse(response.text)
+        assert [name for name, _ in events] == ["analysis", "error"]
+        assert "tool pool exhausted" in events[-1][1]["detail"]
+        # A failed turn is not remembered
+        assert not patched.memory.load("c_err").has_history
+
+
+def test_stream_synthesis_failure():
+    agent = _stub_agent()
+
+    def failing_synthesis(*tokens):
+        async def astream(messages, step=None, intent=None):
+            for token in tokens:
+                yield AIMessageChunk(content=token)
+            raise RuntimeError("connection reset")
+
+        return astream
+
+    with _Patched(agent) as patched:
+        # Tokens already sent are kept, but the answer is marked as cut off
+        agent.models.astream = failing_synthesis("Here are ", "the lap")
+        events = parse_sse(_post("/ai/chat/stream", {"message": "laptops"}).text)
+        assert [name for name, _ in events][-3:] == ["token", "token", "done"]
+        done = events[-1][1]
+        assert done["response"] == "Here are the lap"
+        assert done["status"] == "partial"
+        # ...and neither cached nor remembered
+        assert not patched.memory.load(done["conversation_id"]).has_history
+        assert patched.stored == []
+
+        # Nothing streamed yet: an error, not an apology passed off as an answer
+        agent.models.astream = failing_synthesis()
+        events = parse_sse(_post("/ai/chat/stream", {"message": "laptops"}).text)
+        assert [name for name, _ in events] == ["analysis", "tools", "error"]
+        assert "connection reset" in events[-1][1]["detail"]
+
+
+def test_stream_rejected_before_streaming():
+    saturated = AsyncAdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1)
+    saturated.active = 1
+    original_admission = main.llm_admission
+    main.llm_admission = saturated
+    try:
+        with _Patched(_stub_agent()):
+            for path in ("/ai/chat/stream", "/ai/recommend/stream"):
+                response = _post(path, {"message": "laptops under $1000"})
+                assert response.status_code == 429
+                assert int(response.headers["retry-after"]) >= 1
+                assert "overloaded" in response.json()["detail"]
+                assert not response.headers["content-type"].startswith(
+                    "text/event-stream"
+                )
+        assert saturated.rejected == 2
+    finally:
+        main.llm_admission = original_admission
+
+
+if __name__ == "__main__":
+    test_stream_framing_and_done_event()
+    test_stream_error_event()
+    test_stream_synthesis_failure()
+    test_stream_rejected_before_streaming()
+    print("Streaming endpoint tests passed!")
@@ -0,0 +1,164 @@
+# ai_services/test/test_tool_calling_agent.py
+import asyncio
+import json
+import time
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ai_services.src.services.langgraph_agent import LaptopAgent, ERROR_RESPONSE_PREFIX
+from ai_services.src.services.tool_calling_agent import ToolCallingAgent
+from ai_services.test.test_async_agent import StubChatModel
+
+
+class ToolCallingStubModel(StubChatModel):
+    """Stub that requests a budget search natively, then answers"""
+
+    calls: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[tool.name for tool in tools], **kwargs)
+
+    def _reply(self, messages: List[BaseMessage], tools=None) -> ChatResult:
+        self.calls += 1
+        if "Return a JSON object" in messages[0].content:
+            message = AIMessage(content=json.dumps(self.analysis))
+        elif tools and not any(isinstance(m, ToolMessage) for m in messages):
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "search_laptops_by_budget",
+                        "args": {"min_price": 0, "max_price": 1000},
+                        "id": "call_1",
+                    }
+                ],
+            )
+        else:
+            message = AIMessage(content="Here are the laptops we have under $1000.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._reply(messages, kwargs.get("tools"))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._reply(messages, kwargs.get("tools"))
+
+
+def _run_mode(agent, query: str, requests: int) -> dict:
+    agent.llm.calls = 0
+
+    async def run_all():
+        return [await agent.aprocess_query(query, None) for _ in range(requests)]
+
+    started = time.perf_counter()
+    responses = asyncio.run(run_all())
+    elapsed = time.perf_counter() - started
+    return {
+        "avg_latency": elapsed / requests,
+        "llm_calls_per_query": agent.llm.calls / requests,
+        "response": responses[0],
+    }
+
+
+def test_agent_modes_ab(latency: float = 0.2, requests: int = 5):
+    """A/B the graph agent against native tool calling on the same stub LLM"""
+    query = "something affordable for school"  # not routable locally
+    results = {}
+    for mode, agent_class in [
+        ("graph", LaptopAgent),
+        ("tool_calling", ToolCallingAgent),
+    ]:
+        agent = agent_class(
+            llm=ToolCallingStubModel(latency=latency), session_factory=lambda: None
+        )
+        agent.toolkit.router = None
+        results[mode] = _run_mode(agent, query, requests)
+        print(f"  {mode}: {results[mode]}")
+
+    assert results["tool_calling"]["response"] == results["graph"]["response"]
+    assert results["tool_calling"]["llm_calls_per_query"] == 2
+
+
+def test_tool_calling_round_trips():
+    """Routed queries and chit-chat each need a single LLM call"""
+    agent = ToolCallingAgent(
+        llm=ToolCallingStubModel(latency=0), session_factory=lambda: None
+    )
+
+    # The router picks the tools, so the model only writes the answer
+    routed = _run_mode(agent, "tell me about laptop ID 3", 1)
+    assert routed["llm_calls_per_query"] == 1, routed
+
+    events = []
+
+    async def collect():
+        async for event in agent.astream_query("tell me about laptop ID 3"):
+            events.append(event["event"])
+
+    asyncio.run(collect())
+    assert events[:2] == ["analysis", "tools"] and events[-1] == "done", events
+
+
+class NarratingStubModel(ToolCallingStubModel):
+    """Says what it is about to look up alongside its tool call"""
+
+    def _reply(self, messages: List[BaseMessage], tools=None) -> ChatResult:
+        result = super()._reply(messages, tools)
+        message = result.generations[0].message
+        if message.tool_calls:
+            message.content = "Let me check our stock. "
+        return result
+
+
+class LoopingStubModel(ToolCallingStubModel):
+    """Asks for a tool on every call, even once tools are withheld"""
+
+    def _reply(self, messages: List[BaseMessage], tools=None) -> ChatResult:
+        # Drop earlier results so the stub asks again
+        messages = [m for m in messages if not isinstance(m, ToolMessage)]
+        return super()._reply(messages, tools=["search_laptops_by_budget"])
+
+
+def test_streamed_text_is_the_response():
+    agent = ToolCallingAgent(
+        llm=NarratingStubModel(latency=0), session_factory=lambda: None
+    )
+    agent.toolkit.router = None
+    tokens, done = [], None
+
+    async def collect():
+        nonlocal done
+        async for event in agent.astream_query("something affordable for school"):
+            if event["event"] == "token":
+                tokens.append(event["data"]["content"])
+            elif event["event"] == "done":
+                done = event["data"]
+
+    asyncio.run(collect())
+    assert tokens[0] == "Let me check our stock. "
+    assert done["response"] == "".join(tokens)
+
+
+def test_tool_calling_agent_composes_the_toolkit():
+    agent = ToolCallingAgent(
+        llm=LoopingStubModel(latency=0), session_factory=lambda: None, max_rounds=1
+    )
+    # No LangGraph or extra model clients it would never use
+    assert not isinstance(agent, LaptopAgent) and not hasattr(agent, "graph")
+
+    agent.toolkit.router = None
+    response = agent.process_query("something affordable for school", None)
+    assert response.startswith(ERROR_RESPONSE_PREFIX), response
+
+
+if __name__ == "__main__":
+    print("A/B testing agent modes...")
+    test_agent_modes_ab()
+    print("Testing tool-calling round trips...")
+    test_tool_calling_round_trips()
+    test_streamed_text_is_the_response()
+    test_tool_calling_agent_composes_the_toolkit()
@@ -0,0 +1,98 @@
+# ai_services/test/test_tracing.py
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from backend.src.app.core.tracing import Tracer, load_spans, tracer
+from ai_services.src.services.langgraph_agent import LaptopAgent
+from ai_services.test.test_async_agent import SleepTool
+from ai_services.test.test_model_router import NamedStubModel
+from scripts.trace_summary import summarize
+
+
+def _traced_agent():
+    agent = LaptopAgent(
+        llm=NamedStubModel(name="gpt-4", latency=0.01),
+        fast_llm=NamedStubModel(name="gpt-3.5-turbo", latency=0.01),
+        session_factory=lambda: None,
+    )
+    agent.toolkit.router = None  # force the LLM analysis step
+    agent.tool_map = {"search_laptops_by_budget": SleepTool(0.05)}
+    return agent
+
+
+def test_agent_run_is_traced():
+    agent = _traced_agent()
+    original_file = tracer.trace_file
+    with tempfile.TemporaryDirectory() as directory:
+        tracer.trace_file = Path(directory) / "traces.jsonl"
+        try:
+            asyncio.run(agent.aprocess_query("Laptops under $1000", None))
+            agent.process_query("Laptops under $1000", None)
+        finally:
+            trace_file, tracer.trace_file = tracer.trace_file, original_file
+
+        lines = trace_file.read_text().splitlines()
+        spans = load_spans(trace_file)
+
+    # One OTLP export request per trace
+    assert len(lines) == 2
+    assert "resourceSpans" in json.loads(lines[0])
+
+    by_id = {span["span_id"]: span for span in spans}
+    roots = [span for span in spans if span["parent_id"] is None]
+    assert [root["name"] for root in roots] == ["agent.run", "agent.run"]
+
+    def parent(span):
+        return by_id[span["parent_id"]]["name"]
+
+    names = {span["name"] for span in spans}
+    print(f"Span names: {sorted(names)}")
+    for node in (
+        "node.analyze_query",
+        "node.execute_tools",
+        "node.synthesize_response",
+    ):
+        assert node in names
+    tool_spans = [s for s in spans if s["name"] == "tool.search_laptops_by_budget"]
+    assert len(tool_spans) == 2
+    assert all(parent(span) == "node.execute_tools" for span in tool_spans)
+    assert all(span["duration"] >= 0.05 for span in tool_spans)
+
+    # The async path goes through the model router
+    llm_spans = [s for s in spans if s["name"] == "llm.call"]
+    assert {parent(span) for span in llm_spans} == {
+        "node.analyze_query",
+        "node.synthesize_response",
+    }
+    assert all(span["attributes"]["input_tokens"] == 100 for span in llm_spans)
+
+    summary = summarize(spans)
+    assert summary["spans"]["agent.run"]["count"] == 2
+    assert summary["spans"]["agent.run"]["errors"] == 0
+    assert summary["tokens"]["input_tokens"] >= 200
+
+
+def test_errors_and_late_spans():
+    local = Tracer(enabled=True)
+    try:
+        with local.span("outer"):
+            with local.span("inner") as inner:
+                raise ValueError("bad input")
+    except ValueError:
+        pass
+    assert inner.status == "error"
+    assert inner.attributes["error"] == "ValueError: bad input"
+    # Spans finishing after their trace was exported are dropped
+    assert not local._open
+
+    disabled = Tracer(enabled=False)
+    with disabled.span("ignored") as span:
+        assert span is None
+
+
+if __name__ == "__main__":
+    test_agent_run_is_traced()
+    test_errors_and_late_spans()
+    print("Tracing tests passed!")
@@ -0,0 +1,159 @@
+# ai_services/test/test_vector_arrays.py
+"""Embeddings stay float32 NumPy arrays from the model to Chroma.
+
+    python -m ai_services.test.test_vector_arrays
+    python -m ai_services.test.test_vector_arrays --benchmark [--docs 100000]
+
+The benchmark indexes synthetic documents with precomputed vectors, once
+passing 2-D arrays (the current path) and once converting every vector to a
+Python list first (the old path), and reports docs/sec and the peak Python
+memory of the indexing loop.
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.services.embedding_cache import EmbeddingCache
+from ai_services.src.services import vector_service as vector_service_module
+from ai_services.src.services.vector_service import VectorService
+
+
+class RandomVectorService(VectorService):
+    """Skips the model: unit vectors from a fixed seed, so the benchmark
+    measures what happens to embeddings after the model"""
+
+    def _embed_texts(self, texts, bulk):
+        vectors = np.random.default_rng(len(texts)).standard_normal(
+            (len(texts), AIConfig.EMBEDDING_DIMENSION), dtype=np.float32
+        )
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class ListVectorService(RandomVectorService):
+    """The old path: one Python list of floats per vector"""
+
+    def _generate_embeddings(self, texts, bulk=False):
+        return [vector.tolist() for vector in super()._generate_embeddings(texts, bulk)]
+
+
+def _records(count: int) -> List[tuple]:
+    return [
+        (
+            f"review_{i}",
+            f"Review {i}: battery lasts {i % 12 + 2} hours under load",
+            {"laptop_id": i % 50 + 1, "rating": i % 5 + 1},
+        )
+        for i in range(count)
+    ]
+
+
+def test_embeddings_are_float32_matrices(make_vector_service, tmp_path):
+    service = make_vector_service()
+    dim = AIConfig.EMBEDDING_DIMENSION
+
+    embeddings = service._generate_embeddings(["Great battery", "Loud fans"])
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.shape == (2, dim) and embeddings.dtype == np.float32
+    assert embeddings.flags["C_CONTIGUOUS"]
+
+    query = service.embed_query("Great battery")
+    assert query.shape == (dim,) and query.dtype == np.float32
+    assert np.allclose(query, embeddings[0], atol=1e-3)  # may come from the cache
+
+    # Partly cached batches with repeated text still come back as one matrix
+    original_cache = vector_service_module.embedding_cache
+    vector_service_module.embedding_cache = EmbeddingCache(
+        path=tmp_path / "embedding_cache.sqlite3"
+    )
+    try:
+        service._generate_embeddings(["Great battery"])
+        mixed = service._generate_embeddings(
+            ["Loud fans", "Great battery", "Loud fans"]
+        )
+    finally:
+        vector_service_module.embedding_cache = original_cache
+    assert mixed.shape == (3, dim) and mixed.flags["C_CONTIGUOUS"]
+    assert np.allclose(mixed[1], embeddings[0], atol=1e-3)  # float16 cache
+    assert np.array_equal(mixed[0], mixed[2])
+
+    # Arrays go straight into Chroma and back out of a query
+    records = _records(20)
+    assert service._upsert_records(service.reviews_collection, "reviews", records)
+    results = service._query_collection(
+        service.reviews_collection, records[3][1], laptop_id=None, limit=3
+    )
+    assert results[0]["document"] == records[3][1]
+
+    service.embedding_model = None  # the model fails: an empty (0, dim) array
+    failed = service._generate_embeddings(["Thermals"])
+    assert failed.shape == (0, dim)
+    new = [("review_99", "Thermals throttle", {"laptop_id": 1, "rating": 2})]
+    assert not service._upsert_records(service.reviews_collection, "reviews", new)
+
+
+def _index(service_class, records: List[tuple], directory: Path) -> VectorService:
+    service = service_class(persist_directory=str(directory))
+    assert service._upsert_records(service.reviews_collection, "reviews", records)
+    return service
+
+
+def benchmark_indexing(docs: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """docs/sec and peak Python memory indexing `docs` documents with array
+    and list embeddings"""
+    records = _records(docs)
+    sample = records[: min(docs, 10 * AIConfig.VECTOR_INDEX_BATCH_SIZE)]
+    original_cache = vector_service_module.embedding_cache
+    vector_service_module.embedding_cache = None
+    results = {}
+    scratch = tempfile.TemporaryDirectory()
+    try:
+        for label, service_class in (
+            ("arrays", RandomVectorService),
+            ("lists", ListVectorService),
+        ):
+            started = time.perf_counter()
+            _index(service_class, records, Path(scratch.name) / label)
+            rate = docs / (time.perf_counter() - started)
+
+            # Peak memory on a sample: tracemalloc slows the loop down
+            tracemalloc.start()
+            _index(service_class, sample, Path(scratch.name) / f"{label}-sample")
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results[label] = {"docs_per_sec": rate, "peak_mb": peak / 2**20}
+            print(
+                f"{label:>7}: {rate:8.0f} docs/s, peak {peak / 2**20:7.1f} MB"
+                f" over {len(sample)} docs"
+            )
+    finally:
+        vector_service_module.embedding_cache = original_cache
+        scratch.cleanup()
+
+    speedup = results["arrays"]["docs_per_sec"] / results["lists"]["docs_per_sec"]
+    saving = results["lists"]["peak_mb"] / max(results["arrays"]["peak_mb"], 1e-9)
+    print(f"arrays: {speedup:.2f}x throughput, {saving:.1f}x less peak memory")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--docs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(
+            f"Indexing {args.docs} documents, {AIConfig.EMBEDDING_DIMENSION}-d,"
+            f" batches of {AIConfig.VECTOR_INDEX_BATCH_SIZE}"
+        )
+        benchmark_indexing(args.docs)
+    else:
+        raise SystemExit(pytest.main([__file__]))
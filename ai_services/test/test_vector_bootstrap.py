@@ -0,0 +1,110 @@
+# ai_services/test/test_vector_bootstrap.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.app.core.cache import cache
+from backend.src.app.core.db import Base
+from backend.src.app.models.laptop import Laptop
+from backend.src.app.models.review import Review
+from backend.src.app.models.questions_answer import QuestionsAnswer
+from backend.src.app.models.vector_index_state import VectorIndexState
+from ai_services.src.services import langchain_tools
+from ai_services.src.services.conversation_store import Conversation
+from ai_services.src.services.langchain_tools import QASearchTool, ReviewSearchTool
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Laptop.__table__,
+            Review.__table__,
+            QuestionsAnswer.__table__,
+            VectorIndexState.__table__,
+        ],
+    )
+    db = sessionmaker(bind=engine)()
+    laptop = Laptop(
+        brand="Lenovo",
+        model_name="T14",
+        full_model_name="ThinkPad T14 Gen 4",
+        pdf_spec_url="https://example.com/spec.pdf",
+    )
+    db.add(laptop)
+    db.commit()
+    db.add_all(
+        [
+            Review(
+                laptop_id=laptop.id,
+                review_title="Great ports",
+                review_text="The RJ-45 jack and Thunderbolt 4 save me a dongle",
+                rating=5,
+                helpful_count=3,
+            ),
+            Review(
+                laptop_id=laptop.id,
+                review_text="Battery is average",
+                rating=3,
+            ),
+            QuestionsAnswer(
+                laptop_id=laptop.id,
+                question_text="Does it have an ethernet port?",
+                answer_text="Yes, a full size RJ-45 port",
+            ),
+        ]
+    )
+    db.commit()
+    return db
+
+
+def test_ready_after_first_sync(make_vector_service, tmp_path):
+    db = _session()
+    service = make_vector_service(persist_directory=tmp_path)
+    assert not service.ready and not service.has_documents()
+
+    # A partial sync is not enough
+    service.sync_index(db, collections=[service.reviews_collection.name])
+    assert not service.ready
+
+    version = cache.data_version()
+    service.sync_index(db)
+    assert service.ready and service.has_documents()
+    # Answers cached while degraded are invalidated
+    assert cache.data_version() != version
+
+    # A restart over a populated store serves it before syncing
+    assert make_vector_service(persist_directory=tmp_path).ready
+
+
+def test_tools_use_sql_until_ready(make_vector_service):
+    db = _session()
+    original_service = langchain_tools.vector_service
+    langchain_tools.vector_service = make_vector_service()
+    try:
+        reviews = ReviewSearchTool()._run("rj45 or RJ-45 ethernet", db=db)
+        print(reviews)
+        assert "semantic search is still indexing" in reviews
+        assert "RJ-45 jack" in reviews and "Battery" not in reviews
+
+        qa = QASearchTool()._run("ethernet port", db=db)
+        assert "Does it have an ethernet port?" in qa
+        assert "No reviews found" in ReviewSearchTool()._run("touchscreen", db=db)
+        assert ReviewSearchTool()._run("ethernet") == "Database session not available"
+
+        # Fallback results serve this turn only
+        conversation = Conversation(conversation_id="c_fallback")
+        conversation.remember_tool_result("search_reviews", {"query": "RJ-45"}, reviews)
+        assert conversation.tool_result("search_reviews", {"query": "RJ-45"}) is None
+
+        # Once indexed, the tools search the vector index
+        langchain_tools.vector_service.sync_index(db)
+        reviews = ReviewSearchTool()._run("RJ-45", db=db)
+        assert "still indexing" not in reviews and "Match:" in reviews
+    finally:
+        langchain_tools.vector_service = original_service
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
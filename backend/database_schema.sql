@@ -71,6 +71,18 @@ CREATE TABLE questions_answers (
     scraped_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Watermarks for incremental vector indexing (one row per Chroma collection)
+CREATE TABLE vector_index_state (
+    collection VARCHAR(100) PRIMARY KEY,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    last_scraped_at TIMESTAMP WITH TIME ZONE,
+    last_laptop_update TIMESTAMP WITH TIME ZONE,
+    indexed_count INTEGER DEFAULT 0,
+    checkpoint_id INTEGER, -- last row written by an unfinished sync
+    checkpoint_full BOOLEAN DEFAULT FALSE,
+    synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 
 -- === Indexes for Performance (Moved here from inside the tables) ===
 CREATE INDEX idx_laptop_category ON specifications (laptop_id, category);
@@ -81,6 +93,8 @@ CREATE INDEX idx_laptop_rating ON reviews (laptop_id, rating);
 CREATE INDEX idx_review_date ON reviews (review_date);
 CREATE INDEX idx_laptop_qa ON questions_answers (laptop_id);
 CREATE INDEX idx_qa_date ON questions_answers (question_date);
+CREATE INDEX idx_review_scraped ON reviews (scraped_at);
+CREATE INDEX idx_qa_scraped ON questions_answers (scraped_at);
 
 -- Triggers to update timestamps
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -124,4 +138,53 @@ INSERT INTO laptops (brand, model_name, variant, full_model_name, product_page_u
 ('Lenovo', 'ThinkPad E14 Gen 5', 'Intel', 'ThinkPad E14 Gen 5 (Intel)','https://www.lenovo.com/us/en/p/laptops/thinkpad/thinkpade/thinkpad-e14-gen-5-14-inch-intel/len101t0064' ,'https://psref.lenovo.com/syspool/Sys/PDF/ThinkPad/ThinkPad_E14_Gen_5_Intel/ThinkPad_E14_Gen_5_Intel_Spec.PDF','https://p3-ofp.static.pub/fes/cms/2023/05/15/h5cqimqsg3i95ffichjsp8qz9wun5h434750.jpg'),
 ('Lenovo', 'ThinkPad E14 Gen 5', 'AMD', 'ThinkPad E14 Gen 5 (AMD)', 'https://www.lenovo.com/us/en/p/laptops/thinkpad/thinkpade/thinkpad-e14-gen-5-14-inch-amd/len101t0068?orgRef=https%253A%252F%252Fwww.google.com%252F&srsltid=AfmBOoqAS4HFde0cPIpvn4VZodEMsRkvV0akOcfFq_K6PXjuPX2CXlMV','https://psref.lenovo.com/syspool/Sys/PDF/ThinkPad/ThinkPad_E14_Gen_5_AMD/ThinkPad_E14_Gen_5_AMD_Spec.pdf','https://p1-ofp.static.pub/fes/cms/2023/05/30/t7l1v4d7clb4flto8dyzrltuhnyx6y985674.jpg'),
 ('HP', 'ProBook 450', 'G10', 'HP ProBook 450 G10','https://www.hp.com/us-en/shop/pdp/hp-probook-450-156-inch-g10-notebook-pc-wolf-pro-security-edition-p-8l0e0ua-aba-1' ,'https://h20195.www2.hp.com/v2/GetPDF.aspx/c08504822.pdf', 'https://hp.widen.net/content/wvqwdaw4fy/jpeg/wvqwdaw4fy.jpg?w=1500&dpi=300'),
-('HP', 'ProBook 440', 'G11', 'HP ProBook 440 G11', 'https://www.hp.com/us-en/shop/mdp/pro-352502--1/probook-440','https://h20195.www2.hp.com/v2/getpdf.aspx/c08947328.pdf', 'https://www.hp.com/wcsstore/hpusstore/Treatment/mdps/Q2FY23_Probook_Series_G10_Redesign/Commercial.jpg');
\ No newline at end of file
+('HP', 'ProBook 440', 'G11', 'HP ProBook 440 G11', 'https://www.hp.com/us-en/shop/mdp/pro-352502--1/probook-440','https://h20195.www2.hp.com/v2/getpdf.aspx/c08947328.pdf', 'https://www.hp.com/wcsstore/hpusstore/Treatment/mdps/Q2FY23_Probook_Series_G10_Redesign/Commercial.jpg');
+
+-- Change notifications: the backend and AI service LISTEN on this channel to
+-- invalidate caches and sync the vector index (see core/change_listener.py)
+CREATE OR REPLACE FUNCTION notify_data_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_data JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+
+    PERFORM pg_notify(
+        'data_changes',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'id', (row_data ->> 'id')::INTEGER,
+            'laptop_id', COALESCE(
+                (row_data ->> 'laptop_id')::INTEGER,
+                CASE WHEN TG_TABLE_NAME = 'laptops' THEN (row_data ->> 'id')::INTEGER END
+            )
+        )::TEXT
+    );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE TRIGGER notify_laptops_change
+    AFTER INSERT OR UPDATE OR DELETE ON laptops
+    FOR EACH ROW EXECUTE FUNCTION notify_data_change();
+
+CREATE OR REPLACE TRIGGER notify_specifications_change
+    AFTER INSERT OR UPDATE OR DELETE ON specifications
+    FOR EACH ROW EXECUTE FUNCTION notify_data_change();
+
+CREATE OR REPLACE TRIGGER notify_price_snapshots_change
+    AFTER INSERT OR UPDATE OR DELETE ON price_snapshots
+    FOR EACH ROW EXECUTE FUNCTION notify_data_change();
+
+CREATE OR REPLACE TRIGGER notify_reviews_change
+    AFTER INSERT OR UPDATE OR DELETE ON reviews
+    FOR EACH ROW EXECUTE FUNCTION notify_data_change();
+
+CREATE OR REPLACE TRIGGER notify_questions_answers_change
+    AFTER INSERT OR UPDATE OR DELETE ON questions_answers
+    FOR EACH ROW EXECUTE FUNCTION notify_data_change();
@@ -1,14 +1,29 @@
-import sys
-import os
-from pathlib import Path
+import argparse
 
 from backend.src.app.core.db import SessionLocal
+from backend.src.app.config.ai_config import AIConfig
 from ai_services.src.services.vector_service import vector_service
 from backend.src.utils.logger.logging import logger as logging
 
 
 def main():
-    """Index all reviews and Q&A data into ChromaDB"""
+    """Sync reviews and Q&A data into ChromaDB.
+
+    Only rows added or changed since the last run are embedded, and vectors
+    of deleted rows are removed; --full re-embeds everything.
+    """
+    parser = argparse.ArgumentParser(description="Sync the vector index with SQL")
+    parser.add_argument(
+        "--full", action="store_true", help="re-embed every row, not just changes"
+    )
+    parser.add_argument(
+        "--collection",
+        choices=[AIConfig.REVIEWS_COLLECTION, AIConfig.QA_COLLECTION],
+        action="append",
+        help="collection to sync (repeatable; default: all)",
+    )
+    args = parser.parse_args()
+
     db = SessionLocal()
 
     try:
@@ -18,21 +33,19 @@ def main():
         initial_stats = vector_service.get_collection_stats()
         logging.info(f"Initial stats: {initial_stats}")
 
-        # Index reviews
-        logging.info("Indexing reviews...")
-        reviews_success = vector_service.index_reviews(db)
-
-        # Index Q&A
-        logging.info("Indexing Q&A pairs...")
-        qa_success = vector_service.index_qa(db)
+        results = vector_service.sync_index(
+            db, full=args.full, collections=args.collection
+        )
+        for name, result in results.items():
+            logging.info(f"{name}: {result}")
 
         # Get final stats
         final_stats = vector_service.get_collection_stats()
         logging.info(f"Final stats: {final_stats}")
 
-        if reviews_success and qa_success:
+        if all(result is not None for result in results.values()):
             logging.info("Vector data indexing completed successfully!")
-            logging.info("✅ Vector database populated successfully")
+            logging.info("✅ Vector database is up to date")
             logging.info(f"📊 Reviews indexed: {final_stats['reviews_count']}")
             logging.info(f"📊 Q&A pairs indexed: {final_stats['qa_count']}")
         else:
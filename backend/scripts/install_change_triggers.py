@@ -0,0 +1,24 @@
+from backend.src.app.core.db import engine
+from backend.src.app.core.change_listener import install_triggers, missing_triggers
+from backend.src.utils.logger.logging import logger as logging
+
+
+def main():
+    """Install the change notification triggers of backend/database_schema.sql.
+
+    For databases created from older dumps. Run once per database, with a
+    role allowed to create functions and triggers; safe to re-run.
+    """
+    try:
+        install_triggers(engine)
+        missing = missing_triggers(engine)
+        if missing:
+            logging.error(f"❌ Triggers still missing on {missing}")
+        else:
+            logging.info("✅ Change notification triggers installed")
+    except Exception as e:
+        logging.error(f"Error installing change notification triggers: {e}")
+
+
+if __name__ == "__main__":
+    main()
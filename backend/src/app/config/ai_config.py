@@ -10,14 +10,45 @@ class AIConfig:
     # Embedding Configuration
     EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"  # FastEmbed model
     EMBEDDING_DIMENSION = 384  # Dimension for the chosen model
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+    # Bulk indexing embeds in this many worker processes (0: one per core,
+    # 1: in-process), each model instance using EMBEDDING_THREADS threads
+    # (default: the cores split evenly between workers)
+    EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0")) or None
+
+    # Persistent embedding cache keyed by model and normalized text; float16
+    # halves the size at a negligible cost in cosine similarity
+    EMBEDDING_CACHE_ENABLED = (
+        os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    )
+    EMBEDDING_CACHE_PATH = Path(
+        os.getenv(
+            "EMBEDDING_CACHE_PATH", PROJECT_ROOT / "data" / "embedding_cache.sqlite3"
+        )
+    )
+    EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+    EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000")
+    )
+
+    # Per-process LRU of query embeddings, shared by all collection searches
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
 
     # Collection Names
     REVIEWS_COLLECTION = "laptop_reviews"
     QA_COLLECTION = "laptop_qa"
 
+    # Rows embedded and upserted per batch when syncing the vector index
+    VECTOR_INDEX_BATCH_SIZE = int(os.getenv("VECTOR_INDEX_BATCH_SIZE", "256"))
+
     # Search Configuration
     MAX_SEARCH_RESULTS = 5
     SIMILARITY_THRESHOLD = 0.7
+    # "hybrid" fuses BM25 and vector ranks with RRF; "vector" is cosine only
+    SEARCH_MODE = os.getenv("SEARCH_MODE", "hybrid")
+    HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))  # per ranker
+    RRF_K = 60
 
     # LLM Configuration (for Phase 3)
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -26,6 +57,35 @@ class AIConfig:
     MAX_TOKENS = 1000
     TEMPERATURE = 0.7
 
+    # Persistent exact-match cache for LLM calls
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = Path(
+        os.getenv("LLM_CACHE_PATH", PROJECT_ROOT / "data" / "llm_cache.sqlite3")
+    )
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+    # Admission control for OpenAI calls: concurrent calls, waiting calls
+    # beyond which callers get a 429, and seconds a call may wait (then 503)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+    LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))
+
+    # Record/replay OpenAI HTTP traffic for offline runs: "off", "record"
+    # or "replay"; replays can sleep for the recorded latency
+    LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+    LLM_CASSETTE_PATH = Path(
+        os.getenv("LLM_CASSETTE_PATH", PROJECT_ROOT / "data" / "llm_cassette.jsonl")
+    )
+    LLM_CASSETTE_REPLAY_LATENCY = (
+        os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true"
+    )
+
+    # Tracing of agent nodes, tools and LLM/vector calls; traces are logged
+    # and, if TRACE_FILE is set, appended to it as OTLP/JSON lines
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_FILE = Path(os.environ["TRACE_FILE"]) if os.getenv("TRACE_FILE") else None
+
     @classmethod
     def ensure_directories(cls):
         """Ensure all required directories exist"""
@@ -0,0 +1,31 @@
+import os
+
+
+class CacheConfig:
+    # Backend selection: "memory" (per-process LRU) or "redis" (shared across
+    # uvicorn workers and between the backend and AI services)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "lie")
+
+    # In-memory LRU bound
+    MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "2048"))
+
+    # TTLs in seconds. Writes are pushed to both services through Postgres
+    # LISTEN/NOTIFY, so these only bound staleness if the listener is down.
+    DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", "300"))
+    LAPTOPS_TTL = int(os.getenv("CACHE_LAPTOPS_TTL", "3600"))
+    LAPTOP_SUMMARY_TTL = int(os.getenv("CACHE_LAPTOP_SUMMARY_TTL", "3600"))
+    VECTOR_SEARCH_TTL = int(os.getenv("CACHE_VECTOR_SEARCH_TTL", "3600"))
+
+    # Stampede protection: how long a loader may hold a key lock, and how
+    # often waiters re-check for the value
+    LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "10"))
+    LOCK_POLL_INTERVAL = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.05"))
+
+    # Change notifications (see backend/src/app/core/change_listener.py)
+    CHANGE_LISTENER_ENABLED = (
+        os.getenv("CHANGE_LISTENER_ENABLED", "true").lower() == "true"
+    )
+    CHANGE_CHANNEL = os.getenv("CHANGE_CHANNEL", "data_changes")
+    CHANGE_BATCH_WINDOW = float(os.getenv("CHANGE_BATCH_WINDOW", "0.5"))
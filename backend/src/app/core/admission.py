@@ -0,0 +1,303 @@
+import asyncio
+import concurrent.futures
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+
+
+class Overloaded(Exception):
+    """Raised when a call is not admitted.
+
+    `status_code` is 429 when the wait queue is full and 503 when a queued
+    call waited longer than the queue timeout; `retry_after` is in seconds.
+    """
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "detail": f"Service overloaded: {self.reason}. Please retry shortly.",
+            "status_code": self.status_code,
+            "retry_after": self.retry_after,
+        }
+
+
+class _AdmissionStats(ABC):
+    """Counters and Retry-After estimate shared by both controllers"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, timeout):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_queue_depth = 0
+        self.total_wait = 0.0
+        # Moving average of how long a call holds its slot
+        self.avg_hold = 1.0
+
+    @property
+    @abstractmethod
+    def queue_depth(self) -> int:
+        """Calls currently waiting for a slot"""
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained"""
+        waves = (self.queue_depth + 1) / self.max_concurrent
+        return max(1, math.ceil(waves * self.avg_hold))
+
+    def _overloaded(self, status_code: int, reason: str) -> Overloaded:
+        logging.warning(
+            f"{self.name} admission rejected a call ({reason}): "
+            f"{self.active} active, {self.queue_depth} queued"
+        )
+        return Overloaded(status_code, self.retry_after(), reason)
+
+    def _record_admit(self, waited: float) -> None:
+        self.admitted += 1
+        self.total_wait += waited
+
+    def _record_hold(self, held: float) -> None:
+        self.avg_hold = 0.8 * self.avg_hold + 0.2 * held
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait": (self.total_wait / self.admitted) if self.admitted else 0.0,
+            "avg_hold": self.avg_hold,
+        }
+
+
+class AdmissionController(_AdmissionStats):
+    """Bounded concurrency with a bounded wait queue, for threaded callers.
+
+    At most `max_concurrent` calls run at once and at most `max_queue` wait;
+    further calls fail fast with a 429 and queued calls give up with a 503
+    after `queue_timeout` seconds.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        super().__init__("llm", max_concurrent, max_queue, queue_timeout)
+        self._condition = threading.Condition()
+        self._waiting = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    def acquire(self) -> None:
+        with self._condition:
+            if self.active < self.max_concurrent and not self._waiting:
+                self.active += 1
+                self._record_admit(0.0)
+                return
+            if self._waiting >= self.max_queue:
+                self.rejected += 1
+                raise self._overloaded(429, "queue full")
+
+            self._waiting += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self._waiting)
+            started = time.monotonic()
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.active < self.max_concurrent, self.queue_timeout
+                )
+            finally:
+                self._waiting -= 1
+            if not admitted:
+                self.timed_out += 1
+                raise self._overloaded(503, "queue timeout")
+            self.active += 1
+            self._record_admit(time.monotonic() - started)
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_hold(time.monotonic() - started)
+            self.release()
+
+
+class AsyncAdmissionController(_AdmissionStats):
+    """AdmissionController for coroutines, granting slots in FIFO order.
+
+    Not thread-safe: its state is only touched from one event loop at a
+    time. The first call binds it to the running loop, and it only moves
+    to another loop once idle, so sequential asyncio.run() calls work but
+    loops running side by side each need their own instance. Threads take
+    slots with blocking_slot(), which waits on the bound loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        name: str = "llm",
+    ):
+        super().__init__(name, max_concurrent, max_queue, queue_timeout)
+        self._waiters: deque = deque()
+        self._loop = None
+        # Serves blocking_slot() when no event loop is bound
+        self._thread_loop = None
+        self._thread_loop_lock = threading.Lock()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self.active or self._waiters:
+            raise RuntimeError(
+                f"{self.name} admission is in use on another event loop; "
+                "create one controller per loop"
+            )
+        self._loop = loop
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def check(self) -> None:
+        """Fail fast if a new call would be rejected, without queueing it"""
+        if self.active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._overloaded(429, "queue full")
+
+    async def acquire(self) -> None:
+        self._bind_loop()
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._record_admit(0.0)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._overloaded(429, "queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the timeout fired
+                self.release()
+            self.timed_out += 1
+            raise self._overloaded(503, "queue timeout")
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        # release() handed its slot straight to us, so `active` is unchanged
+        self._record_admit(time.monotonic() - started)
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_hold(time.monotonic() - started)
+            self.release()
+
+    def _loop_for_threads(self):
+        """The bound loop if it is running, else a private loop thread"""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            return loop
+        with self._thread_loop_lock:
+            if self._thread_loop is None:
+                self._thread_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._thread_loop.run_forever,
+                    name=f"{self.name}-admission",
+                    daemon=True,
+                ).start()
+            return self._thread_loop
+
+    @contextmanager
+    def blocking_slot(self):
+        """slot() for synchronous callers on worker threads.
+
+        Acquiring and releasing run on the controller's event loop, so
+        threads and coroutines share one limit and one queue.
+        """
+        loop = self._loop_for_threads()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("blocking_slot() would block its own event loop")
+
+        asyncio.run_coroutine_threadsafe(self.acquire(), loop).result()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - started
+
+            async def release():
+                self._record_hold(held)
+                self.release()
+
+            # Wait, so the slot is free once the block exits; bounded in
+            # case the loop has stopped (shutdown)
+            try:
+                asyncio.run_coroutine_threadsafe(release(), loop).result(
+                    timeout=self.queue_timeout
+                )
+            except concurrent.futures.TimeoutError:
+                logging.warning(f"{self.name} admission slot release timed out")
+
+
+# Global instance for synchronous OpenAI calls (spec structuring)
+llm_admission = AdmissionController(
+    max_concurrent=AIConfig.LLM_MAX_CONCURRENCY,
+    max_queue=AIConfig.LLM_MAX_QUEUE,
+    queue_timeout=AIConfig.LLM_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,354 @@
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.cache_config import CacheConfig
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+_MISSING = object()
+
+DATA_VERSION_KEY = "data_version"
+DATA_VERSION_TTL = 30 * 24 * 3600
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """Build a cache key like 'laptops:brand=HP' from a namespace and parts"""
+    return ":".join([namespace] + [str(part) for part in parts])
+
+
+def laptop_tag(laptop_id: int) -> str:
+    """Tag for entries derived from a single laptop's rows"""
+    return f"laptop:{int(laptop_id)}"
+
+
+class CacheBackend(ABC):
+    """Common cache interface with tag invalidation and stampede protection.
+
+    Values must be JSON-serializable so that every backend behaves the same.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key"""
+
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Store a value with an optional TTL and invalidation tags; a TTL
+        of 0 stores nothing and drops any previous value"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a single key"""
+
+    @abstractmethod
+    def invalidate_tags(self, *tags: str) -> int:
+        """Remove every key carrying any of the given tags, returns count removed"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every key owned by this cache"""
+
+    @abstractmethod
+    def _lock(self, key: str) -> Iterator[bool]:
+        """Context manager serializing loaders for one key, yields acquired flag"""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        found, value = self._get(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Return the cached value or compute it once, even under concurrency"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock(key) as acquired:
+            # Another worker may have filled the key while we waited
+            if acquired:
+                found, value = self._get(key)
+                if found:
+                    return value
+
+            value = loader()
+            self.set(key, value, ttl=ttl, tags=tags)
+            return value
+
+    def data_version(self) -> str:
+        """Opaque token that changes whenever source data changes.
+
+        A random token rather than a counter, so a version that expires out
+        of the cache can never come back and revalidate old entries.
+        """
+        # Read directly so version checks don't skew the hit-rate stats
+        found, version = self._get(DATA_VERSION_KEY)
+        if found:
+            return version
+        return self.get_or_set(
+            DATA_VERSION_KEY, lambda: uuid.uuid4().hex, ttl=DATA_VERSION_TTL
+        )
+
+    def bump_data_version(self) -> str:
+        version = uuid.uuid4().hex
+        self.set(DATA_VERSION_KEY, version, ttl=DATA_VERSION_TTL)
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache with TTL expiry and a tag index"""
+
+    def __init__(self, max_entries: int = None, default_ttl: float = None):
+        super().__init__()
+        self.max_entries = max_entries or CacheConfig.MEMORY_MAX_ENTRIES
+        self.default_ttl = (
+            default_ttl if default_ttl is not None else CacheConfig.DEFAULT_TTL
+        )
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, set] = {}
+        self._guard = threading.RLock()
+        self._key_locks: Dict[str, list] = {}
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None, tags=None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl
+        tags = tuple(tags or ())
+        with self._guard:
+            self._drop(key)
+            if ttl <= 0:
+                return
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._drop(oldest_key)
+
+    def delete(self, key: str) -> None:
+        with self._guard:
+            self._drop(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        removed = 0
+        with self._guard:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._guard:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def _lock(self, key: str) -> Iterator[bool]:
+        with self._guard:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(timeout=CacheConfig.LOCK_TIMEOUT)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._key_locks.pop(key, None)
+
+
+# Deletes a loader lock only while it still holds the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Empties a tag set and deletes the keys it listed in one step, so a key
+# tagged concurrently lands in a fresh set instead of being forgotten
+_INVALIDATE_TAG_SCRIPT = """
+local keys = redis.call('SMEMBERS', KEYS[1])
+redis.call('DEL', KEYS[1])
+local removed = 0
+for _, key in ipairs(keys) do
+    removed = removed + redis.call('DEL', ARGV[1] .. key)
+end
+return removed
+"""
+
+
+class RedisCache(CacheBackend):
+    """Redis-protocol cache shared by every worker and service.
+
+    Works against a real Redis server or a fakeredis client for tests
+    (Lua scripting needs the `lupa` package there).
+    """
+
+    def __init__(self, client, prefix: str = None, default_ttl: float = None):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix or CacheConfig.KEY_PREFIX
+        self.default_ttl = (
+            default_ttl if default_ttl is not None else CacheConfig.DEFAULT_TTL
+        )
+        self._release_lock = client.register_script(_RELEASE_LOCK_SCRIPT)
+        self._invalidate_tag = client.register_script(_INVALIDATE_TAG_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:v:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:t:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}:l:{key}"
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key, value, ttl=None, tags=None) -> None:
+        ttl_ms = int((ttl if ttl is not None else self.default_ttl) * 1000)
+        if ttl_ms <= 0:
+            self.delete(key)
+            return
+        pipe = self.client.pipeline()
+        pipe.set(self._key(key), json.dumps(value, default=str), px=ttl_ms)
+        for tag in tags or ():
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            # Tag sets only need to outlive the keys they point at
+            pipe.pexpire(tag_key, ttl_ms, gt=True)
+            pipe.pexpire(tag_key, ttl_ms, nx=True)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        return sum(
+            self._invalidate_tag(keys=[self._tag_key(tag)], args=[self._key("")])
+            for tag in tags
+        )
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            self.client.delete(key)
+
+    @contextmanager
+    def _lock(self, key: str) -> Iterator[bool]:
+        lock_key = self._lock_key(key)
+        token = uuid.uuid4().hex
+        lock_ms = int(CacheConfig.LOCK_TIMEOUT * 1000)
+        deadline = time.monotonic() + CacheConfig.LOCK_TIMEOUT
+        acquired = False
+
+        while True:
+            if self.client.set(lock_key, token, nx=True, px=lock_ms):
+                acquired = True
+                break
+            if time.monotonic() >= deadline:
+                logging.warning(f"Cache lock wait timed out for '{key}'")
+                break
+            time.sleep(CacheConfig.LOCK_POLL_INTERVAL)
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                # Only release the lock if it is still ours
+                self._release_lock(keys=[lock_key], args=[token])
+
+
+def create_cache(backend: str = None) -> CacheBackend:
+    """Create the configured cache backend, falling back to memory"""
+    backend = (backend or CacheConfig.CACHE_BACKEND).lower()
+
+    if backend == "redis":
+        if redis is None:
+            logging.warning("redis package not installed, using in-memory cache")
+        else:
+            try:
+                client = redis.Redis.from_url(CacheConfig.REDIS_URL)
+                client.ping()
+                logging.info(f"Using Redis cache at {CacheConfig.REDIS_URL}")
+                return RedisCache(client)
+            except Exception as e:
+                logging.warning(f"Redis unavailable ({e}), using in-memory cache")
+
+    return MemoryCache()
+
+
+# Global instance
+cache = create_cache()
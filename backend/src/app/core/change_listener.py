@@ -0,0 +1,327 @@
+import json
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import psycopg2
+from sqlalchemy import text
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.cache_config import CacheConfig
+from backend.src.app.core.cache import cache, laptop_tag
+from backend.src.app.config.ai_config import AIConfig
+
+
+WATCHED_TABLES = [
+    "laptops",
+    "specifications",
+    "price_snapshots",
+    "reviews",
+    "questions_answers",
+]
+
+# Kept in sync with backend/database_schema.sql. Databases restored from
+# older dumps get the triggers from backend/scripts/install_change_triggers.py,
+# run once with a role allowed to create them; the services only check
+NOTIFY_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_data_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_data JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+
+    PERFORM pg_notify(
+        '{CacheConfig.CHANGE_CHANNEL}',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'id', (row_data ->> 'id')::INTEGER,
+            'laptop_id', COALESCE(
+                (row_data ->> 'laptop_id')::INTEGER,
+                CASE WHEN TG_TABLE_NAME = 'laptops' THEN (row_data ->> 'id')::INTEGER END
+            )
+        )::TEXT
+    );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+"""
+
+
+def install_triggers(engine) -> None:
+    """Create or replace the NOTIFY function and row triggers on every watched
+    table (PostgreSQL 14+).
+
+    A migration step, not a startup hook: it needs DDL rights. Concurrent
+    runs queue on an advisory lock, and triggers are replaced in place, so
+    no window exists in which a table has none.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('notify_data_change'))")
+        )
+        conn.execute(text(NOTIFY_FUNCTION_SQL))
+        for table in WATCHED_TABLES:
+            conn.execute(
+                text(
+                    f"""
+                CREATE OR REPLACE TRIGGER notify_{table}_change
+                    AFTER INSERT OR UPDATE OR DELETE ON {table}
+                    FOR EACH ROW EXECUTE FUNCTION notify_data_change()
+            """
+                )
+            )
+    logging.info(f"Change notification triggers installed on {WATCHED_TABLES}")
+
+
+def missing_triggers(engine) -> List[str]:
+    """Watched tables without a change notification trigger (read-only)"""
+    with engine.connect() as conn:
+        installed = {
+            row[0]
+            for row in conn.execute(
+                text(
+                    "SELECT tgname FROM pg_trigger "
+                    "WHERE NOT tgisinternal AND tgname LIKE 'notify_%_change'"
+                )
+            )
+        }
+    return [
+        table for table in WATCHED_TABLES if f"notify_{table}_change" not in installed
+    ]
+
+
+def check_triggers(engine) -> None:
+    """Warn at startup when changes in some tables would go unnoticed"""
+    try:
+        missing = missing_triggers(engine)
+    except Exception as e:
+        logging.warning(f"Could not check change notification triggers: {e}")
+        return
+    if missing:
+        logging.warning(
+            f"No change notification triggers on {missing}: cached views of "
+            "them only refresh on expiry. Install them with "
+            "`python -m backend.scripts.install_change_triggers`."
+        )
+
+
+# Dispatched when the listener reconnects: notifications sent while it was
+# disconnected are lost, so anything may have changed
+RESYNC = {"table": None, "op": "RESYNC", "id": None, "laptop_id": None}
+
+
+def is_resync(changes: List[Dict[str, Any]]) -> bool:
+    """Whether a batch asks handlers to assume every row changed"""
+    return any(change.get("op") == RESYNC["op"] for change in changes)
+
+
+def cache_tags_for_changes(changes: List[Dict[str, Any]]) -> List[str]:
+    """Map row changes to the cache tags whose entries they make stale"""
+    tags = set()
+    for change in changes:
+        table = change.get("table")
+        laptop_id = change.get("laptop_id")
+
+        if laptop_id is not None:
+            tags.add(laptop_tag(laptop_id))
+        if table in ("laptops", "price_snapshots", "reviews"):
+            tags.add("laptops")
+        if table == "reviews":
+            tags.add(AIConfig.REVIEWS_COLLECTION)
+        elif table == "questions_answers":
+            tags.add(AIConfig.QA_COLLECTION)
+        elif table == "laptops":
+            # Vector results embed the laptop name in their metadata
+            tags.update([AIConfig.REVIEWS_COLLECTION, AIConfig.QA_COLLECTION])
+
+    return sorted(tags)
+
+
+def invalidate_cache_for_changes(changes: List[Dict[str, Any]]) -> None:
+    """Default handler: drop every cached view touched by the changes"""
+    if is_resync(changes):
+        cache.clear()
+        logging.info("Cleared the cache after missing change notifications")
+        cache.bump_data_version()
+        return
+
+    tags = cache_tags_for_changes(changes)
+    if tags:
+        removed = cache.invalidate_tags(*tags)
+        logging.info(f"Invalidated {removed} cache entries for tags {tags}")
+
+    # Entries validated by version rather than tags (e.g. chat responses)
+    cache.bump_data_version()
+
+
+def _change_key(change: Dict[str, Any]) -> tuple:
+    return change.get("table"), change.get("op"), change.get("id")
+
+
+class ChangeListener:
+    """Background LISTEN loop that batches row-change notifications.
+
+    Notifications arriving within `batch_window` seconds of each other are
+    de-duplicated and handed to every handler as one list, so a scraper
+    committing thousands of rows triggers a handful of invalidations.
+    Handlers run in turn on the listener thread; wrap slow ones in a
+    QueuedHandler. After a reconnect, handlers get a RESYNC batch.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = None,
+        batch_window: float = None,
+        reconnect_delay: float = 5.0,
+    ):
+        self.dsn = dsn
+        self.channel = channel or CacheConfig.CHANGE_CHANNEL
+        self.batch_window = (
+            batch_window
+            if batch_window is not None
+            else CacheConfig.CHANGE_BATCH_WINDOW
+        )
+        self.reconnect_delay = reconnect_delay
+        self.handlers: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_handler(self, handler: Callable[[List[Dict[str, Any]]], None]) -> None:
+        self.handlers.append(handler)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="change-listener", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"Change listener started on channel '{self.channel}'")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        listened = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel};")
+                if listened:
+                    logging.warning("Change listener reconnected, resyncing")
+                    self._dispatch([dict(RESYNC)])
+                listened = True
+
+                while not self._stop.is_set():
+                    changes = self._collect(conn)
+                    if changes:
+                        self._dispatch(changes)
+
+            except Exception as e:
+                logging.error(f"Change listener connection failed: {e}")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _collect(self, conn) -> List[Dict[str, Any]]:
+        """Wait for notifications, then keep draining for one batch window"""
+        if select.select([conn], [], [], 1.0) == ([], [], []):
+            return []
+
+        seen = {}
+        deadline = time.monotonic() + self.batch_window
+        while True:
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    change = json.loads(notify.payload)
+                except ValueError:
+                    logging.warning(
+                        f"Ignoring malformed notification: {notify.payload}"
+                    )
+                    continue
+                seen[_change_key(change)] = change
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            select.select([conn], [], [], remaining)
+
+        return list(seen.values())
+
+    def _dispatch(self, changes: List[Dict[str, Any]]) -> None:
+        logging.info(f"Received {len(changes)} data change notifications")
+        for handler in self.handlers:
+            try:
+                handler(changes)
+            except Exception as e:
+                logging.error(f"Change handler {handler.__name__} failed: {e}")
+
+
+class QueuedHandler:
+    """Runs a slow change handler on its own thread.
+
+    The listener only queues batches for it, so the handlers after it (and
+    the next notifications) never wait on it, e.g. on the vector index
+    lock during a full sync. Batches queued while it runs are merged into
+    one de-duplicated call.
+    """
+
+    def __init__(self, handler: Callable[[List[Dict[str, Any]]], None], name: str):
+        self.handler = handler
+        self.name = name
+        self.__name__ = name
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __call__(self, changes: List[Dict[str, Any]]) -> None:
+        with self._wakeup:
+            for change in changes:
+                self._pending[_change_key(change)] = change
+            self._wakeup.notify()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._stop.is_set():
+                    self._wakeup.wait()
+                if self._stop.is_set():
+                    return
+                changes = list(self._pending.values())
+                self._pending.clear()
+            try:
+                self.handler(changes)
+            except Exception as e:
+                logging.error(f"Change handler {self.name} failed: {e}")
@@ -0,0 +1,43 @@
+import threading
+from typing import Any, Callable
+
+from backend.src.utils.logger.logging import logger as logging
+
+
+class PeriodicJob:
+    """Runs a function every `interval` seconds on a daemon thread.
+
+    The first run happens one interval after start(); failures are logged
+    and the job keeps its schedule.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any], interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logging.info(f"Periodic job '{self.name}' started every {self.interval}s")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.func()
+                self.runs += 1
+            except Exception as e:
+                self.failures += 1
+                logging.error(f"Periodic job '{self.name}' failed: {e}")
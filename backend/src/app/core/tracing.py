@@ -0,0 +1,276 @@
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+
+# Attribute values longer than this are truncated (tool params, errors)
+MAX_ATTRIBUTE_CHARS = 500
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            if not isinstance(value, (bool, int, float, str)):
+                value = json.dumps(value, default=str, sort_keys=True)
+            if isinstance(value, str) and len(value) > MAX_ATTRIBUTE_CHARS:
+                value = value[:MAX_ATTRIBUTE_CHARS] + "..."
+            self.attributes[key] = value
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            {"key": key, "value": _otlp_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": {"code": 2 if span.status == "error" else 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+class Tracer:
+    """Nested timing spans for agent nodes, tools, LLM and vector calls.
+
+    Spans nest through a context variable, so they follow asyncio tasks
+    and executor threads started with a copied context. When a root span
+    ends its trace is logged as one line and, if `trace_file` is set,
+    appended to it as OTLP/JSON (one ExportTraceServiceRequest per line).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        trace_file: Optional[Path] = None,
+        service_name: str = "laptop-intelligence-engine",
+    ):
+        self.enabled = enabled
+        self.trace_file = Path(trace_file) if trace_file else None
+        self.service_name = service_name
+        self._open: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+        )
+        span.set(**attributes)
+        if parent is None:
+            with self._lock:
+                self._open[span.trace_id] = []
+        token = _current_span.set(span)
+        try:
+            yield span
+        except (asyncio.CancelledError, GeneratorExit):
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Async generators may finish in another context
+                _current_span.set(parent)
+            self._finish(span)
+
+    def traced(self, name: str) -> Callable:
+        """Decorator running a function, coroutine or async generator in a span"""
+
+        def decorator(func):
+            if inspect.isasyncgenfunction(func):
+
+                @functools.wraps(func)
+                async def async_gen_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        async for item in func(*args, **kwargs):
+                            yield item
+
+                return async_gen_wrapper
+
+            if asyncio.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            spans = self._open.get(span.trace_id)
+            if spans is None:
+                # Outlived its trace (e.g. a timed-out tool thread)
+                return
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            del self._open[span.trace_id]
+        self._export(span, spans)
+
+    def _export(self, root: Span, spans: List[Span]) -> None:
+        spans.sort(key=lambda s: s.start_ns)
+        parts = [
+            f"{s.name} {s.duration * 1000:.0f}ms" + ("" if s.status == "ok" else "!")
+            for s in spans
+            if s is not root
+        ]
+        tokens = sum(
+            s.attributes.get("input_tokens", 0) + s.attributes.get("output_tokens", 0)
+            for s in spans
+        )
+        logging.info(
+            f"Trace {root.trace_id[:8]} {root.name} {root.duration * 1000:.0f}ms"
+            f" ({tokens} tokens): " + ", ".join(parts)
+        )
+        if self.trace_file is None:
+            return
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": _otlp_value(self.service_name),
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "laptop-agent"},
+                            "spans": [_otlp_span(s) for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        try:
+            with self._lock:
+                self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(request) + "\n")
+        except OSError as e:
+            logging.error(f"Could not write trace file {self.trace_file}: {e}")
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Add attributes to the active span, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+def _plain_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    return next(iter(value.values()), None)
+
+
+def load_spans(path: Path) -> List[Dict[str, Any]]:
+    """Flatten an OTLP/JSON trace file into span dicts with plain attributes"""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource in json.loads(line).get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for span in scope.get("spans", []):
+                        attributes = {
+                            a["key"]: _plain_value(a["value"])
+                            for a in span.get("attributes", [])
+                        }
+                        spans.append(
+                            {
+                                "name": span["name"],
+                                "trace_id": span["traceId"],
+                                "span_id": span["spanId"],
+                                "parent_id": span.get("parentSpanId"),
+                                "duration": (
+                                    int(span["endTimeUnixNano"])
+                                    - int(span["startTimeUnixNano"])
+                                )
+                                / 1e9,
+                                "error": span.get("status", {}).get("code") == 2,
+                                "attributes": attributes,
+                            }
+                        )
+    return spans
+
+
+# Global instance
+tracer = Tracer(enabled=AIConfig.TRACING_ENABLED, trace_file=AIConfig.TRACE_FILE)
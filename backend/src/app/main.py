@@ -1,16 +1,25 @@
 # backend/src/app/main.py
 from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 import time
-from backend.src.app.core.db import SessionLocal, Base, engine
+from backend.src.app.core.db import SessionLocal, Base, engine, DATABASE_URL
+from backend.src.app.core.cache import cache, make_key
+from backend.src.app.config.cache_config import CacheConfig
+from backend.src.app.core.change_listener import (
+    ChangeListener,
+    check_triggers,
+    invalidate_cache_for_changes,
+)
 from backend.src.app.models.laptop import Laptop
 from backend.src.app.models.specification import Specification
 from backend.src.app.models.price_snapshot import PriceSnapshot
 from backend.src.app.models.review import Review
 from backend.src.app.models.questions_answer import QuestionsAnswer
 from backend.src.app.models.views import LaptopReviewSummary, LaptopLatestPrice
+from backend.src.app.models.vector_index_state import VectorIndexState  # noqa: F401
 from backend.src.utils.logger.logging import logger as logging
 from backend.src.app.schemas.laptop import (
     Laptop as LaptopSchema,
@@ -44,6 +53,24 @@ app.add_middleware(
 )
 
 
+change_listener = ChangeListener(DATABASE_URL)
+change_listener.add_handler(invalidate_cache_for_changes)
+
+
+@app.on_event("startup")
+def startup_event():
+    """Start listening for data changes so cached views stay fresh"""
+    if not CacheConfig.CHANGE_LISTENER_ENABLED:
+        return
+    check_triggers(engine)
+    change_listener.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    change_listener.stop()
+
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -86,33 +113,44 @@ def get_laptops(
 ):
     """Get list of all laptops with basic info and latest pricing/rating."""
 
-    # This single, efficient query joins the main table with our two views
-    query = (
-        db.query(Laptop, LaptopLatestPrice, LaptopReviewSummary)
-        .outerjoin(LaptopLatestPrice, Laptop.id == LaptopLatestPrice.laptop_id)
-        .outerjoin(LaptopReviewSummary, Laptop.id == LaptopReviewSummary.laptop_id)
-    )
-
-    if brand:
-        query = query.filter(Laptop.brand.ilike(f"%{brand}%"))
-
-    results = query.all()
-
-    # Combine the results into our Pydantic schema
-    laptops_with_details = []
-    for laptop, price_info, review_info in results:
-        laptop_data = laptop.__dict__
-        laptop_data["latest_price"] = price_info.price if price_info else None
-        laptop_data["availability"] = (
-            price_info.availability_status if price_info else None
-        )
-        laptop_data["average_rating"] = (
-            review_info.average_rating if review_info else None
+    def load_laptops():
+        # This single, efficient query joins the main table with our two views
+        query = (
+            db.query(Laptop, LaptopLatestPrice, LaptopReviewSummary)
+            .outerjoin(LaptopLatestPrice, Laptop.id == LaptopLatestPrice.laptop_id)
+            .outerjoin(LaptopReviewSummary, Laptop.id == LaptopReviewSummary.laptop_id)
         )
-        laptop_data["review_count"] = review_info.total_reviews if review_info else None
-        laptops_with_details.append(LaptopSimple(**laptop_data))
 
-    return laptops_with_details
+        if brand:
+            query = query.filter(Laptop.brand.ilike(f"%{brand}%"))
+
+        results = query.all()
+
+        # Combine the results into our Pydantic schema
+        laptops_with_details = []
+        for laptop, price_info, review_info in results:
+            laptop_data = laptop.__dict__
+            laptop_data["latest_price"] = price_info.price if price_info else None
+            laptop_data["availability"] = (
+                price_info.availability_status if price_info else None
+            )
+            laptop_data["average_rating"] = (
+                review_info.average_rating if review_info else None
+            )
+            laptop_data["review_count"] = (
+                review_info.total_reviews if review_info else None
+            )
+            laptops_with_details.append(LaptopSimple(**laptop_data))
+
+        # Store plain JSON so every cache backend can share the entry
+        return jsonable_encoder(laptops_with_details)
+
+    return cache.get_or_set(
+        make_key("laptops", (brand or "all").lower()),
+        load_laptops,
+        ttl=CacheConfig.LAPTOPS_TTL,
+        tags=["laptops"],
+    )
 
 
 # Get detailed laptop information
@@ -0,0 +1,20 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, func
+from ..core.db import Base
+
+
+class VectorIndexState(Base):
+    """Watermarks of the last incremental sync of one vector collection"""
+
+    __tablename__ = "vector_index_state"
+
+    collection = Column(String(100), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    last_scraped_at = Column(DateTime(timezone=True))
+    last_laptop_update = Column(DateTime(timezone=True))
+    indexed_count = Column(Integer, default=0)
+    # Last row written by an unfinished run, which the next run resumes after
+    checkpoint_id = Column(Integer)
+    checkpoint_full = Column(Boolean, default=False)
+    synced_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,168 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+
+# SQLite's default limit on bound parameters is 999
+_SQL_CHUNK = 500
+
+# Scrapers prefix reviews with the variant they were found under, e.g.
+# "[16GB RAM, 512GB SSD] Great keyboard", duplicating them across variants
+_VARIANT_PREFIX = re.compile(r"^\[[^\]]{0,200}\]\s*")
+
+
+def normalize_text(text: str) -> str:
+    """Text as it is embedded: whitespace collapsed and any leading variant
+    label dropped, so the same review under several variants shares one
+    vector (the variant carries no meaning for similarity)"""
+    return _VARIANT_PREFIX.sub("", " ".join(text.split()))
+
+
+class EmbeddingCache:
+    """Disk-backed cache of embeddings keyed by model and normalized text.
+
+    Keys are SHA-256 digests of the model name and text, vectors are stored
+    as float16 (or float32) blobs in SQLite, so re-indexing unchanged text
+    becomes a lookup. The least recently used entries are evicted beyond
+    `max_entries`. Safe to share between threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: Path = None,
+        model_name: str = None,
+        dtype: str = None,
+        max_entries: int = None,
+    ):
+        self.path = Path(path or AIConfig.EMBEDDING_CACHE_PATH)
+        self.model_name = model_name or AIConfig.EMBEDDING_MODEL
+        self.dtype = np.dtype(dtype or AIConfig.EMBEDDING_CACHE_DTYPE)
+        self.max_entries = max_entries or AIConfig.EMBEDDING_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+        )
+        self._entries = self._count()
+
+    def make_key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """float32 vector for each (normalized) text, or None if not cached"""
+        keys = [self.make_key(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = list(set(keys[start : start + _SQL_CHUNK]))
+                marks = ",".join("?" * len(chunk))
+                for key, blob in self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk
+                ):
+                    found[key] = np.frombuffer(blob, dtype=self.dtype).astype(
+                        np.float32
+                    )
+                hit_keys = [key for key in chunk if key in found]
+                if hit_keys:
+                    self._conn.execute(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key IN "
+                        f"({','.join('?' * len(hit_keys))})",
+                        [now, *hit_keys],
+                    )
+        vectors = [found.get(key) for key in keys]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def set_many(self, texts: Sequence[str], vectors: Sequence[Any]) -> None:
+        now = time.time()
+        rows = [
+            (self.make_key(text), np.asarray(vector, dtype=self.dtype).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?)", rows
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _evict(self) -> None:
+        # Other processes write to the same file, so count what is stored
+        # rather than what this instance inserted
+        self._entries = self._count()
+        # Trim in one go once 10% over, rather than on every insert
+        if self._entries <= self.max_entries * 1.1:
+            return
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """,
+            (self.max_entries,),
+        )
+        self._entries = self._count()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": self._entries,
+            "dtype": self.dtype.name,
+        }
+
+
+def _create_embedding_cache() -> Optional[EmbeddingCache]:
+    if not AIConfig.EMBEDDING_CACHE_ENABLED:
+        return None
+    try:
+        return EmbeddingCache()
+    except Exception as e:
+        logging.warning(f"Embedding cache disabled, could not open database: {e}")
+        return None
+
+
+# Global instance (None when disabled)
+embedding_cache = _create_embedding_cache()
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+from backend.src.app.core.tracing import annotate
+
+
+class LLMCallCache:
+    """Disk-backed exact-match cache for LLM responses.
+
+    Keys are SHA-256 hashes of the model, messages and sampling parameters,
+    so identical calls are answered from SQLite across restarts and runs.
+    Entries expire after a TTL and the least recently used ones are evicted
+    beyond `max_entries`. Safe to share between threads and processes.
+    """
+
+    def __init__(self, path: Path = None, ttl: int = None, max_entries: int = None):
+        self.path = Path(path or AIConfig.LLM_CACHE_PATH)
+        self.ttl = ttl or AIConfig.LLM_CACHE_TTL
+        self.max_entries = max_entries or AIConfig.LLM_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_calls_accessed ON llm_calls (accessed_at)"
+        )
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash JSON-serializable call parameters into a stable cache key"""
+        canonical = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_calls WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_calls WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_calls SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_calls VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM llm_calls WHERE created_at < ?", (now - self.ttl,)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM llm_calls WHERE key IN (
+                SELECT key FROM llm_calls ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """,
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_calls")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_calls").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": entries,
+        }
+
+
+class LangChainLLMCache(BaseCache):
+    """Adapter exposing an LLMCallCache through LangChain's cache interface.
+
+    LangChain passes the serialized messages as `prompt` and the model name
+    plus parameters as `llm_string`, which together form the key.
+    """
+
+    def __init__(self, store: LLMCallCache):
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        raw = self.store.get(self.store.make_key(llm_string, prompt))
+        annotate(llm_cache_hit=raw is not None)
+        if raw is None:
+            return None
+        try:
+            return [loads(generation) for generation in json.loads(raw)]
+        except Exception as e:
+            logging.warning(f"Discarding unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        self.store.set(
+            self.store.make_key(llm_string, prompt),
+            json.dumps([dumps(generation) for generation in return_val]),
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+def _create_llm_call_cache() -> Optional[LLMCallCache]:
+    if not AIConfig.LLM_CACHE_ENABLED:
+        return None
+    try:
+        return LLMCallCache()
+    except Exception as e:
+        logging.warning(f"LLM call cache disabled, could not open database: {e}")
+        return None
+
+
+# Global instance (None when disabled)
+llm_call_cache = _create_llm_call_cache()
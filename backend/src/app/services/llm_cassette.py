@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.config.ai_config import AIConfig
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Headers worth replaying; the rest (dates, request ids, cookies) vary per call
+_KEPT_HEADERS = {"content-type", "openai-model", "openai-processing-ms"}
+
+
+class Cassette:
+    """Recorded OpenAI HTTP exchanges, stored one JSON object per line.
+
+    Requests are matched on method, path and canonical JSON body, so any
+    client going through httpx (the openai SDK, ChatOpenAI) can be
+    replayed without network access. Identical requests recorded several
+    times are replayed in recorded order, then cycle.
+    """
+
+    def __init__(self, path: Path, mode: str, replay_latency: bool = False):
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.mode == REPLAY:
+            self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            logging.warning(f"Cassette {self.path} not found; every call will miss")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        logging.info(f"Loaded {sum(map(len, self._entries.values()))} LLM exchanges")
+
+    @staticmethod
+    def request_key(request: httpx.Request) -> Tuple[str, Any]:
+        try:
+            body = json.loads(request.content or b"null")
+        except ValueError:
+            body = request.content.decode("utf-8", "replace")
+        canonical = json.dumps(
+            [request.method, request.url.path, body], sort_keys=True, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest(), body
+
+    def record(
+        self, request: httpx.Request, response: httpx.Response, elapsed: float
+    ) -> None:
+        key, body = self.request_key(request)
+        entry = {
+            "key": key,
+            "request": {"method": request.method, "path": request.url.path},
+            "body": body,
+            "response": {
+                "status_code": response.status_code,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() in _KEPT_HEADERS
+                },
+                "content": response.content.decode("utf-8"),
+            },
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._entries[key].append(entry)
+
+    def replay(self, request: httpx.Request) -> Tuple[httpx.Response, float]:
+        key, _ = self.request_key(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                logging.warning(
+                    f"No cassette entry for {request.method} {request.url.path}"
+                )
+                return (
+                    httpx.Response(
+                        404,
+                        json={
+                            "error": {
+                                "message": "No recorded response for this request",
+                                "type": "cassette_miss",
+                            }
+                        },
+                        request=request,
+                    ),
+                    0.0,
+                )
+            entry = entries[self._cursor[key] % len(entries)]
+            self._cursor[key] += 1
+            self.hits += 1
+
+        recorded = entry["response"]
+        response = httpx.Response(
+            recorded["status_code"],
+            headers=recorded["headers"],
+            content=recorded["content"].encode("utf-8"),
+            request=request,
+        )
+        return response, entry["elapsed"] if self.replay_latency else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """Records through to the real transport, or replays from the cassette"""
+
+    def __init__(self, cassette: Cassette, transport: httpx.BaseTransport = None):
+        self.cassette = cassette
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.cassette.mode == REPLAY:
+            response, delay = self.cassette.replay(request)
+            time.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = self.transport.handle_request(request)
+        # Streams are buffered whole while recording
+        response.read()
+        self.cassette.record(request, response, time.perf_counter() - started)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Async variant of CassetteTransport"""
+
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport = None):
+        self.cassette = cassette
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.cassette.mode == REPLAY:
+            response, delay = self.cassette.replay(request)
+            await asyncio.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.cassette.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _create_cassette() -> Optional[Cassette]:
+    mode = AIConfig.LLM_CASSETTE_MODE
+    if mode not in (RECORD, REPLAY):
+        return None
+    logging.info(f"LLM cassette in {mode} mode at {AIConfig.LLM_CASSETTE_PATH}")
+    return Cassette(
+        AIConfig.LLM_CASSETTE_PATH,
+        mode,
+        replay_latency=AIConfig.LLM_CASSETTE_REPLAY_LATENCY,
+    )
+
+
+def http_clients(
+    cassette: Cassette = None,
+) -> Tuple[Optional[httpx.Client], Optional[httpx.AsyncClient]]:
+    """(sync, async) httpx clients routed through the cassette, or
+    (None, None) when cassettes are off so callers keep their defaults"""
+    cassette = cassette or llm_cassette
+    if cassette is None:
+        return None, None
+    return (
+        httpx.Client(transport=CassetteTransport(cassette), timeout=60),
+        httpx.AsyncClient(transport=AsyncCassetteTransport(cassette), timeout=60),
+    )
+
+
+# Global instance
+llm_cassette = _create_cassette()
@@ -2,10 +2,18 @@ import os
 import json
 import re
 from backend.src.utils.logger.logging import logger as logging
+from backend.src.app.services.llm_cache import llm_call_cache
+from backend.src.app.core.admission import llm_admission, Overloaded
+from backend.src.app.core.tracing import tracer, annotate
+from backend.src.app.services.llm_cassette import llm_cassette, http_clients
 from openai import OpenAI
 
 try:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = OpenAI(
+        # Replayed cassettes need no real key
+        api_key=os.getenv("OPENAI_API_KEY") or ("cassette" if llm_cassette else None),
+        http_client=http_clients()[0],
+    )
 except Exception as e:
     logging.error(
         f"OpenAI client failed to initialize. Check OPENAI_API_KEY. Error: {e}"
@@ -209,23 +217,46 @@ def structure_specification(
 
     prompt = prompt_template.format(spec_name=spec_name, raw_value=raw_value)
 
-    try:
-        logging.info(f"Structuring '{spec_name}' (category: {category})...")
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise technical specification parser. Always return valid JSON. Extract ALL available information. Use null only when information is truly absent.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
+    request = {
+        "model": "gpt-4-turbo-preview",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a precise technical specification parser. Always return valid JSON. Extract ALL available information. Use null only when information is truly absent.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.1,
+    }
 
-        content = response.choices[0].message.content
-        structured_data = json.loads(content)
+    try:
+        # Identical specs (re-runs, shared variants) are answered from disk
+        cache_key = llm_call_cache.make_key(request) if llm_call_cache else None
+        content = llm_call_cache.get(cache_key) if cache_key else None
+
+        if content is None:
+            logging.info(f"Structuring '{spec_name}' (category: {category})...")
+            with tracer.span(
+                "llm.structure_specification",
+                model=request["model"],
+                category=category,
+                llm_cache_hit=False,
+            ):
+                with llm_admission.slot():
+                    response = client.chat.completions.create(**request)
+                if response.usage:
+                    annotate(
+                        input_tokens=response.usage.prompt_tokens,
+                        output_tokens=response.usage.completion_tokens,
+                    )
+            content = response.choices[0].message.content
+            structured_data = json.loads(content)
+            if cache_key:
+                llm_call_cache.set(cache_key, content)
+        else:
+            logging.info(f"Structuring '{spec_name}' (category: {category}) from cache")
+            structured_data = json.loads(content)
 
         # Post-processing validation and enrichment
         structured_data = post_process_structured_data(
@@ -234,6 +265,10 @@ def structure_specification(
 
         return structured_data
 
+    except Overloaded as e:
+        logging.warning(f"LLM structuring skipped for '{spec_name}': {e.reason}")
+        return None
+
     except Exception as e:
         logging.error(f"LLM structuring failed for '{spec_name}'. Error: {e}")
         return None
@@ -0,0 +1,8 @@
+# backend/tests/conftest.py
+import pytest
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    """Database file for the SQLite-backed caches, removed with tmp_path"""
+    return tmp_path / "cache.sqlite3"
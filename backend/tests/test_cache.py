@@ -0,0 +1,132 @@
+# backend/tests/test_cache.py
+import threading
+import time
+
+import pytest
+
+from backend.src.app.core.cache import MemoryCache, RedisCache, make_key, laptop_tag
+from backend.src.app.core.change_listener import cache_tags_for_changes
+
+
+def _check_get_set_and_ttl(cache):
+    cache.set("a", {"value": 1}, ttl=0.2)
+    assert cache.get("a") == {"value": 1}
+    time.sleep(0.3)
+    assert cache.get("a") is None, type(cache).__name__
+
+    # ttl=0 means "don't cache", not "use the default"
+    cache.set("b", "old")
+    cache.set("b", "new", ttl=0)
+    assert cache.get("b") is None, type(cache).__name__
+
+
+def _check_invalidate_by_tag(cache):
+    cache.set(make_key("laptop_summary", 1), "one", tags=[laptop_tag(1)])
+    cache.set(make_key("laptop_summary", 2), "two", tags=[laptop_tag(2)])
+    cache.set(make_key("laptops", "all"), [1, 2], tags=["laptops"])
+
+    assert cache.invalidate_tags(laptop_tag(1), "laptops") == 2
+    assert cache.get(make_key("laptop_summary", 1)) is None
+    assert cache.get(make_key("laptops", "all")) is None
+    assert cache.get(make_key("laptop_summary", 2)) == "two"
+
+
+def _check_stampede_protection(cache):
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return "loaded"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_set("hot", slow_loader))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["loaded"] * 8
+    assert len(calls) == 1, f"{type(cache).__name__} ran loader {len(calls)}x"
+
+
+BACKEND_CHECKS = [
+    _check_get_set_and_ttl,
+    _check_invalidate_by_tag,
+    _check_stampede_protection,
+]
+
+
+def test_memory_cache():
+    for check in BACKEND_CHECKS:
+        check(MemoryCache(max_entries=3))
+
+
+def _redis_cache() -> RedisCache:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting in fakeredis
+    cache = RedisCache(fakeredis.FakeRedis(), prefix="test")
+    cache.clear()
+    return cache
+
+
+def test_redis_cache():
+    for check in BACKEND_CHECKS:
+        check(_redis_cache())
+
+
+def test_redis_lock_release_keeps_foreign_lock():
+    cache = _redis_cache()
+    lock_key = cache._lock_key("hot")
+    with cache._lock("hot") as acquired:
+        assert acquired
+        # Our lock expired and another worker took it
+        cache.client.set(lock_key, "other-worker")
+    assert cache.client.get(lock_key) == b"other-worker"
+
+
+def test_redis_tag_sets_are_consumed():
+    cache = _redis_cache()
+    cache.set("a", 1, tags=["laptops"])
+    assert cache.invalidate_tags("laptops", "unknown") == 1
+    assert not cache.client.exists(cache._tag_key("laptops"))
+
+    # Keys tagged after an invalidation are found by the next one
+    cache.set("b", 2, tags=["laptops"])
+    assert cache.invalidate_tags("laptops") == 1
+    assert cache.get("b") is None
+
+
+def test_memory_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_change_notifications_map_to_tags():
+    tags = cache_tags_for_changes(
+        [
+            {"table": "price_snapshots", "op": "INSERT", "id": 7, "laptop_id": 2},
+            {"table": "questions_answers", "op": "DELETE", "id": 3, "laptop_id": 1},
+        ]
+    )
+    assert tags == ["laptop:1", "laptop:2", "laptop_qa", "laptops"]
+
+
+if __name__ == "__main__":
+    test_memory_cache()
+    test_redis_cache()
+    test_redis_lock_release_keeps_foreign_lock()
+    test_redis_tag_sets_are_consumed()
+    test_memory_lru_eviction()
+    test_change_notifications_map_to_tags()
+    print("Cache tests passed!")
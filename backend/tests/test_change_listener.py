@@ -0,0 +1,112 @@
+# backend/tests/test_change_listener.py
+import threading
+import time
+
+from backend.src.app.core import change_listener as listener_module
+from backend.src.app.core.cache import cache, make_key, laptop_tag
+from backend.src.app.core.change_listener import (
+    RESYNC,
+    ChangeListener,
+    QueuedHandler,
+    invalidate_cache_for_changes,
+    is_resync,
+)
+
+
+class _FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql):
+        pass
+
+
+class _FakeConnection:
+    def set_isolation_level(self, level):
+        pass
+
+    def cursor(self):
+        return _FakeCursor()
+
+    def close(self):
+        pass
+
+
+def test_reconnect_dispatches_resync():
+    listener = ChangeListener("postgresql://test", reconnect_delay=0)
+    batches = []
+    listener.add_handler(batches.append)
+
+    connections = []
+
+    def connect(dsn):
+        connections.append(dsn)
+        return _FakeConnection()
+
+    def collect(conn):
+        if len(connections) == 1:
+            raise ConnectionError("server closed the connection")
+        listener._stop.set()
+        return []
+
+    original_connect = listener_module.psycopg2.connect
+    listener_module.psycopg2.connect = connect
+    listener._collect = collect
+    try:
+        listener._run()
+    finally:
+        listener_module.psycopg2.connect = original_connect
+
+    # Nothing on the first connect, one RESYNC after the reconnect
+    assert len(connections) == 2
+    assert batches == [[RESYNC]]
+    assert is_resync(batches[0])
+
+
+def test_resync_clears_tagged_entries():
+    cache.set(make_key("laptop_summary", 1), "one", tags=[laptop_tag(1)])
+    version = cache.data_version()
+
+    invalidate_cache_for_changes([dict(RESYNC)])
+    assert cache.get(make_key("laptop_summary", 1)) is None
+    assert cache.data_version() != version
+
+
+def test_queued_handler_never_blocks_the_listener():
+    release = threading.Event()
+    calls = []
+
+    def slow_handler(changes):
+        calls.append(sorted(change["id"] for change in changes))
+        release.wait(5)
+
+    handler = QueuedHandler(slow_handler, "test-queued")
+    handler.start()
+    try:
+        started = time.monotonic()
+        handler([{"table": "reviews", "op": "UPDATE", "id": 1}])
+        time.sleep(0.1)  # the first batch is now running
+        for row_id in (2, 3, 2):
+            handler([{"table": "reviews", "op": "UPDATE", "id": row_id}])
+        assert time.monotonic() - started < 1
+        assert calls == [[1]]
+
+        # Batches queued meanwhile arrive merged and de-duplicated
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert calls == [[1], [2, 3]]
+    finally:
+        release.set()
+        handler.stop()
+
+
+if __name__ == "__main__":
+    test_reconnect_dispatches_resync()
+    test_resync_clears_tagged_entries()
+    test_queued_handler_never_blocks_the_listener()
+    print("Change listener tests passed!")
@@ -0,0 +1,68 @@
+# backend/tests/test_embedding_cache.py
+import time
+
+import numpy as np
+import pytest
+
+from backend.src.app.services.embedding_cache import EmbeddingCache, normalize_text
+
+
+def _vectors(count: int, dim: int = 384) -> np.ndarray:
+    vectors = np.random.default_rng(0).standard_normal((count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_normalize_text():
+    assert normalize_text("[16GB RAM, 512GB SSD]  Great\nkeyboard ") == (
+        "Great keyboard"
+    )
+    assert normalize_text("Great keyboard [really]") == "Great keyboard [really]"
+
+
+def test_round_trip_and_persistence(sqlite_path):
+    cache = EmbeddingCache(path=sqlite_path, dtype="float16")
+    vectors = _vectors(3)
+    cache.set_many(["a", "b", "c"], vectors)
+
+    found = cache.get_many(["c", "missing", "a", "a"])
+    assert found[1] is None
+    assert found[0].dtype == np.float32
+    assert np.allclose(found[0], vectors[2], atol=1e-3)
+    assert np.array_equal(found[2], found[3])
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+    # float16 halves the blob; similarity is unchanged to ~3 decimals
+    assert float(found[0] @ vectors[2]) > 0.999
+
+    # Another process opening the file sees the entries, other models don't
+    assert EmbeddingCache(path=cache.path).get_many(["b"])[0] is not None
+    other = EmbeddingCache(path=cache.path, model_name="another-model")
+    assert other.get_many(["b"]) == [None]
+
+
+def test_lru_eviction(sqlite_path):
+    cache = EmbeddingCache(path=sqlite_path, max_entries=10, dtype="float32")
+    texts = [f"review {i}" for i in range(10)]
+    cache.set_many(texts, _vectors(10))
+    time.sleep(0.01)
+    cache.get_many(texts[5:])  # the first five are now least recently used
+    cache.set_many([f"new {i}" for i in range(2)], _vectors(2))
+
+    assert cache.stats()["entries"] == 10
+    assert cache.get_many(texts[:2]) == [None, None]
+    assert all(v is not None for v in cache.get_many(texts[5:]))
+
+
+def test_eviction_counts_other_writers(sqlite_path):
+    first = EmbeddingCache(path=sqlite_path, max_entries=10, dtype="float32")
+    second = EmbeddingCache(path=sqlite_path, max_entries=10, dtype="float32")
+    first.set_many([f"first {i}" for i in range(6)], _vectors(6))
+    second.set_many([f"second {i}" for i in range(6)], _vectors(6))
+
+    # Neither instance wrote more than the limit, together they did
+    assert second.stats()["entries"] == 10
+    assert first._count() == 10
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
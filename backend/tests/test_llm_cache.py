@@ -0,0 +1,55 @@
+# backend/tests/test_llm_cache.py
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from backend.src.app.services.llm_cache import LLMCallCache, LangChainLLMCache
+
+
+def test_key_is_order_independent():
+    a = LLMCallCache.make_key({"model": "gpt-4", "temperature": 0.1})
+    b = LLMCallCache.make_key({"temperature": 0.1, "model": "gpt-4"})
+    c = LLMCallCache.make_key({"model": "gpt-4", "temperature": 0.2})
+    assert a == b and a != c
+
+
+def test_ttl_and_persistence(sqlite_path):
+    cache = LLMCallCache(path=sqlite_path, ttl=1)
+    cache.set("k", '{"ram": "16GB"}')
+    assert cache.get("k") == '{"ram": "16GB"}'
+
+    # A second process opening the same file sees the entry
+    reopened = LLMCallCache(path=cache.path, ttl=1)
+    assert reopened.get("k") == '{"ram": "16GB"}'
+
+    time.sleep(1.1)
+    assert cache.get("k") is None
+
+
+def test_lru_eviction(sqlite_path):
+    cache = LLMCallCache(path=sqlite_path, max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.stats()["entries"] == 2
+
+
+def test_langchain_adapter_round_trip(sqlite_path):
+    adapter = LangChainLLMCache(LLMCallCache(path=sqlite_path))
+    generation = ChatGeneration(message=AIMessage(content="The XPS 13 fits."))
+    adapter.update("prompt", "gpt-4|temperature=0.7", [generation])
+
+    cached = adapter.lookup("prompt", "gpt-4|temperature=0.7")
+    assert cached[0].message.content == "The XPS 13 fits."
+    assert adapter.lookup("prompt", "gpt-4|temperature=0.0") is None
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,306 @@
+# scripts/stub_llm_server.py
+"""OpenAI-compatible stub server for offline benchmarking and load tests.
+
+Serves /v1/chat/completions (plain and streamed, with tool calls) and
+/v1/models. Replies are canned, but timing follows configurable
+distributions: a lognormal time to first token, then tokens at a
+jittered rate. Point clients at it with OPENAI_BASE_URL, e.g.
+
+    python -m scripts.stub_llm_server --port 8090 --ttft-median 0.6
+    OPENAI_BASE_URL=http://localhost:8090/v1 OPENAI_API_KEY=stub ...
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# The agent's analysis prompt asks for this; answer with a budget search
+ANALYSIS_MARKER = "Return a JSON object with"
+ANALYSIS_REPLY = {
+    "tools_needed": ["search_laptops_by_budget"],
+    "tool_params": {"search_laptops_by_budget": {"min_price": 0, "max_price": 1000}},
+    "intent": "budget_search",
+}
+REVIEW_ANALYSIS_REPLY = {
+    "tools_needed": ["search_reviews"],
+    "tool_params": {"search_reviews": {"query": "battery life", "limit": 5}},
+    "intent": "experience_question",
+}
+
+_WORDS = (
+    "Based on our inventory the HP ProBook 450 G10 offers a balanced mix of "
+    "performance battery life and price while the ThinkPad E14 has a better "
+    "keyboard and more upgrade options for memory and storage"
+).split()
+
+
+@dataclass
+class StubProfile:
+    """Latency and output-size distributions for stub responses"""
+
+    ttft_median: float = 0.5  # seconds to first token (lognormal median)
+    ttft_sigma: float = 0.4  # lognormal shape; larger means a longer tail
+    tokens_per_second: float = 50.0
+    tokens_per_second_jitter: float = 0.2  # relative standard deviation
+    output_tokens: int = 120  # mean completion length
+    error_rate: float = 0.0  # fraction of requests answered with a 500
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def time_to_first_token(self) -> float:
+        if self.ttft_median <= 0:
+            return 0.0
+        return self._random.lognormvariate(math.log(self.ttft_median), self.ttft_sigma)
+
+    def token_rate(self) -> float:
+        rate = self._random.gauss(
+            self.tokens_per_second,
+            self.tokens_per_second * self.tokens_per_second_jitter,
+        )
+        return max(1.0, rate)
+
+    def completion_tokens(self) -> int:
+        return max(1, int(self._random.expovariate(1 / self.output_tokens)))
+
+    def fails(self) -> bool:
+        return self._random.random() < self.error_rate
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+
+def _reply(body: Dict[str, Any], profile: StubProfile) -> Tuple[str, List, int]:
+    """(content, tool_calls, completion tokens) for a request"""
+    messages = body.get("messages", [])
+    first = str(messages[0].get("content") or "") if messages else ""
+    prompt = _message_text(messages)
+
+    if ANALYSIS_MARKER in first:
+        reply = REVIEW_ANALYSIS_REPLY if "review" in prompt.lower() else ANALYSIS_REPLY
+        content = json.dumps(reply)
+        return content, [], _estimate_tokens(content)
+
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        content = json.dumps({"stub": True})
+        return content, [], _estimate_tokens(content)
+
+    tools = body.get("tools") or []
+    if tools and not any(message.get("role") == "tool" for message in messages):
+        names = [tool["function"]["name"] for tool in tools]
+        name = (
+            "search_laptops_by_budget"
+            if "search_laptops_by_budget" in names
+            else names[0]
+        )
+        arguments = (
+            {"min_price": 0, "max_price": 1000}
+            if name == "search_laptops_by_budget"
+            else {}
+        )
+        call = {
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }
+        return "", [call], 20
+
+    count = profile.completion_tokens()
+    words = [_WORDS[i % len(_WORDS)] for i in range(count)]
+    return " ".join(words) + ".", [], count
+
+
+def create_app(profile: StubProfile = None) -> FastAPI:
+    profile = profile or StubProfile()
+    app = FastAPI(title="Stub OpenAI API")
+    app.state.profile = profile
+    app.state.requests = 0
+
+    @app.get("/v1/models")
+    async def models():
+        return {
+            "object": "list",
+            "data": [{"id": "stub", "object": "model", "owned_by": "stub"}],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        model = body.get("model", "stub")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:16]}"
+        created = int(time.time())
+
+        await asyncio.sleep(profile.time_to_first_token())
+        if profile.fails():
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Stub failure", "type": "server_error"}},
+            )
+
+        content, tool_calls, completion_tokens = _reply(body, profile)
+        rate = profile.token_rate()
+        usage = {
+            "prompt_tokens": _estimate_tokens(_message_text(body.get("messages", []))),
+            "completion_tokens": completion_tokens,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + completion_tokens
+
+        if not body.get("stream"):
+            await asyncio.sleep(completion_tokens / rate)
+            message = {"role": "assistant", "content": content or None}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tool_calls else "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        def chunk(delta, finish_reason=None, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            if tool_calls:
+                deltas = [dict(call, index=i) for i, call in enumerate(tool_calls)]
+                yield chunk({"tool_calls": deltas})
+            else:
+                words = content.split(" ")
+                for i, word in enumerate(words):
+                    await asyncio.sleep(1 / rate)
+                    yield chunk({"content": word if i == 0 else f" {word}"})
+            yield chunk({}, "tool_calls" if tool_calls else "stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(data)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class StubServer:
+    """Runs the stub server on a background thread, e.g. inside a benchmark"""
+
+    def __init__(self, profile: StubProfile = None, port: int = 0):
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        self.app = create_app(profile)
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Stub LLM server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    defaults = StubProfile()
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--ttft-median", type=float, default=defaults.ttft_median)
+    parser.add_argument("--ttft-sigma", type=float, default=defaults.ttft_sigma)
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=defaults.tokens_per_second
+    )
+    parser.add_argument(
+        "--tokens-per-second-jitter",
+        type=float,
+        default=defaults.tokens_per_second_jitter,
+    )
+    parser.add_argument("--output-tokens", type=int, default=defaults.output_tokens)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profile = StubProfile(
+        ttft_median=args.ttft_median,
+        ttft_sigma=args.ttft_sigma,
+        tokens_per_second=args.tokens_per_second,
+        tokens_per_second_jitter=args.tokens_per_second_jitter,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(
+        f"Stub OpenAI API on http://{args.host}:{args.port}/v1 with {asdict(profile)}"
+    )
+    uvicorn.run(create_app(profile), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# scripts/trace_summary.py
+"""Summarize a trace file written with TRACE_FILE set.
+
+Prints call count, p50/p95 latency and errors per span name, followed by
+LLM token totals and cache hit rates, e.g.
+
+    python -m scripts.trace_summary logs/traces.jsonl
+"""
+import argparse
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from backend.src.app.core.tracing import load_spans
+
+# Boolean span attributes reported as hit rates
+CACHE_ATTRIBUTES = (
+    "llm_cache_hit",
+    "semantic_cache_hit",
+    "cache_hit",
+    "query_embedding_cache_hit",
+)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    durations = defaultdict(list)
+    errors = defaultdict(int)
+    tokens = {"input_tokens": 0, "output_tokens": 0}
+    caches = defaultdict(lambda: [0, 0])  # attribute -> [hits, lookups]
+
+    for span in spans:
+        durations[span["name"]].append(span["duration"])
+        errors[span["name"]] += span["error"]
+        attributes = span["attributes"]
+        for key in tokens:
+            tokens[key] += attributes.get(key, 0)
+        for key in CACHE_ATTRIBUTES:
+            if key in attributes:
+                caches[key][0] += bool(attributes[key])
+                caches[key][1] += 1
+
+    return {
+        "spans": {
+            name: {
+                "count": len(values),
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "errors": errors[name],
+            }
+            for name, values in sorted(durations.items())
+        },
+        "tokens": tokens,
+        "caches": {
+            key: {"hits": hits, "lookups": lookups, "hit_rate": hits / lookups}
+            for key, (hits, lookups) in caches.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize an OTLP/JSON trace file")
+    parser.add_argument("trace_file")
+    args = parser.parse_args()
+
+    summary = summarize(load_spans(args.trace_file))
+    print(f"{'span':40} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    for name, stats in summary["spans"].items():
+        print(
+            f"{name:40} {stats['count']:7d} {stats['p50'] * 1000:9.1f}"
+            f" {stats['p95'] * 1000:9.1f} {stats['errors']:7d}"
+        )
+    tokens = summary["tokens"]
+    print(f"\ntokens: {tokens['input_tokens']} input, {tokens['output_tokens']} output")
+    for key, stats in summary["caches"].items():
+        print(f"{key}: {stats['hits']}/{stats['lookups']} ({stats['hit_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()